@@ -579,6 +579,11 @@ STATICFILES_DIRS = ()
 # The default file storage backend used during the build process
 STATICFILES_STORAGE = 'django.contrib.staticfiles.storage.StaticFilesStorage'
 
+# Absolute path to the file where collectstatic --incremental records the
+# hashes of the collected files. Keep it out of STATIC_ROOT, which is public.
+# Example: "/home/example.com/staticfiles.sources.json"
+STATICFILES_SOURCES_MANIFEST = None
+
 # List of finder classes that know how to find static files in
 # various locations.
 STATICFILES_FINDERS = (
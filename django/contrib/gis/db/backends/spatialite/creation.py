@@ -8,18 +8,20 @@ from django.db.backends.sqlite3.creation import DatabaseCreation
 
 class SpatiaLiteCreation(DatabaseCreation):
 
-    def create_test_db(self, verbosity=1, autoclobber=False):
+    def create_test_db(self, verbosity=1, autoclobber=False, keepdb=False):
         """
         Creates a test database, prompting the user for confirmation if the
         database already exists. Returns the name of the test database created.
 
         This method is overloaded to load up the SpatiaLite initialization
-        SQL prior to calling the `syncdb` command.
+        SQL prior to calling the `syncdb` command. The database is always
+        created afresh, even if keepdb is True.
         """
         if verbosity >= 1:
             print "Creating test database '%s'..." % self.connection.alias
 
-        test_database_name = self._create_test_db(verbosity, autoclobber)
+        # A database kept by an earlier run is replaced without asking.
+        test_database_name = self._create_test_db(verbosity, autoclobber or keepdb)
 
         self.connection.close()
 
@@ -7,6 +7,7 @@ from django.contrib.sessions.backends.db import SessionStore as DatabaseSession
 from django.contrib.sessions.backends.cache import SessionStore as CacheSession
 from django.contrib.sessions.backends.cached_db import SessionStore as CacheDBSession
 from django.contrib.sessions.backends.file import SessionStore as FileSession
+from django.contrib.sessions.backends.signed_cookies import SessionStore as CookieSession
 from django.contrib.sessions.models import Session
 from django.contrib.sessions.middleware import SessionMiddleware
 from django.core.exceptions import ImproperlyConfigured, SuspiciousOperation
@@ -323,6 +324,37 @@ class CacheSessionTests(SessionTestsMixin, unittest.TestCase):
     backend = CacheSession
 
 
+class CookieSessionTests(SessionTestsMixin, unittest.TestCase):
+
+    backend = CookieSession
+
+    @unittest.skip("Cookie sessions can't be checked for existence with "
+                   "exists(), as they're stored on the client.")
+    def test_save(self):
+        pass
+
+    @unittest.skip("Cookie sessions can't invalidate the previously signed "
+                   "cookie (other than letting it expire), so cycle_key() "
+                   "can't be tested.")
+    def test_cycle(self):
+        pass
+
+    def test_round_trip(self):
+        self.session['x'] = 1
+        self.session['when'] = datetime(2011, 1, 1)
+        self.session.save()
+        session = self.backend(self.session.session_key)
+        self.assertEqual(session['x'], 1)
+        self.assertEqual(session['when'], datetime(2011, 1, 1))
+
+    def test_tampered_cookie(self):
+        self.session['x'] = 1
+        self.session.save()
+        session = self.backend(self.session.session_key + 'x')
+        self.assertEqual(session.get('x'), None)
+        self.assertTrue(session.modified)
+
+
 class SessionMiddlewareTests(unittest.TestCase):
     def setUp(self):
         self.old_SESSION_COOKIE_SECURE = settings.SESSION_COOKIE_SECURE
@@ -1,3 +1,4 @@
+import hashlib
 import os
 import sys
 import shutil
@@ -6,10 +7,33 @@ from optparse import make_option
 from django.conf import settings
 from django.core.files.storage import get_storage_class
 from django.core.management.base import CommandError, NoArgsCommand
+from django.utils import simplejson
+from django.utils.datastructures import SortedDict
 from django.utils.encoding import smart_str
 
 from django.contrib.staticfiles import finders
 
+def map_in_threads(func, jobs, threads):
+    """
+    Calls func on each of the jobs in a pool of worker threads and returns
+    the results, in order.
+    """
+    try:
+        from multiprocessing.pool import ThreadPool
+    except ImportError:
+        raise CommandError("--parallel requires the multiprocessing module, "
+                           "available in Python 2.6 and later.")
+    pool = ThreadPool(threads)
+    try:
+        results = pool.map(func, jobs)
+    except:
+        pool.terminate()
+        pool.join()
+        raise
+    pool.close()
+    pool.join()
+    return results
+
 class Command(NoArgsCommand):
     """
     Command that allows to copy or symlink media files from different
@@ -30,14 +54,31 @@ class Command(NoArgsCommand):
             dest='use_default_ignore_patterns', default=True,
             help="Don't ignore the common private glob-style patterns 'CVS', "
                 "'.*' and '*~'."),
+        make_option('--no-post-process', action='store_false',
+            dest='post_process', default=True,
+            help="Do NOT post process collected files."),
+        make_option('--incremental', action='store_true', dest='incremental',
+            default=False, help="Only copy the files whose content changed "
+                "since the last run with --incremental, according to the "
+                "manifest of their hashes saved at "
+                "STATICFILES_SOURCES_MANIFEST."),
+        make_option('--parallel', default=0, dest='parallel', type='int',
+            help="Copies the files with this many worker threads."),
     )
     help = "Collect static files from apps and other locations in a single location."
 
+    # The version of the manifest of the collected files' hashes saved by
+    # --incremental at STATICFILES_SOURCES_MANIFEST.
+    sources_manifest_version = '1.0'
+
     def __init__(self, *args, **kwargs):
         super(NoArgsCommand, self).__init__(*args, **kwargs)
         self.copied_files = []
         self.symlinked_files = []
         self.unmodified_files = []
+        self.post_processed_files = []
+        self.previous_hashes = {}
+        self.source_hashes = {}
         self.storage = get_storage_class(settings.STATICFILES_STORAGE)()
         try:
             self.storage.path('')
@@ -50,6 +91,8 @@ class Command(NoArgsCommand):
 
     def handle_noargs(self, **options):
         symlink = options['link']
+        incremental = options.get('incremental', False)
+        parallel = options.get('parallel', 0)
         ignore_patterns = options['ignore_patterns']
         if options['use_default_ignore_patterns']:
             ignore_patterns += ['CVS', '.*', '*~']
@@ -62,6 +105,11 @@ class Command(NoArgsCommand):
                                    "platform (%s)." % sys.platform)
             if not self.local:
                 raise CommandError("Can't symlink to a remote destination.")
+            if incremental:
+                raise CommandError("--incremental can't be used with --link.")
+        if incremental and not settings.STATICFILES_SOURCES_MANIFEST:
+            raise CommandError("--incremental requires the "
+                               "STATICFILES_SOURCES_MANIFEST setting.")
 
         # Warn before doing anything more.
         if options.get('interactive'):
@@ -76,6 +124,9 @@ Type 'yes' to continue, or 'no' to cancel: """)
             if confirm != 'yes':
                 raise CommandError("Collecting static files cancelled.")
 
+        # The files found, by destination path, with the storage and path
+        # each one was found at.
+        found_files = SortedDict()
         for finder in finders.get_finders():
             for path, storage in finder.list(ignore_patterns):
                 # Prefix the relative path if the source storage contains it
@@ -83,20 +134,113 @@ Type 'yes' to continue, or 'no' to cancel: """)
                     prefixed_path = os.path.join(storage.prefix, path)
                 else:
                     prefixed_path = path
-                if symlink:
-                    self.link_file(path, prefixed_path, storage, **options)
-                else:
-                    self.copy_file(path, prefixed_path, storage, **options)
+                # Skip this file if it was already found earlier
+                if prefixed_path in found_files:
+                    self.log(u"Skipping '%s' (already %s earlier)" %
+                             (path, symlink and 'linked' or 'copied'))
+                    continue
+                found_files[prefixed_path] = (storage, path)
+
+        if incremental:
+            self.previous_hashes = self.load_sources_manifest()
+
+        def collect(prefixed_path):
+            storage, path = found_files[prefixed_path]
+            self.collect_file(path, prefixed_path, storage, **options)
+
+        if parallel > 1 and len(found_files) > 1:
+            map_in_threads(collect, found_files.keys(), parallel)
+        else:
+            for prefixed_path in found_files:
+                collect(prefixed_path)
+
+        if incremental and not options['dry_run']:
+            self.save_sources_manifest()
+
+        # Let the storage post process all the collected files, e.g. to save
+        # copies of them under hashed names.
+        if options.get('post_process', True) and hasattr(self.storage, 'post_process'):
+            processor = self.storage.post_process(found_files, **options)
+            for original_path, processed_path, processed in processor:
+                self.log(u"Post-processed '%s' as '%s'" %
+                         (original_path, processed_path), level=1)
+                self.post_processed_files.append(original_path)
 
         actual_count = len(self.copied_files) + len(self.symlinked_files)
         unmodified_count = len(self.unmodified_files)
+        post_processed_count = len(self.post_processed_files)
         if self.verbosity >= 1:
-            self.stdout.write(smart_str(u"\n%s static file%s %s to '%s'%s.\n"
+            self.stdout.write(smart_str(u"\n%s static file%s %s to '%s'%s%s.\n"
                               % (actual_count, actual_count != 1 and 's' or '',
                                  symlink and 'symlinked' or 'copied',
                                  settings.STATIC_ROOT,
                                  unmodified_count and ' (%s unmodified)'
-                                 % unmodified_count or '')))
+                                 % unmodified_count or '',
+                                 post_processed_count and ', %s post-processed'
+                                 % post_processed_count or '')))
+
+    def load_sources_manifest(self):
+        """
+        Returns the hashes of the files collected by the previous run with
+        --incremental, or an empty dictionary if there wasn't one.
+        """
+        try:
+            manifest = open(settings.STATICFILES_SOURCES_MANIFEST)
+        except IOError:
+            return {}
+        try:
+            content = manifest.read()
+        finally:
+            manifest.close()
+        try:
+            stored = simplejson.loads(content)
+        except ValueError:
+            return {}
+        if (not isinstance(stored, dict) or
+                stored.get('version') != self.sources_manifest_version):
+            return {}
+        return stored.get('files', {})
+
+    def save_sources_manifest(self):
+        """
+        Saves the manifest of the collected files' hashes. It isn't saved in
+        the destination storage, as the files there are served publicly.
+        """
+        manifest = open(settings.STATICFILES_SOURCES_MANIFEST, 'w')
+        try:
+            simplejson.dump({
+                'version': self.sources_manifest_version,
+                'files': self.source_hashes,
+            }, manifest)
+        finally:
+            manifest.close()
+
+    def source_hash(self, path, source_storage):
+        source_file = source_storage.open(path)
+        try:
+            md5 = hashlib.md5()
+            for chunk in source_file.chunks():
+                md5.update(chunk)
+            return md5.hexdigest()
+        finally:
+            source_file.close()
+
+    def collect_file(self, path, prefixed_path, source_storage, **options):
+        """
+        Copies or links ``path``, unless --incremental is used, its content
+        hasn't changed since the previous run and its copy still exists.
+        """
+        if options.get('incremental'):
+            source_hash = self.source_hash(path, source_storage)
+            self.source_hashes[prefixed_path] = source_hash
+            if (self.previous_hashes.get(prefixed_path) == source_hash and
+                    self.storage.exists(prefixed_path)):
+                self.unmodified_files.append(prefixed_path)
+                return self.log(u"Skipping '%s' (not modified)" % path)
+        if options['link']:
+            self.link_file(path, prefixed_path, source_storage, **options)
+        else:
+            self.copy_file(path, prefixed_path, source_storage, **options)
 
     def log(self, msg, level=2):
         """
@@ -109,36 +253,15 @@ Type 'yes' to continue, or 'no' to cancel: """)
             self.stdout.write(msg)
 
     def delete_file(self, path, prefixed_path, source_storage, **options):
-        # Whether we are in symlink mode
-        symlink = options['link']
         # Checks if the target file should be deleted if it already exists
         if self.storage.exists(prefixed_path):
-            try:
-                # When was the target file modified last time?
-                target_last_modified = self.storage.modified_time(prefixed_path)
-            except (OSError, NotImplementedError):
-                # The storage doesn't support ``modified_time`` or failed
-                pass
-            else:
-                try:
-                    # When was the source file modified last time?
-                    source_last_modified = source_storage.modified_time(path)
-                except (OSError, NotImplementedError):
-                    pass
-                else:
-                    # The full path of the target file
-                    if self.local:
-                        full_path = self.storage.path(prefixed_path)
-                    else:
-                        full_path = None
-                    # Skip the file if the source file is younger
-                    if target_last_modified >= source_last_modified:
-                        if not ((symlink and full_path and not os.path.islink(full_path)) or
-                                (not symlink and full_path and os.path.islink(full_path))):
-                            if prefixed_path not in self.unmodified_files:
-                                self.unmodified_files.append(prefixed_path)
-                            self.log(u"Skipping '%s' (not modified)" % path)
-                            return False
+            # With --incremental the file's hash has already shown that it
+            # was modified, so its modification times aren't compared.
+            if (not options.get('incremental') and
+                    self.is_unmodified(path, prefixed_path, source_storage, **options)):
+                self.unmodified_files.append(prefixed_path)
+                self.log(u"Skipping '%s' (not modified)" % path)
+                return False
             # Then delete the existing file if really needed
             if options['dry_run']:
                 self.log(u"Pretending to delete '%s'" % path)
@@ -147,13 +270,36 @@ Type 'yes' to continue, or 'no' to cancel: """)
                 self.storage.delete(prefixed_path)
         return True
 
+    def is_unmodified(self, path, prefixed_path, source_storage, **options):
+        """
+        Returns True if the existing target file is younger than the source
+        file, and is a link or a copy as requested.
+        """
+        # Whether we are in symlink mode
+        symlink = options['link']
+        try:
+            # When was the target file modified last time?
+            target_last_modified = self.storage.modified_time(prefixed_path)
+            # When was the source file modified last time?
+            source_last_modified = source_storage.modified_time(path)
+        except (OSError, NotImplementedError):
+            # The storage doesn't support ``modified_time`` or failed
+            return False
+        # The full path of the target file
+        if self.local:
+            full_path = self.storage.path(prefixed_path)
+        else:
+            full_path = None
+        # Skip the file if the source file is younger
+        if target_last_modified >= source_last_modified:
+            return not ((symlink and full_path and not os.path.islink(full_path)) or
+                        (not symlink and full_path and os.path.islink(full_path)))
+        return False
+
     def link_file(self, path, prefixed_path, source_storage, **options):
         """
         Attempt to link ``path``
         """
-        # Skip this file if it was already copied earlier
-        if prefixed_path in self.symlinked_files:
-            return self.log(u"Skipping '%s' (already linked earlier)" % path)
         # Delete the target file if needed or break
         if not self.delete_file(path, prefixed_path, source_storage, **options):
             return
@@ -170,16 +316,12 @@ Type 'yes' to continue, or 'no' to cancel: """)
             except OSError:
                 pass
             os.symlink(source_path, full_path)
-        if prefixed_path not in self.symlinked_files:
-            self.symlinked_files.append(prefixed_path)
+        self.symlinked_files.append(prefixed_path)
 
     def copy_file(self, path, prefixed_path, source_storage, **options):
         """
         Attempt to copy ``path`` with storage
         """
-        # Skip this file if it was already copied earlier
-        if prefixed_path in self.copied_files:
-            return self.log(u"Skipping '%s' (already copied earlier)" % path)
         # Delete the target file if needed or break
         if not self.delete_file(path, prefixed_path, source_storage, **options):
             return
@@ -200,5 +342,4 @@ Type 'yes' to continue, or 'no' to cancel: """)
             else:
                 source_file = source_storage.open(path)
                 self.storage.save(prefixed_path, source_file)
-        if not prefixed_path in self.copied_files:
-            self.copied_files.append(prefixed_path)
+        self.copied_files.append(prefixed_path)
@@ -1,7 +1,16 @@
+import hashlib
 import os
+import posixpath
+import re
+import urlparse
+
 from django.conf import settings
 from django.core.exceptions import ImproperlyConfigured
-from django.core.files.storage import FileSystemStorage
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage, get_storage_class
+from django.utils import simplejson
+from django.utils.datastructures import SortedDict
+from django.utils.functional import LazyObject
 from django.utils.importlib import import_module
 
 from django.contrib.staticfiles import utils
@@ -19,15 +28,239 @@ class StaticFilesStorage(FileSystemStorage):
             location = settings.STATIC_ROOT
         if base_url is None:
             base_url = settings.STATIC_URL
-        if not location:
-            raise ImproperlyConfigured("You're using the staticfiles app "
-                "without having set the STATIC_ROOT setting.")
         # check for None since we might use a root URL (``/``)
         if base_url is None:
             raise ImproperlyConfigured("You're using the staticfiles app "
                 "without having set the STATIC_URL setting.")
         utils.check_settings()
         super(StaticFilesStorage, self).__init__(location, base_url, *args, **kwargs)
+        # The URLs of the files can be built without a STATIC_ROOT, e.g. by
+        # the {% static %} tag in development, so its absence is only an
+        # error once the files are accessed.
+        if not location:
+            self.location = None
+
+    def path(self, name):
+        if not self.location:
+            raise ImproperlyConfigured("You're using the staticfiles app "
+                "without having set the STATIC_ROOT setting.")
+        return super(StaticFilesStorage, self).path(name)
+
+
+class ManifestFilesMixin(object):
+    """
+    A storage mixin whose ``post_process`` step, run by ``collectstatic``,
+    saves a copy of every file under a name including the MD5 hash of its
+    content (e.g. ``css/styles.55e7cbb9ba48.css``) and records the hashed
+    names in a JSON manifest. Since a file's URL changes with its content,
+    the files can be served with far-future expiry headers.
+
+    The manifest is read once per storage instance, so looking up the URL
+    of a file costs no disk access. While ``DEBUG`` is ``True`` the URLs
+    point to the original files, which don't need to be collected.
+    """
+    manifest_name = 'staticfiles.json'
+    manifest_version = '1.0'
+    default_template = """url("%s")"""
+    # The references to other files rewritten in the files matching each
+    # glob-style pattern, as regular expressions whose groups match the
+    # whole reference and the URL in it. A reference is rewritten with
+    # default_template, unless the expression is paired with its own.
+    patterns = (
+        ("*.css", (
+            r"""(url\(['"]{0,1}\s*(.*?)["']{0,1}\))""",
+            (r"""(@import\s*["']\s*(.*?)["'])""", """@import url("%s")"""),
+        )),
+    )
+
+    def __init__(self, *args, **kwargs):
+        super(ManifestFilesMixin, self).__init__(*args, **kwargs)
+        self._patterns = SortedDict()
+        for extension, patterns in self.patterns:
+            for pattern in patterns:
+                if isinstance(pattern, (tuple, list)):
+                    pattern, template = pattern
+                else:
+                    template = self.default_template
+                compiled = re.compile(pattern, re.IGNORECASE)
+                self._patterns.setdefault(extension, []).append((compiled, template))
+        self._hashed_files = None
+
+    def _get_hashed_files(self):
+        if self._hashed_files is None:
+            self._hashed_files = self.load_manifest()
+        return self._hashed_files
+
+    def _set_hashed_files(self, value):
+        self._hashed_files = value
+
+    # Maps the names of the collected files to their hashed names.
+    hashed_files = property(_get_hashed_files, _set_hashed_files)
+
+    def load_manifest(self):
+        """
+        Returns the hashed names recorded in the manifest, or an empty
+        dictionary if there isn't one yet, or if it can't be read or is
+        from another version. The URLs of the files then point to their
+        original names until ``collectstatic`` writes a new manifest.
+        """
+        try:
+            manifest = self.open(self.manifest_name)
+        except IOError:
+            return {}
+        try:
+            content = manifest.read()
+        finally:
+            manifest.close()
+        try:
+            stored = simplejson.loads(content)
+        except ValueError:
+            return {}
+        if (not isinstance(stored, dict) or
+                stored.get('version') != self.manifest_version):
+            return {}
+        paths = stored.get('paths', {})
+        if not isinstance(paths, dict):
+            return {}
+        return paths
+
+    def save_manifest(self):
+        content = simplejson.dumps({
+            'version': self.manifest_version,
+            'paths': self.hashed_files,
+        })
+        if self.exists(self.manifest_name):
+            self.delete(self.manifest_name)
+        self.save(self.manifest_name, ContentFile(content))
+
+    def file_hash(self, content):
+        """
+        Returns the hash of the given content included in the hashed names.
+        """
+        return hashlib.md5(content).hexdigest()[:12]
+
+    def hashed_name(self, name, content):
+        root, ext = os.path.splitext(name)
+        return u'%s.%s%s' % (root, self.file_hash(content), ext)
+
+    def stored_name(self, name):
+        """
+        Returns the hashed name of the given file, or the name itself if the
+        file isn't in the manifest.
+        """
+        return self.hashed_files.get(name, name)
+
+    def url(self, name):
+        if not settings.DEBUG:
+            name = self.stored_name(name)
+        return super(ManifestFilesMixin, self).url(name)
+
+    def url_converter(self, name, template, lookup):
+        """
+        Returns the function used to rewrite the references matched in the
+        file ``name``, given a function returning the hashed name of a
+        referenced file, or None if it isn't known.
+        """
+        def converter(matchobj):
+            matched, url = matchobj.groups()
+            # Leave alone the URLs of other hosts, data URIs and fragments.
+            if url.startswith(('#', '//')) or urlparse.urlsplit(url).scheme:
+                return matched
+            scheme, netloc, url_path, query, fragment = urlparse.urlsplit(url)
+            if url_path.startswith('/'):
+                if not url_path.startswith(self.base_url):
+                    return matched
+                target_name = url_path[len(self.base_url):]
+            else:
+                source_dir = posixpath.dirname(name.replace(os.sep, '/'))
+                target_name = posixpath.join(source_dir, url_path)
+            hashed_name = lookup(posixpath.normpath(target_name))
+            if hashed_name is None:
+                return matched
+            hashed_url = posixpath.join(posixpath.dirname(url_path),
+                                        posixpath.basename(hashed_name))
+            # Keep an empty query, as in the "font.eot?#iefix" hack for IE.
+            if '?#' in url and not query:
+                hashed_url += '?'
+            return template % urlparse.urlunsplit(('', '', hashed_url, query, fragment))
+        return converter
+
+    def post_process(self, paths, dry_run=False, **options):
+        """
+        Saves a copy of each of the given files under its hashed name, with
+        the references to other files rewritten in the files matching
+        ``patterns``, then writes the manifest.
+
+        ``paths`` maps the names of the collected files to the ``(storage,
+        path)`` they were found at. Yields a ``(name, hashed_name,
+        processed)`` tuple per file whose hashed copy was saved,
+        ``processed`` being True if the file's references were rewritten.
+        Files whose hashed name is already in the manifest, and whose hashed
+        copy still exists, are skipped.
+        """
+        if dry_run:
+            return
+        # A missing or unreadable manifest is loaded as an empty one, so
+        # every file is processed and the manifest replaced.
+        previous = self.hashed_files
+        hashed_files = {}
+        results = []
+        for name in paths:
+            self._post_process_file(name, paths, hashed_files, previous,
+                                    set(), results)
+        self.hashed_files = hashed_files
+        self.save_manifest()
+        for result in results:
+            yield result
+
+    def _post_process_file(self, name, paths, hashed_files, previous, pending,
+                           results):
+        if name in hashed_files:
+            return hashed_files[name]
+        storage, path = paths[name]
+        source = storage.open(path)
+        try:
+            content = source.read()
+        finally:
+            source.close()
+
+        def lookup(target_name):
+            # Referenced files are processed first, so that their hashed
+            # names account for their own rewritten references. Circular
+            # references are left as they are.
+            if target_name in hashed_files:
+                return hashed_files[target_name]
+            if target_name in paths and target_name not in pending:
+                return self._post_process_file(target_name, paths, hashed_files,
+                                               previous, pending, results)
+            return None
+
+        processed = False
+        pending.add(name)
+        for extension, patterns in self._patterns.items():
+            if utils.matches_patterns(path, (extension,)):
+                for pattern, template in patterns:
+                    content = pattern.sub(self.url_converter(name, template, lookup), content)
+                processed = True
+        pending.discard(name)
+
+        # A hashed name changes with the content, so a copy saved by a
+        # previous run doesn't need to be saved again.
+        hashed_name = self.hashed_name(name, content)
+        if previous.get(name) != hashed_name or not self.exists(hashed_name):
+            if not self.exists(hashed_name):
+                hashed_name = self.save(hashed_name, ContentFile(content))
+            results.append((name, hashed_name, processed))
+        hashed_files[name] = hashed_name
+        return hashed_name
+
+
+class ManifestStaticFilesStorage(ManifestFilesMixin, StaticFilesStorage):
+    """
+    A static file system storage backend which also saves hashed copies of
+    the files it collects, for caching them forever.
+    """
+    pass
 
 
 class AppStaticStorage(FileSystemStorage):
@@ -54,3 +287,10 @@ class AppStaticStorage(FileSystemStorage):
         location = os.path.join(mod_path, self.source_dir)
         super(AppStaticStorage, self).__init__(location, *args, **kwargs)
 
+
+
+class ConfiguredStorage(LazyObject):
+    def _setup(self):
+        self._wrapped = get_storage_class(settings.STATICFILES_STORAGE)()
+
+staticfiles_storage = ConfiguredStorage()
@@ -3,16 +3,23 @@ import fnmatch
 from django.conf import settings
 from django.core.exceptions import ImproperlyConfigured
 
-def is_ignored(path, ignore_patterns=[]):
+def matches_patterns(path, patterns=[]):
     """
-    Return True or False depending on whether the ``path`` should be
-    ignored (if it matches any pattern in ``ignore_patterns``).
+    Return True or False depending on whether the ``path`` matches any of
+    the glob-style ``patterns``.
     """
-    for pattern in ignore_patterns:
+    for pattern in patterns:
         if fnmatch.fnmatchcase(path, pattern):
             return True
     return False
 
+def is_ignored(path, ignore_patterns=[]):
+    """
+    Return True or False depending on whether the ``path`` should be
+    ignored (if it matches any pattern in ``ignore_patterns``).
+    """
+    return matches_patterns(path, ignore_patterns)
+
 def get_files(storage, ignore_patterns=[], location=''):
     """
     Recursively walk the storage directories yielding the paths
@@ -18,6 +18,7 @@ from django.conf import settings
 from django.core import signals
 from django.core.cache.backends.base import (
     InvalidCacheBackendError, CacheKeyWarning, BaseCache)
+from django.core.cache.stats import get_alias_stats
 from django.core.exceptions import ImproperlyConfigured
 from django.utils import importlib
 
@@ -122,6 +123,13 @@ def parse_backend_conf(backend, **kwargs):
     if conf is not None:
         args = conf.copy()
         args.update(kwargs)
+        stats = args.get('STATS')
+        if stats:
+            if stats == backend:
+                raise ImproperlyConfigured(
+                    "The '%s' cache can't store its own statistics." % backend)
+            # Every cache built from this alias records into the same stats.
+            args['STATS'] = get_alias_stats(backend, stats)
         backend = args.pop('BACKEND')
         location = args.pop('LOCATION', '')
         return backend, location, args
@@ -1,8 +1,10 @@
 "Base Cache class."
 
+import time
 import warnings
 
 from django.conf import settings
+from django.core.cache.stats import CacheStats, instrument
 from django.core.exceptions import ImproperlyConfigured, DjangoRuntimeWarning
 from django.utils.encoding import smart_str
 from django.utils.importlib import import_module
@@ -41,6 +43,72 @@ def get_key_func(key_func):
             return getattr(key_func_module, key_func_name)
     return default_key_func
 
+def _load_component(component):
+    """
+    Returns an instance of a serializer or compressor given either a dotted
+    path to its class, the class itself or an already built instance.
+    """
+    if isinstance(component, basestring):
+        module_path, class_name = component.rsplit('.', 1)
+        try:
+            component = getattr(import_module(module_path), class_name)
+        except (AttributeError, ImportError), e:
+            raise ImproperlyConfigured("Could not load '%s': %s" % (component, e))
+    if isinstance(component, type):
+        component = component()
+    return component
+
+def get_serializer(serializer):
+    """
+    Function to decide which value serializer to use.
+
+    Defaults to ``PickleSerializer``.
+    """
+    if serializer is None:
+        serializer = 'django.core.cache.serializers.PickleSerializer'
+    return _load_component(serializer)
+
+def get_compressor(compressor):
+    """
+    Function to decide which value compressor to use.
+
+    Defaults to ``None``, meaning values aren't compressed.
+    """
+    if compressor is None:
+        return None
+    return _load_component(compressor)
+
+# First item of the list a value stored with tags is cached as.
+TAGGED_VALUE_MARKER = 'django.core.cache:tagged'
+
+# Prefix of the keys the tags' generation counters are stored under, which
+# keeps them apart from the keys of cached values.
+TAG_KEY_PREFIX = 'django.core.cache.tag:'
+
+# Timeout of the tags' generation counters. It's longer than any value is
+# expected to be cached for, so that the counters don't expire before the
+# values stored with them.
+TAG_GENERATION_TIMEOUT = 60 * 60 * 24 * 365
+
+# Returned by _get_raw() for keys that aren't in the cache.
+_missing = object()
+
+def tagged_value(value, generations):
+    """
+    Returns what a value stored with tags is cached as: a list holding the
+    value and the generation each of its tags had when it was stored. A plain
+    list is used so that any serializer can store it.
+    """
+    return [TAGGED_VALUE_MARKER, value, generations]
+
+def is_tagged_value(data):
+    """
+    Returns True if data, as fetched from the cache, is a value stored with
+    tags.
+    """
+    return (isinstance(data, list) and len(data) == 3
+            and data[0] == TAGGED_VALUE_MARKER)
+
 class BaseCache(object):
     def __init__(self, params):
         timeout = params.get('timeout', params.get('TIMEOUT', 300))
@@ -66,6 +134,17 @@ class BaseCache(object):
         self.key_prefix = smart_str(params.get('KEY_PREFIX', ''))
         self.version = params.get('VERSION', 1)
         self.key_func = get_key_func(params.get('KEY_FUNCTION', None))
+        self.serializer = get_serializer(params.get('SERIALIZER', None))
+        self.compressor = get_compressor(params.get('COMPRESSOR', None))
+
+        stats = params.get('STATS', False)
+        if stats and not isinstance(stats, CacheStats):
+            # True keeps the statistics in memory, an alias names the cache
+            # they're stored in.
+            stats = CacheStats(stats is not True and stats or None)
+        self.stats = stats or None
+        if self.stats is not None:
+            instrument(self, self.stats)
 
     def make_key(self, key, version=None):
         """Constructs the key used by all other methods. By default it
@@ -81,7 +160,131 @@ class BaseCache(object):
         new_key = self.key_func(key, self.key_prefix, version)
         return new_key
 
-    def add(self, key, value, timeout=None, version=None):
+    def encode(self, value):
+        """
+        Converts a value into the byte string stored by the backend, using
+        the configured serializer and, if there is one, compressor.
+        """
+        data = self.serializer.dumps(value)
+        if self.compressor is not None:
+            data = self.compressor.compress(data)
+        if self.stats is not None:
+            self.stats.incr(bytes_written=len(data))
+        return data
+
+    def decode(self, data):
+        """
+        Reverses encode(), turning stored data back into the cached value.
+        """
+        if self.stats is not None:
+            self.stats.incr(bytes_read=len(data))
+        if self.compressor is not None:
+            data = self.compressor.decompress(data)
+        return self.serializer.loads(data)
+
+    def _decode_stored(self, data):
+        """
+        Decodes data fetched from the backend, returning _missing if it can't
+        be decoded, e.g. because it was written before the serializer or
+        compressor were changed. Backends treat that as a miss and delete the
+        key.
+        """
+        try:
+            return self.decode(data)
+        except Exception:
+            # Unpickling alone can raise nearly any exception; JSON raises
+            # ValueError and zlib zlib.error.
+            return _missing
+
+    def _tag_key(self, tag):
+        return TAG_KEY_PREFIX + tag
+
+    def _get_tag_generations(self, tags, timeout=None, create=False):
+        """
+        Returns a dict mapping each of the given tags to its current
+        generation, fetched in a single get_many(). If create is True, tags
+        without a generation get a new one, stored for at least
+        TAG_GENERATION_TIMEOUT seconds; otherwise they're left out.
+        """
+        keys = dict([(self._tag_key(tag), tag) for tag in tags])
+        generations = {}
+        for key, generation in self.get_many(keys.keys()).items():
+            generations[keys[key]] = generation
+        if create:
+            timeout = max(timeout or self.default_timeout, TAG_GENERATION_TIMEOUT)
+            created_elsewhere = []
+            for key, tag in keys.items():
+                if tag not in generations:
+                    # Generations are based on the current time so that a tag
+                    # whose counter was evicted never gets back a generation
+                    # that stale values were stored with.
+                    generation = int(time.time() * 1000000)
+                    # add() rather than set(), so that a generation created
+                    # meanwhile by another process isn't overwritten, which
+                    # would invalidate the values just stored with it.
+                    if self.add(key, generation, timeout):
+                        generations[tag] = generation
+                    else:
+                        created_elsewhere.append(key)
+            for key, generation in self.get_many(created_elsewhere).items():
+                generations[keys[key]] = generation
+        return generations
+
+    def tag_value(self, value, tags, timeout=None):
+        """
+        Wraps value with the current generation of each of the given tags, as
+        tagged_value() does. Returns value unchanged if there are no tags.
+        """
+        if not tags:
+            return value
+        return tagged_value(value, self._get_tag_generations(tags, timeout, create=True))
+
+    def untag_many(self, data):
+        """
+        Unwraps the tagged values in the given dict of fetched values, removing
+        those with an invalidated tag. The generations of all the tags involved
+        are fetched at once.
+        """
+        tagged = [(key, value) for key, value in data.items()
+                  if is_tagged_value(value)]
+        if not tagged:
+            return data
+        tags = set()
+        for key, (marker, value, generations) in tagged:
+            tags.update(generations)
+        current = self._get_tag_generations(tags)
+        for key, (marker, value, generations) in tagged:
+            for tag, generation in generations.items():
+                if current.get(tag) != generation:
+                    del data[key]
+                    break
+            else:
+                data[key] = value
+        return data
+
+    def untag(self, value, default=None):
+        """
+        Unwraps a single fetched value, returning default if one of its tags
+        has been invalidated or if the value is missing.
+        """
+        if value is _missing:
+            return default
+        if is_tagged_value(value):
+            return self.untag_many({'': value}).get('', default)
+        return value
+
+    def invalidate_tags(self, tags):
+        """
+        Invalidates every value stored with any of the given tags.
+        """
+        for tag in tags:
+            try:
+                self.incr(self._tag_key(tag))
+            except ValueError:
+                # Nothing was stored with the tag's current generation.
+                pass
+
+    def add(self, key, value, timeout=None, version=None, tags=None):
         """
         Set a value in the cache if the key does not already exist. If
         timeout is given, that timeout will be used for the key; otherwise
@@ -96,12 +299,22 @@ class BaseCache(object):
         Fetch a given key from the cache. If the key does not exist, return
         default, which itself defaults to None.
         """
+        return self.untag(self._get_raw(key, version=version), default)
+
+    def _get_raw(self, key, version=None):
+        """
+        Fetch a given key from the cache as it's stored, without checking the
+        tags of tagged values. If the key does not exist, return _missing.
+        """
         raise NotImplementedError
 
-    def set(self, key, value, timeout=None, version=None):
+    def set(self, key, value, timeout=None, version=None, tags=None):
         """
         Set a value in the cache. If timeout is given, that timeout will be
         used for the key; otherwise the default cache timeout will be used.
+
+        If tags are given, the value stops being returned once any of them is
+        passed to invalidate_tags().
         """
         raise NotImplementedError
 
@@ -137,13 +350,34 @@ class BaseCache(object):
         Add delta to value in the cache. If the key does not exist, raise a
         ValueError exception.
         """
-        value = self.get(key, version=version)
+        data = self._get_stored(key, version)
+        value = self.untag(data)
         if value is None:
             raise ValueError("Key '%s' not found" % key)
         new_value = value + delta
-        self.set(key, new_value, version=version)
+        self._set_stored(key, data, new_value, version)
         return new_value
 
+    def _get_stored(self, key, version):
+        """
+        Fetches a key as it's stored, for the methods that store its value
+        again and need to keep its tags.
+        """
+        try:
+            return self._get_raw(key, version=version)
+        except NotImplementedError:
+            # Backends that only implement get() can't keep the tags.
+            return self.get(key, _missing, version=version)
+
+    def _set_stored(self, key, data, value, version):
+        """
+        Stores value under key with the tags data, as returned by
+        _get_stored(), was stored with.
+        """
+        if is_tagged_value(data):
+            value = tagged_value(value, data[2])
+        self.set(key, value, version=version)
+
     def decr(self, key, delta=1, version=None):
         """
         Subtract delta from value in the cache. If the key does not exist, raise
@@ -160,7 +394,7 @@ class BaseCache(object):
         # if a subclass overrides it.
         return self.has_key(key)
 
-    def set_many(self, data, timeout=None, version=None):
+    def set_many(self, data, timeout=None, version=None, tags=None):
         """
         Set a bunch of values in the cache at once from a dict of key/value
         pairs.  For certain backends (memcached), this is much more efficient
@@ -169,7 +403,11 @@ class BaseCache(object):
         If timeout is given, that timeout will be used for the key; otherwise
         the default cache timeout will be used.
         """
+        if tags:
+            generations = self._get_tag_generations(tags, timeout, create=True)
         for key, value in data.items():
+            if tags:
+                value = tagged_value(value, generations)
             self.set(key, value, timeout=timeout, version=version)
 
     def delete_many(self, keys, version=None):
@@ -185,6 +423,18 @@ class BaseCache(object):
         """Remove *all* values from the cache at once."""
         raise NotImplementedError
 
+    def get_stats(self):
+        """
+        Returns a dictionary with a snapshot of the statistics recorded for
+        this cache by every process using it, which is empty unless it was
+        configured with STATS.
+        Backends that can report statistics of their own, like memcached, add
+        them under ``'servers'``.
+        """
+        if self.stats is None:
+            return {}
+        return self.stats.snapshot()
+
     def validate_key(self, key):
         """
         Warn about keys that would not be portable to the memcached
@@ -209,11 +459,12 @@ class BaseCache(object):
         if version is None:
             version = self.version
 
-        value = self.get(key, version=version)
+        data = self._get_stored(key, version)
+        value = self.untag(data)
         if value is None:
             raise ValueError("Key '%s' not found" % key)
 
-        self.set(key, value, version=version+delta)
+        self._set_stored(key, data, value, version+delta)
         self.delete(key, version=version)
         return version+delta
 
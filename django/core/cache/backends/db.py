@@ -1,13 +1,9 @@
 "Database cache backend."
 
-from django.core.cache.backends.base import BaseCache
+from django.core.cache.backends.base import BaseCache, _missing
 from django.db import connections, router, transaction, DatabaseError
-import base64, time
+import base64, binascii, time
 from datetime import datetime
-try:
-    import cPickle as pickle
-except ImportError:
-    import pickle
 
 class Options(object):
     """A class that will quack like a Django model _meta class.
@@ -35,7 +31,7 @@ class BaseDatabaseCache(BaseCache):
         self.cache_model_class = CacheEntry
 
 class DatabaseCache(BaseDatabaseCache):
-    def get(self, key, default=None, version=None):
+    def _get_raw(self, key, version=None):
         key = self.make_key(key, version=version)
         self.validate_key(key)
         db = router.db_for_read(self.cache_model_class)
@@ -45,23 +41,32 @@ class DatabaseCache(BaseDatabaseCache):
         cursor.execute("SELECT cache_key, value, expires FROM %s WHERE cache_key = %%s" % table, [key])
         row = cursor.fetchone()
         if row is None:
-            return default
+            return _missing
         now = datetime.now()
-        if row[2] < now:
+        value = _missing
+        if row[2] >= now:
+            try:
+                data = base64.decodestring(connections[db].ops.process_clob(row[1]))
+            except binascii.Error:
+                pass
+            else:
+                value = self._decode_stored(data)
+        if value is _missing:
+            # The entry has expired or can't be decoded.
             db = router.db_for_write(self.cache_model_class)
             cursor = connections[db].cursor()
             cursor.execute("DELETE FROM %s WHERE cache_key = %%s" % table, [key])
             transaction.commit_unless_managed(using=db)
-            return default
-        value = connections[db].ops.process_clob(row[1])
-        return pickle.loads(base64.decodestring(value))
+        return value
 
-    def set(self, key, value, timeout=None, version=None):
+    def set(self, key, value, timeout=None, version=None, tags=None):
+        value = self.tag_value(value, tags, timeout)
         key = self.make_key(key, version=version)
         self.validate_key(key)
         self._base_set('set', key, value, timeout)
 
-    def add(self, key, value, timeout=None, version=None):
+    def add(self, key, value, timeout=None, version=None, tags=None):
+        value = self.tag_value(value, tags, timeout)
         key = self.make_key(key, version=version)
         self.validate_key(key)
         return self._base_set('add', key, value, timeout)
@@ -79,7 +84,7 @@ class DatabaseCache(BaseDatabaseCache):
         exp = datetime.fromtimestamp(time.time() + timeout).replace(microsecond=0)
         if num > self._max_entries:
             self._cull(db, cursor, now)
-        encoded = base64.encodestring(pickle.dumps(value, 2)).strip()
+        encoded = base64.encodestring(self.encode(value)).strip()
         cursor.execute("SELECT cache_key, expires FROM %s WHERE cache_key = %%s" % table, [key])
         try:
             result = cursor.fetchone()
@@ -134,6 +139,8 @@ class DatabaseCache(BaseDatabaseCache):
             if num > self._max_entries:
                 cursor.execute("SELECT cache_key FROM %s ORDER BY cache_key LIMIT 1 OFFSET %%s" % table, [num / self._cull_frequency])
                 cursor.execute("DELETE FROM %s WHERE cache_key < %%s" % table, [cursor.fetchone()[0]])
+                if self.stats is not None:
+                    self.stats.incr(evictions=max(cursor.rowcount, 0))
 
     def clear(self):
         db = router.db_for_write(self.cache_model_class)
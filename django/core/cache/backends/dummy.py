@@ -6,7 +6,7 @@ class DummyCache(BaseCache):
     def __init__(self, host, *args, **kwargs):
         BaseCache.__init__(self, *args, **kwargs)
 
-    def add(self, key, value, timeout=None, version=None):
+    def add(self, key, value, timeout=None, version=None, tags=None):
         key = self.make_key(key, version=version)
         self.validate_key(key)
         return True
@@ -16,7 +16,7 @@ class DummyCache(BaseCache):
         self.validate_key(key)
         return default
 
-    def set(self, key, value, timeout=None, version=None):
+    def set(self, key, value, timeout=None, version=None, tags=None):
         key = self.make_key(key, version=version)
         self.validate_key(key)
 
@@ -32,7 +32,7 @@ class DummyCache(BaseCache):
         self.validate_key(key)
         return False
 
-    def set_many(self, data, version=None):
+    def set_many(self, data, timeout=None, version=None, tags=None):
         pass
 
     def delete_many(self, keys, version=None):
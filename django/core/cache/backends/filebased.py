@@ -9,7 +9,7 @@ try:
 except ImportError:
     import pickle
 
-from django.core.cache.backends.base import BaseCache
+from django.core.cache.backends.base import BaseCache, _missing
 
 class FileBasedCache(BaseCache):
     def __init__(self, dir, params):
@@ -18,14 +18,14 @@ class FileBasedCache(BaseCache):
         if not os.path.exists(self._dir):
             self._createdir()
 
-    def add(self, key, value, timeout=None, version=None):
+    def add(self, key, value, timeout=None, version=None, tags=None):
         if self.has_key(key, version=version):
             return False
 
-        self.set(key, value, timeout, version=version)
+        self.set(key, value, timeout, version=version, tags=tags)
         return True
 
-    def get(self, key, default=None, version=None):
+    def _get_raw(self, key, version=None):
         key = self.make_key(key, version=version)
         self.validate_key(key)
 
@@ -38,14 +38,18 @@ class FileBasedCache(BaseCache):
                 if exp < now:
                     self._delete(fname)
                 else:
-                    return pickle.load(f)
+                    value = self._decode_stored(f.read())
+                    if value is _missing:
+                        self._delete(fname)
+                    return value
             finally:
                 f.close()
         except (IOError, OSError, EOFError, pickle.PickleError):
             pass
-        return default
+        return _missing
 
-    def set(self, key, value, timeout=None, version=None):
+    def set(self, key, value, timeout=None, version=None, tags=None):
+        value = self.tag_value(value, tags, timeout)
         key = self.make_key(key, version=version)
         self.validate_key(key)
 
@@ -65,7 +69,7 @@ class FileBasedCache(BaseCache):
             try:
                 now = time.time()
                 pickle.dump(now + timeout, f, pickle.HIGHEST_PROTOCOL)
-                pickle.dump(value, f, pickle.HIGHEST_PROTOCOL)
+                f.write(self.encode(value))
             finally:
                 f.close()
         except (IOError, OSError):
@@ -122,13 +126,17 @@ class FileBasedCache(BaseCache):
         else:
             doomed = [os.path.join(self._dir, k) for (i, k) in enumerate(filelist) if i % self._cull_frequency == 0]
 
+        evicted = 0
         for topdir in doomed:
             try:
                 for root, _, files in os.walk(topdir):
                     for f in files:
                         self._delete(os.path.join(root, f))
+                        evicted += 1
             except (IOError, OSError):
                 pass
+        if self.stats is not None:
+            self.stats.incr(evictions=evicted)
 
     def _createdir(self):
         try:
@@ -6,7 +6,7 @@ try:
 except ImportError:
     import pickle
 
-from django.core.cache.backends.base import BaseCache
+from django.core.cache.backends.base import BaseCache, _missing
 from django.utils.synch import RWLock
 
 # Global in-memory store of cache data. Keyed by name, to provide
@@ -23,7 +23,8 @@ class LocMemCache(BaseCache):
         self._expire_info = _expire_info.setdefault(name, {})
         self._lock = _locks.setdefault(name, RWLock())
 
-    def add(self, key, value, timeout=None, version=None):
+    def add(self, key, value, timeout=None, version=None, tags=None):
+        value = self.tag_value(value, tags, timeout)
         key = self.make_key(key, version=version)
         self.validate_key(key)
         self._lock.writer_enters()
@@ -31,7 +32,7 @@ class LocMemCache(BaseCache):
             exp = self._expire_info.get(key)
             if exp is None or exp <= time.time():
                 try:
-                    self._set(key, pickle.dumps(value), timeout)
+                    self._set(key, self.encode(value), timeout)
                     return True
                 except pickle.PickleError:
                     pass
@@ -39,19 +40,20 @@ class LocMemCache(BaseCache):
         finally:
             self._lock.writer_leaves()
 
-    def get(self, key, default=None, version=None):
+    def _get_raw(self, key, version=None):
+        # Tags are checked by get() once the lock is released, as that reads
+        # the tags' generations from this same cache.
         key = self.make_key(key, version=version)
         self.validate_key(key)
         self._lock.reader_enters()
         try:
             exp = self._expire_info.get(key)
             if exp is None:
-                return default
-            elif exp > time.time():
-                try:
-                    return pickle.loads(self._cache[key])
-                except pickle.PickleError:
-                    return default
+                return _missing
+            if exp > time.time():
+                value = self._decode_stored(self._cache[key])
+                if value is not _missing:
+                    return value
         finally:
             self._lock.reader_leaves()
         self._lock.writer_enters()
@@ -61,7 +63,7 @@ class LocMemCache(BaseCache):
                 del self._expire_info[key]
             except KeyError:
                 pass
-            return default
+            return _missing
         finally:
             self._lock.writer_leaves()
 
@@ -73,12 +75,13 @@ class LocMemCache(BaseCache):
         self._cache[key] = value
         self._expire_info[key] = time.time() + timeout
 
-    def set(self, key, value, timeout=None, version=None):
+    def set(self, key, value, timeout=None, version=None, tags=None):
+        value = self.tag_value(value, tags, timeout)
         key = self.make_key(key, version=version)
         self.validate_key(key)
         self._lock.writer_enters()
         try:
-            self._set(key, pickle.dumps(value), timeout)
+            self._set(key, self.encode(value), timeout)
         except pickle.PickleError:
             pass
         finally:
@@ -110,11 +113,15 @@ class LocMemCache(BaseCache):
 
     def _cull(self):
         if self._cull_frequency == 0:
+            evicted = len(self._cache)
             self.clear()
         else:
             doomed = [k for (i, k) in enumerate(self._cache) if i % self._cull_frequency == 0]
+            evicted = len(doomed)
             for k in doomed:
                 self._delete(k)
+        if self.stats is not None:
+            self.stats.incr(evictions=evicted)
 
     def _delete(self, key):
         try:
@@ -3,7 +3,7 @@
 import time
 from threading import local
 
-from django.core.cache.backends.base import BaseCache, InvalidCacheBackendError
+from django.core.cache.backends.base import BaseCache, InvalidCacheBackendError, tagged_value, _missing
 from django.utils import importlib
 
 class BaseMemcachedCache(BaseCache):
@@ -49,20 +49,39 @@ class BaseMemcachedCache(BaseCache):
             timeout += int(time.time())
         return timeout
 
-    def add(self, key, value, timeout=0, version=None):
+    def _encode(self, value):
+        """
+        Encodes a value for the client library. Integers are passed through
+        untouched so that memcached's native incr/decr keep working on them.
+        """
+        if isinstance(value, (int, long)):
+            return value
+        return self.encode(value)
+
+    def _decode(self, value):
+        if isinstance(value, basestring):
+            return self._decode_stored(value)
+        return value
+
+    def add(self, key, value, timeout=0, version=None, tags=None):
+        value = self.tag_value(value, tags, timeout)
         key = self.make_key(key, version=version)
-        return self._cache.add(key, value, self._get_memcache_timeout(timeout))
+        return self._cache.add(key, self._encode(value), self._get_memcache_timeout(timeout))
 
-    def get(self, key, default=None, version=None):
+    def _get_raw(self, key, version=None):
         key = self.make_key(key, version=version)
         val = self._cache.get(key)
         if val is None:
-            return default
+            return _missing
+        val = self._decode(val)
+        if val is _missing:
+            self._cache.delete(key)
         return val
 
-    def set(self, key, value, timeout=0, version=None):
+    def set(self, key, value, timeout=0, version=None, tags=None):
+        value = self.tag_value(value, tags, timeout)
         key = self.make_key(key, version=version)
-        self._cache.set(key, value, self._get_memcache_timeout(timeout))
+        self._cache.set(key, self._encode(value), self._get_memcache_timeout(timeout))
 
     def delete(self, key, version=None):
         key = self.make_key(key, version=version)
@@ -73,50 +92,67 @@ class BaseMemcachedCache(BaseCache):
         ret = self._cache.get_multi(new_keys)
         if ret:
             _ = {}
+            undecodable = []
             m = dict(zip(new_keys, keys))
             for k, v in ret.items():
-                _[m[k]] = v
-            ret = _
+                v = self._decode(v)
+                if v is _missing:
+                    undecodable.append(k)
+                else:
+                    _[m[k]] = v
+            if undecodable:
+                self._cache.delete_multi(undecodable)
+            ret = self.untag_many(_)
         return ret
 
+    def get_stats(self):
+        stats = super(BaseMemcachedCache, self).get_stats()
+        stats['servers'] = dict(self._cache.get_stats())
+        return stats
+
     def close(self, **kwargs):
         self._cache.disconnect_all()
 
     def incr(self, key, delta=1, version=None):
-        key = self.make_key(key, version=version)
         try:
-            val = self._cache.incr(key, delta)
+            val = self._cache.incr(self.make_key(key, version=version), delta)
 
-        # python-memcache responds to incr on non-existent keys by
-        # raising a ValueError, pylibmc by raising a pylibmc.NotFound
-        # and Cmemcache returns None. In all cases,
-        # we should raise a ValueError though.
+        # python-memcache responds to incr on non-existent or non-numeric
+        # keys by raising a ValueError, pylibmc by raising a pylibmc.NotFound
+        # and Cmemcache returns None.
         except self.LibraryValueNotFoundException:
             val = None
         if val is None:
-            raise ValueError("Key '%s' not found" % key)
+            # Values stored with tags are pickled lists, which memcached can't
+            # increment. They're updated in two steps, keeping their tags; a
+            # missing key raises a ValueError.
+            return super(BaseMemcachedCache, self).incr(key, delta, version=version)
         return val
 
     def decr(self, key, delta=1, version=None):
-        key = self.make_key(key, version=version)
         try:
-            val = self._cache.decr(key, delta)
+            val = self._cache.decr(self.make_key(key, version=version), delta)
 
-        # python-memcache responds to incr on non-existent keys by
-        # raising a ValueError, pylibmc by raising a pylibmc.NotFound
-        # and Cmemcache returns None. In all cases,
-        # we should raise a ValueError though.
+        # python-memcache responds to decr on non-existent or non-numeric
+        # keys by raising a ValueError, pylibmc by raising a pylibmc.NotFound
+        # and Cmemcache returns None.
         except self.LibraryValueNotFoundException:
             val = None
         if val is None:
-            raise ValueError("Key '%s' not found" % key)
+            # Same as in incr(); BaseCache.incr() is used directly since
+            # memcached's incr() doesn't take negative deltas.
+            return BaseCache.incr(self, key, -delta, version=version)
         return val
 
-    def set_many(self, data, timeout=0, version=None):
+    def set_many(self, data, timeout=0, version=None, tags=None):
+        if tags:
+            generations = self._get_tag_generations(tags, timeout, create=True)
         safe_data = {}
         for key, value in data.items():
             key = self.make_key(key, version=version)
-            safe_data[key] = value
+            if tags:
+                value = tagged_value(value, generations)
+            safe_data[key] = self._encode(value)
         self._cache.set_multi(safe_data, self._get_memcache_timeout(timeout))
 
     def delete_many(self, keys, version=None):
@@ -0,0 +1,32 @@
+"""
+Compressors used by the cache backends to shrink serialized values.
+
+A compressor is any object with ``compress(data)`` and ``decompress(data)``
+methods. Select one per cache with the ``COMPRESSOR`` key of the
+``CACHES`` setting.
+"""
+import zlib
+
+
+class ZlibCompressor(object):
+    """
+    Compresses values with zlib once they reach ``min_length`` bytes.
+
+    Every stored value is prefixed with a one byte marker recording whether
+    it was compressed, so small values (and values that zlib can't shrink)
+    are stored as is. Subclass to change ``min_length`` or ``level``.
+    """
+    min_length = 1024
+    level = 6
+
+    def compress(self, data):
+        if len(data) >= self.min_length:
+            compressed = zlib.compress(data, self.level)
+            if len(compressed) < len(data):
+                return 'z' + compressed
+        return '-' + data
+
+    def decompress(self, data):
+        if data[:1] == 'z':
+            return zlib.decompress(data[1:])
+        return data[1:]
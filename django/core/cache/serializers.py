@@ -0,0 +1,39 @@
+"""
+Serializers used by the cache backends to turn values into byte strings.
+
+A serializer is any object with ``dumps(value)`` and ``loads(data)``
+methods. Select one per cache with the ``SERIALIZER`` key of the
+``CACHES`` setting.
+"""
+try:
+    import cPickle as pickle
+except ImportError:
+    import pickle
+
+from django.utils import simplejson
+
+
+class PickleSerializer(object):
+    """
+    Serializes values with the most efficient pickle protocol available. This
+    is the default and handles any picklable Python object.
+    """
+    protocol = pickle.HIGHEST_PROTOCOL
+
+    def dumps(self, value):
+        return pickle.dumps(value, self.protocol)
+
+    def loads(self, data):
+        return pickle.loads(data)
+
+
+class JSONSerializer(object):
+    """
+    Serializes values as compact JSON. Only values representable in JSON can
+    be cached, and strings are returned as unicode.
+    """
+    def dumps(self, value):
+        return simplejson.dumps(value, separators=(',', ':'))
+
+    def loads(self, data):
+        return simplejson.loads(data)
@@ -0,0 +1,410 @@
+"""
+Instrumentation for the cache backends.
+
+When a cache is configured with ``'STATS': True`` every call to its public
+API is counted and timed in a ``CacheStats`` object. Caches built from the
+same ``CACHES`` alias share one ``CacheStats`` object, so the numbers cover
+all of the process' use of that alias.
+
+``'STATS'`` can also name another ``CACHES`` alias, dedicated to statistics.
+The counts of every process are then added to that cache, so that they can be
+read from any process, without taking room in the instrumented cache.
+"""
+import re
+import threading
+import time
+
+from django.utils.encoding import smart_str
+
+# Prefix of the keys the statistics are stored under in a statistics cache.
+STATS_KEY_PREFIX = 'django.core.cache.stats:'
+
+# Timeout of the keys the statistics are stored under in a statistics cache.
+STATS_TIMEOUT = 60 * 60 * 24 * 365
+
+# Counts are buffered in each process and added to a statistics cache at
+# most once per this many seconds, so that recording them doesn't double the
+# number of cache round trips.
+FLUSH_INTERVAL = 1.0
+
+# Hits and misses are counted separately for at most this many key prefixes.
+MAX_PREFIXES = 1000
+
+# Longer key prefixes are truncated, so that the keys built from them stay
+# within memcached's limit.
+MAX_PREFIX_LENGTH = 150
+
+# The operations that are counted and timed.
+OPERATIONS = ('get', 'get_many', 'has_key', 'add', 'set', 'set_many',
+              'delete', 'delete_many', 'incr', 'decr')
+
+# CacheStats objects shared by the caches built from a CACHES alias.
+_alias_stats = {}
+_alias_stats_lock = threading.Lock()
+
+def get_alias_stats(alias, stats):
+    """
+    Returns the ``CacheStats`` object shared by every cache built from the
+    given ``CACHES`` alias, whose ``STATS`` argument is ``stats``.
+    """
+    _alias_stats_lock.acquire()
+    try:
+        if (alias, stats) not in _alias_stats:
+            store = None
+            if stats is not True:
+                store = stats
+            _alias_stats[alias, stats] = CacheStats(store)
+        return _alias_stats[alias, stats]
+    finally:
+        _alias_stats_lock.release()
+
+key_prefix_re = re.compile(r'^.*[:.]')
+
+def get_key_prefix(key):
+    """
+    Returns the prefix the hits and misses of the given key are counted
+    under: the key up to and including its last ':' or '.', e.g.
+    ``'user:'`` for ``'user:42'``. Keys without separators have an empty
+    prefix.
+    """
+    match = key_prefix_re.match(smart_str(key))
+    if match is None:
+        return ''
+    return match.group()[:MAX_PREFIX_LENGTH]
+
+def _hit_ratio(hits, misses):
+    if not hits + misses:
+        return None
+    return float(hits) / (hits + misses)
+
+class CacheStats(object):
+    """
+    Counters of cache hits and misses (in total and per key prefix), writes,
+    evictions and bytes transferred, plus the number of calls and time spent
+    per operation.
+
+    The counters are kept in memory, unless ``store`` names the ``CACHES``
+    alias of a cache they're added to instead.
+    """
+    counters = ('hits', 'misses', 'sets', 'deletes', 'evictions',
+                'bytes_read', 'bytes_written')
+
+    def __init__(self, store=None):
+        self.store = store
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._counts = {}
+        self._pending = {}
+        self._new_prefixes = []
+        self._prefixes = set()
+        self._flushed_at = time.time()
+
+    def _get_store(self):
+        from django.core.cache import get_cache
+        if getattr(self, '_store_cache', None) is None:
+            self._store_cache = get_cache(self.store)
+        return self._store_cache
+
+    def _key(self, name):
+        return STATS_KEY_PREFIX + name
+
+    def _flushing(self):
+        return getattr(self._local, 'flushing', False)
+
+    def incr(self, **counts):
+        """
+        Adds the given amounts to the named counters, e.g.
+        ``stats.incr(hits=2, misses=1)``.
+
+        Backends call this while they may hold locks of their own, so the
+        counts are only buffered.
+        """
+        # The statistics' own reads and writes aren't recorded.
+        if self._flushing():
+            return
+        self._lock.acquire()
+        try:
+            for name, count in counts.items():
+                if name.startswith(('hits:', 'misses:')):
+                    prefix = name.split(':', 1)[1]
+                    if prefix not in self._prefixes:
+                        if len(self._prefixes) >= MAX_PREFIXES:
+                            continue
+                        self._prefixes.add(prefix)
+                        self._new_prefixes.append(prefix)
+                if count:
+                    self._pending[name] = self._pending.get(name, 0) + count
+        finally:
+            self._lock.release()
+
+    def record(self, operation, duration, counts):
+        """
+        Records one call of the given operation that took ``duration``
+        seconds, adding ``counts`` to the counters as incr() does. The names
+        of the counts are those of the counters, or ``'hits:<prefix>'`` and
+        ``'misses:<prefix>'`` for the lookups of keys with that prefix.
+
+        The counts are flushed if the last flush was more than
+        FLUSH_INTERVAL seconds ago.
+        """
+        if self._flushing():
+            return
+        counts = dict(counts)
+        counts['calls:' + operation] = 1
+        counts['time:' + operation] = int(duration * 1000000)
+        self.incr(**counts)
+        if time.time() - self._flushed_at >= FLUSH_INTERVAL:
+            self.flush()
+
+    def flush(self):
+        """
+        Adds the counts recorded since the last flush to the counters, in
+        memory or in the statistics cache.
+        """
+        self._lock.acquire()
+        try:
+            pending, self._pending = self._pending, {}
+            new_prefixes, self._new_prefixes = self._new_prefixes, []
+            self._flushed_at = time.time()
+            if self.store is None:
+                for name, count in pending.items():
+                    self._counts[name] = self._counts.get(name, 0) + count
+                return
+        finally:
+            self._lock.release()
+        if not pending and not new_prefixes:
+            return
+        self._local.flushing = True
+        try:
+            store = self._get_store()
+            for prefix in new_prefixes:
+                self._register_prefix(store, prefix)
+            for name, count in pending.items():
+                self._incr_stored(store, self._key(name), count)
+        finally:
+            self._local.flushing = False
+
+    def _incr_stored(self, store, key, delta):
+        """
+        Adds delta to a counter of the statistics cache, creating it if
+        needed, and returns its new value. add() and incr() are atomic with
+        memcached, so counts flushed by several processes at once add up.
+        """
+        try:
+            return store.incr(key, delta)
+        except ValueError:
+            if store.add(key, delta, STATS_TIMEOUT):
+                return delta
+            # Another process created the counter meanwhile.
+            return store.incr(key, delta)
+
+    def _register_prefix(self, store, prefix):
+        """
+        Adds a key prefix to the list of those with counters in the
+        statistics cache, unless another process already did.
+        """
+        if store.add(self._key('prefix_seen:' + prefix), 1, STATS_TIMEOUT):
+            number = self._incr_stored(store, self._key('prefixes'), 1)
+            store.set(self._key('prefix:%d' % number), prefix, STATS_TIMEOUT)
+
+    def _get_stored_prefixes(self, store):
+        count = min(store.get(self._key('prefixes'), 0), MAX_PREFIXES)
+        keys = [self._key('prefix:%d' % number) for number in range(1, count + 1)]
+        return store.get_many(keys).values()
+
+    def _names(self, prefixes):
+        names = list(self.counters)
+        for operation in OPERATIONS:
+            names.extend(['calls:' + operation, 'time:' + operation])
+        for prefix in prefixes:
+            names.extend(['hits:' + prefix, 'misses:' + prefix])
+        return names
+
+    def reset(self):
+        """
+        Sets all the counters back to zero.
+        """
+        self._lock.acquire()
+        try:
+            self._counts = {}
+            self._pending = {}
+            self._new_prefixes = []
+            self._prefixes = set()
+        finally:
+            self._lock.release()
+        if self.store is None:
+            return
+        self._local.flushing = True
+        try:
+            store = self._get_store()
+            prefixes = self._get_stored_prefixes(store)
+            names = self._names(prefixes) + ['prefixes']
+            count = store.get(self._key('prefixes'), 0)
+            names.extend(['prefix:%d' % number for number in range(1, count + 1)])
+            names.extend(['prefix_seen:' + prefix for prefix in prefixes])
+            store.delete_many([self._key(name) for name in names])
+        finally:
+            self._local.flushing = False
+
+    def _get_values(self):
+        """
+        Returns the key prefixes with counters and a dictionary of the value
+        of every counter.
+        """
+        if self.store is None:
+            self._lock.acquire()
+            try:
+                prefixes = list(self._prefixes)
+                counts = dict(self._counts)
+            finally:
+                self._lock.release()
+            return prefixes, dict([(name, counts.get(name, 0))
+                                   for name in self._names(prefixes)])
+        self._local.flushing = True
+        try:
+            store = self._get_store()
+            prefixes = self._get_stored_prefixes(store)
+            names = self._names(prefixes)
+            stored = store.get_many([self._key(name) for name in names])
+        finally:
+            self._local.flushing = False
+        return prefixes, dict([(name, stored.get(self._key(name), 0))
+                               for name in names])
+
+    def snapshot(self):
+        """
+        Returns a dictionary with the current value of every counter and their
+        ``hit_ratio``. Under ``'operations'``, a dictionary maps each operation
+        name to its ``calls``, ``total_time`` and ``average_time``, and under
+        ``'prefixes'`` another maps each key prefix to its ``hits``,
+        ``misses`` and ``hit_ratio``.
+        """
+        self.flush()
+        prefixes, values = self._get_values()
+
+        data = dict([(name, values[name]) for name in self.counters])
+        data['hit_ratio'] = _hit_ratio(data['hits'], data['misses'])
+        operations = {}
+        for operation in OPERATIONS:
+            calls = values['calls:' + operation]
+            if calls:
+                total = values['time:' + operation] / 1000000.0
+                operations[operation] = {
+                    'calls': calls,
+                    'total_time': total,
+                    'average_time': total / calls,
+                }
+        data['operations'] = operations
+        data['prefixes'] = {}
+        for prefix in prefixes:
+            hits, misses = values['hits:' + prefix], values['misses:' + prefix]
+            data['prefixes'][prefix] = {
+                'hits': hits,
+                'misses': misses,
+                'hit_ratio': _hit_ratio(hits, misses),
+            }
+        return data
+
+# Default passed to the wrapped get() to tell misses from cached values.
+_missing = object()
+
+class _Depth(threading.local):
+    value = 0
+
+def _count_lookup(counts, key, hit):
+    """
+    Counts a hit or a miss of the given key, in total and for its prefix.
+    """
+    result = hit and 'hits' or 'misses'
+    name = '%s:%s' % (result, get_key_prefix(key))
+    counts[result] = counts.get(result, 0) + 1
+    counts[name] = counts.get(name, 0) + 1
+
+def instrument(cache, stats):
+    """
+    Replaces the public methods of the given cache instance with wrappers that
+    record their calls in ``stats``.
+
+    Only the outermost call is recorded, so that e.g. a get_many() implemented
+    in terms of get() counts as a single get_many() operation.
+    """
+    depth = _Depth()
+    original = {}
+    for name in OPERATIONS:
+        original[name] = getattr(cache, name)
+
+    def timed(operation, func):
+        def wrapper(*args, **kwargs):
+            if depth.value:
+                return func({}, *args, **kwargs)
+            counts = {}
+            depth.value += 1
+            start = time.time()
+            try:
+                return func(counts, *args, **kwargs)
+            finally:
+                depth.value -= 1
+                stats.record(operation, time.time() - start, counts)
+        wrapper.__name__ = operation
+        wrapper.__doc__ = original[operation].__doc__
+        return wrapper
+
+    def get(counts, key, default=None, version=None):
+        value = original['get'](key, _missing, version)
+        _count_lookup(counts, key, value is not _missing)
+        if value is _missing:
+            return default
+        return value
+
+    def get_many(counts, keys, *args, **kwargs):
+        keys = list(keys)
+        result = original['get_many'](keys, *args, **kwargs)
+        for key in keys:
+            _count_lookup(counts, key, key in result)
+        return result
+
+    def has_key(counts, key, *args, **kwargs):
+        result = original['has_key'](key, *args, **kwargs)
+        _count_lookup(counts, key, result)
+        return result
+
+    def add(counts, *args, **kwargs):
+        result = original['add'](*args, **kwargs)
+        if result:
+            counts['sets'] = 1
+        return result
+
+    def set(counts, *args, **kwargs):
+        counts['sets'] = 1
+        return original['set'](*args, **kwargs)
+
+    def set_many(counts, data, *args, **kwargs):
+        counts['sets'] = len(data)
+        return original['set_many'](data, *args, **kwargs)
+
+    def delete(counts, *args, **kwargs):
+        counts['deletes'] = 1
+        return original['delete'](*args, **kwargs)
+
+    def delete_many(counts, keys, *args, **kwargs):
+        keys = list(keys)
+        counts['deletes'] = len(keys)
+        return original['delete_many'](keys, *args, **kwargs)
+
+    def counter(operation):
+        def update(counts, key, *args, **kwargs):
+            try:
+                result = original[operation](key, *args, **kwargs)
+            except ValueError:
+                _count_lookup(counts, key, False)
+                raise
+            _count_lookup(counts, key, True)
+            return result
+        return update
+
+    for operation, func in (('get', get), ('get_many', get_many),
+                            ('has_key', has_key), ('add', add), ('set', set),
+                            ('set_many', set_many), ('delete', delete),
+                            ('delete_many', delete_many),
+                            ('incr', counter('incr')), ('decr', counter('decr'))):
+        setattr(cache, operation, timed(operation, func))
@@ -57,11 +57,14 @@ class UploadedFile(File):
 class TemporaryUploadedFile(UploadedFile):
     """
     A file uploaded to a temporary location (i.e. stream-to-disk).
+
+    The file is created in ``temp_dir`` if given, or else in the
+    ``FILE_UPLOAD_TEMP_DIR`` setting's directory.
     """
-    def __init__(self, name, content_type, size, charset):
-        if settings.FILE_UPLOAD_TEMP_DIR:
-            file = tempfile.NamedTemporaryFile(suffix='.upload',
-                dir=settings.FILE_UPLOAD_TEMP_DIR)
+    def __init__(self, name, content_type, size, charset, temp_dir=None):
+        temp_dir = temp_dir or settings.FILE_UPLOAD_TEMP_DIR
+        if temp_dir:
+            file = tempfile.NamedTemporaryFile(suffix='.upload', dir=temp_dir)
         else:
             file = tempfile.NamedTemporaryFile(suffix='.upload')
         super(TemporaryUploadedFile, self).__init__(file, name, content_type, size, charset)
@@ -2,6 +2,8 @@
 Base file upload handler classes, and the built-in concrete subclasses
 """
 
+import errno
+import os
 try:
     from cStringIO import StringIO
 except ImportError:
@@ -9,12 +11,13 @@ except ImportError:
 
 from django.conf import settings
 from django.core.exceptions import ImproperlyConfigured
+from django.core.files.temp import gettempdir
 from django.core.files.uploadedfile import TemporaryUploadedFile, InMemoryUploadedFile
 from django.utils import importlib
 
 __all__ = ['UploadFileException','StopUpload', 'SkipFile', 'FileUploadHandler',
            'TemporaryFileUploadHandler', 'MemoryFileUploadHandler',
-           'load_handler', 'StopFutureHandlers']
+           'StorageFileUploadHandler', 'load_handler', 'StopFutureHandlers']
 
 class UploadFileException(Exception):
     """
@@ -120,6 +123,14 @@ class FileUploadHandler(object):
         """
         pass
 
+    def upload_interrupted(self):
+        """
+        Signal that the current file won't be completed, because it was
+        skipped, the upload was stopped or an error occurred. Subclasses should
+        discard the data received for it.
+        """
+        pass
+
 class TemporaryFileUploadHandler(FileUploadHandler):
     """
     Upload handler that streams data into a temporary file.
@@ -190,6 +201,90 @@ class MemoryFileUploadHandler(FileUploadHandler):
             charset = self.charset
         )
 
+class StorageFileUploadHandler(FileUploadHandler):
+    """
+    Upload handler that streams data into a temporary file for a storage with
+    local paths, so that saving the upload to that storage can rename the file
+    instead of copying it.
+
+    Storages without local paths are left to the following handlers.
+    """
+    #: The storage uploads will be saved to; ``None`` for the default storage.
+    storage = None
+    #: The directory of the storage that holds the temporary files; ``None``
+    #: for the ``FILE_UPLOAD_TEMP_DIR`` setting's directory.
+    temp_dir = None
+
+    def __init__(self, request=None, storage=None):
+        super(StorageFileUploadHandler, self).__init__(request)
+        if storage is not None:
+            self.storage = storage
+        if self.storage is None:
+            from django.core.files.storage import default_storage
+            self.storage = default_storage
+        self._temp_path = None
+        self.activated = False
+
+    def get_temp_path(self):
+        """
+        Returns the directory to create temporary files in, creating it if
+        needed, or ``None`` if the storage doesn't have local paths.
+        """
+        if self._temp_path is None:
+            try:
+                path = self.storage.path(self.temp_dir or '')
+            except NotImplementedError:
+                return None
+            if self.temp_dir:
+                try:
+                    os.makedirs(path)
+                except OSError, e:
+                    if e.errno != errno.EEXIST:
+                        raise
+            else:
+                path = settings.FILE_UPLOAD_TEMP_DIR or gettempdir()
+            self._temp_path = path
+        return self._temp_path
+
+    def new_file(self, *args, **kwargs):
+        super(StorageFileUploadHandler, self).new_file(*args, **kwargs)
+        temp_path = self.get_temp_path()
+        self.activated = temp_path is not None
+        if self.activated:
+            self.file = TemporaryUploadedFile(self.file_name, self.content_type,
+                                              0, self.charset, temp_dir=temp_path)
+            raise StopFutureHandlers()
+
+    def receive_data_chunk(self, raw_data, start):
+        if self.activated:
+            self.file.write(raw_data)
+        else:
+            return raw_data
+
+    def file_complete(self, file_size):
+        if not self.activated:
+            return
+        # The file now belongs to the request; it mustn't be removed if a
+        # later file is interrupted.
+        self.activated = False
+        self.file.seek(0)
+        self.file.size = file_size
+        return self.file
+
+    def upload_interrupted(self):
+        """
+        Removes the temporary file of the interrupted upload.
+        """
+        if not self.activated:
+            return
+        temp_path = self.file.temporary_file_path()
+        self.file.close()
+        try:
+            os.remove(temp_path)
+        except OSError, e:
+            if e.errno != errno.ENOENT:
+                raise
+
 
 def load_handler(path, *args, **kwargs):
     """
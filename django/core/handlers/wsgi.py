@@ -1,10 +1,6 @@
 from pprint import pformat
 import sys
 from threading import Lock
-try:
-    from cStringIO import StringIO
-except ImportError:
-    from StringIO import StringIO
 import socket
 
 from django import http
@@ -67,8 +63,11 @@ class LimitedStream(object):
     '''
     LimitedStream wraps another stream in order to not allow reading from it
     past specified amount of bytes.
+
+    readline() reads from the stream ``buf_size`` bytes at a time, keeping
+    whatever follows the line for the next read.
     '''
-    def __init__(self, stream, limit, buf_size=64 * 1024 * 1024):
+    def __init__(self, stream, limit, buf_size=64 * 1024):
         self.stream = stream
         self.remaining = limit
         self.buffer = ''
@@ -96,23 +95,32 @@ class LimitedStream(object):
         return result
 
     def readline(self, size=None):
-        while '\n' not in self.buffer and \
-              (size is None or len(self.buffer) < size):
-            if size:
-                # since size is not None here, len(self.buffer) < size
-                chunk = self._read_limited(size - len(self.buffer))
+        # As with files, a negative size means no limit.
+        if size is not None and size < 0:
+            size = None
+        # Only the newly read data is searched for the line end, and the
+        # pieces of a long line are joined once it's complete.
+        pieces = []
+        length = 0
+        data, self.buffer = self.buffer, ''
+        while True:
+            end = data.find('\n') + 1 or None
+            if size is not None and length + (end or len(data)) >= size:
+                end = size - length
+            if end is not None:
+                pieces.append(data[:end])
+                self.buffer = data[end:]
+                break
+            pieces.append(data)
+            length += len(data)
+            if size is None:
+                chunk_size = self.buf_size
             else:
-                chunk = self._read_limited()
-            if not chunk:
+                chunk_size = min(self.buf_size, size - length)
+            data = self._read_limited(chunk_size)
+            if not data:
                 break
-            self.buffer += chunk
-        sio = StringIO(self.buffer)
-        if size:
-            line = sio.readline(size)
-        else:
-            line = sio.readline()
-        self.buffer = sio.read()
-        return line
+        return ''.join(pieces)
 
 class WSGIRequest(http.HttpRequest):
     def __init__(self, environ):
@@ -257,5 +265,10 @@ class WSGIHandler(base.BaseHandler):
         for c in response.cookies.values():
             response_headers.append(('Set-Cookie', str(c.output(header=''))))
         start_response(status, response_headers)
+        # Let the server send files in the most efficient way it knows.
+        if isinstance(response, http.FileResponse) and 'wsgi.file_wrapper' in environ:
+            filelike = response.wsgi_file()
+            if filelike is not None:
+                return environ['wsgi.file_wrapper'](filelike, response.block_size)
         return response
 
@@ -0,0 +1,62 @@
+from optparse import make_option
+
+from django.conf import settings
+from django.core.cache import get_cache
+from django.core.management.base import BaseCommand, CommandError
+
+class Command(BaseCommand):
+    help = ("Prints a snapshot of the statistics recorded for the given cache "
+            "aliases (or all of them), including the key prefixes with the "
+            "lowest hit ratios and the statistics reported by memcached "
+            "servers.")
+    args = '[alias ...]'
+
+    option_list = BaseCommand.option_list + (
+        make_option('--prefixes', action='store', dest='prefixes', type='int',
+            default=10, help='Number of key prefixes to show, those with the '
+                'lowest hit ratios first. Defaults to 10.'),
+    )
+
+    requires_model_validation = False
+
+    def handle(self, *aliases, **options):
+        if not aliases:
+            aliases = sorted(settings.CACHES)
+        max_prefixes = options.get('prefixes', 10)
+        output = []
+        for alias in aliases:
+            if alias not in settings.CACHES:
+                raise CommandError("Unknown cache alias '%s'" % alias)
+            stats = get_cache(alias).get_stats()
+            output.append("[%s]" % alias)
+            if not stats:
+                output.append("  No statistics recorded; set 'STATS': True "
+                              "for this cache to enable them.")
+                continue
+            servers = stats.pop('servers', {})
+            operations = stats.pop('operations', {})
+            prefixes = stats.pop('prefixes', {})
+            for name in sorted(stats):
+                value = stats[name]
+                if name == 'hit_ratio' and value is not None:
+                    value = '%.1f%%' % (value * 100)
+                output.append("  %s: %s" % (name, value))
+            for operation in sorted(operations):
+                timing = operations[operation]
+                output.append("  %s: %d calls, %.3f ms average" % (
+                    operation, timing['calls'], timing['average_time'] * 1000))
+            # The prefixes with the lowest hit ratio, and the most misses
+            # among those with the same ratio, come first.
+            ranked = sorted([(counts['hit_ratio'], -counts['misses'], prefix)
+                             for prefix, counts in prefixes.items()
+                             if counts['hit_ratio'] is not None])
+            for hit_ratio, misses, prefix in ranked[:max_prefixes]:
+                counts = prefixes[prefix]
+                output.append("  prefix '%s': %d hits, %d misses, %.1f%% hit ratio" % (
+                    prefix, counts['hits'], counts['misses'],
+                    counts['hit_ratio'] * 100))
+            for server in sorted(servers):
+                output.append("  server %s:" % server)
+                for name, value in sorted(servers[server].items()):
+                    output.append("    %s: %s" % (name, value))
+        return '\n'.join(output)
@@ -1,5 +1,9 @@
+import gzip
+import os
+
 from django.core.exceptions import ImproperlyConfigured
 from django.core.management.base import BaseCommand, CommandError
+from django.core.management.parallel import can_use_processes, map_in_processes
 from django.core import serializers
 from django.db import connections, router, DEFAULT_DB_ALIAS
 from django.utils.datastructures import SortedDict
@@ -21,6 +25,14 @@ class Command(BaseCommand):
             help='Use natural keys if they are available.'),
         make_option('-a', '--all', action='store_true', dest='use_base_manager', default=False,
             help="Use Django's base manager to dump all models stored in the database, including those that would otherwise be filtered or modified by a custom manager."),
+        make_option('-o', '--output', default=None, dest='output',
+            help='Specifies a file to write the serialized data to.'),
+        make_option('--output-dir', default=None, dest='output_dir',
+            help='Specifies a directory to write the serialized data of each model to, in a file named after the model.'),
+        make_option('-z', '--gzip', action='store_true', dest='gzip', default=False,
+            help='Compresses the output with gzip.'),
+        make_option('--parallel', default=0, dest='parallel', type='int',
+            help='Dumps the models with this many worker processes. Requires --output-dir.'),
     )
     help = ("Output the contents of the database as a fixture of the given "
             "format (using each model's default manager unless --all is "
@@ -38,6 +50,15 @@ class Command(BaseCommand):
         show_traceback = options.get('traceback', False)
         use_natural_keys = options.get('use_natural_keys', False)
         use_base_manager = options.get('use_base_manager', False)
+        output = options.get('output', None)
+        output_dir = options.get('output_dir', None)
+        compress = options.get('gzip', False)
+        parallel = options.get('parallel', 0)
+
+        if output and output_dir:
+            raise CommandError("--output and --output-dir can't be used together.")
+        if parallel and not output_dir:
+            raise CommandError("--parallel requires --output-dir.")
 
         excluded_apps = set()
         excluded_models = set()
@@ -98,25 +119,93 @@ class Command(BaseCommand):
         except KeyError:
             raise CommandError("Unknown serialization format: %s" % format)
 
-        # Now collate the objects to be serialized.
-        objects = []
-        for model in sort_dependencies(app_list.items()):
-            if model in excluded_models:
-                continue
-            if not model._meta.proxy and router.allow_syncdb(using, model):
-                if use_base_manager:
-                    objects.extend(model._base_manager.using(using).all())
-                else:
-                    objects.extend(model._default_manager.using(using).all())
+        models = [model for model in sort_dependencies(app_list.items())
+                  if model not in excluded_models and not model._meta.proxy
+                  and router.allow_syncdb(using, model)]
 
         try:
-            return serializers.serialize(format, objects, indent=indent,
+            if output_dir:
+                jobs = []
+                for model in models:
+                    filename = os.path.join(output_dir, '%s.%s.%s' % (
+                        model._meta.app_label, model._meta.object_name.lower(), format))
+                    if compress:
+                        filename += '.gz'
+                    jobs.append((model._meta.app_label, model._meta.object_name,
+                                 filename, compress, format, using, use_base_manager,
+                                 {'indent': indent, 'use_natural_keys': use_natural_keys}))
+                if parallel > 1 and len(jobs) > 1 and can_use_processes(connection):
+                    map_in_processes(dump_model, jobs, parallel)
+                else:
+                    for job in jobs:
+                        dump_model(job)
+            else:
+                def get_all_objects():
+                    for model in models:
+                        for obj in get_objects(model, using, use_base_manager):
+                            yield obj
+                if output:
+                    serialize_to_file(output, compress, format,
+                        get_all_objects(), indent=indent,
                         use_natural_keys=use_natural_keys)
+                else:
+                    stream = self.stdout
+                    if compress:
+                        stream = gzip.GzipFile(mode='wb', fileobj=self.stdout)
+                    serializers.serialize(format, get_all_objects(), indent=indent,
+                        use_natural_keys=use_natural_keys, stream=stream)
+                    if compress:
+                        stream.close()
         except Exception, e:
             if show_traceback:
                 raise
             raise CommandError("Unable to serialize database: %s" % e)
 
+def get_objects(model, using, use_base_manager=False):
+    # iterator() doesn't cache the rows, so that only the objects
+    # being serialized are kept in memory.
+    if use_base_manager:
+        return model._base_manager.using(using).iterator()
+    return model._default_manager.using(using).iterator()
+
+def serialize_to_file(filename, compress, format, objects, **options):
+    """
+    Serializes the objects into the given file, compressing it with gzip
+    if compress is True. Returns the number of objects serialized.
+    """
+    counter = [0]
+    def count(objects):
+        for obj in objects:
+            counter[0] += 1
+            yield obj
+    if compress:
+        stream = gzip.GzipFile(filename, 'wb')
+    else:
+        stream = open(filename, 'wb')
+    try:
+        serializers.serialize(format, count(objects), stream=stream, **options)
+    finally:
+        stream.close()
+    return counter[0]
+
+def dump_model(job):
+    """
+    Serializes the objects of a model into a file of their own. The file is
+    removed if there aren't any, as there's nothing to load from an empty
+    fixture. Returns the number of objects serialized.
+
+    The job is a tuple of arguments rather than a model, so that it can be
+    handed to a worker process.
+    """
+    from django.db.models import get_model
+    app_label, object_name, filename, compress, format, using, use_base_manager, options = job
+    model = get_model(app_label, object_name)
+    count = serialize_to_file(filename, compress, format,
+                              get_objects(model, using, use_base_manager), **options)
+    if not count:
+        os.remove(filename)
+    return count
+
 def sort_dependencies(app_list):
     """Sort a list of app,modellist pairs into a single list of models.
 
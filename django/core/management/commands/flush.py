@@ -35,7 +35,10 @@ class Command(NoArgsCommand):
             except ImportError:
                 pass
 
-        sql_list = sql_flush(self.style, connection, only_django=True)
+        # Callers that know which tables need emptying, such as
+        # TransactionTestCase, can restrict the flush to them.
+        tables = options.get('tables')
+        sql_list = sql_flush(self.style, connection, only_django=True, tables=tables)
 
         if interactive:
             confirm = raw_input("""You have requested a flush of the database.
@@ -69,11 +72,13 @@ The full error: %s""" % (connection.settings_dict['NAME'], e))
             for app in models.get_apps():
                 all_models.extend([
                     m for m in models.get_models(app, include_auto_created=True)
-                    if router.allow_syncdb(db, m)
+                    if router.allow_syncdb(db, m) and
+                        (tables is None or m._meta.db_table in tables)
                 ])
             emit_post_sync_signal(set(all_models), verbosity, interactive, db)
 
-            # Reinstall the initial_data fixture.
+            # Reinstall the initial_data fixture, only in the flushed tables
+            # if they're given.
             kwargs = options.copy()
             kwargs['database'] = db
             call_command('loaddata', 'initial_data', **kwargs)
@@ -2,14 +2,20 @@ import sys
 import os
 import gzip
 import zipfile
+from StringIO import StringIO
 from optparse import make_option
 
 from django.conf import settings
 from django.core import serializers
-from django.core.management.base import BaseCommand
+from django.core.serializers.base import DeserializedObjectBatch
+from django.core.management.base import BaseCommand, CommandError
 from django.core.management.color import no_style
+from django.core.management.parallel import (can_use_processes,
+    dependency_levels, map_in_processes)
 from django.db import connections, router, transaction, DEFAULT_DB_ALIAS
-from django.db.models import get_apps
+from django.db.backends.util import write_trackers
+from django.db.models import get_apps, get_model
+from django.utils.datastructures import SortedDict
 from django.utils.itercompat import product
 
 try:
@@ -26,6 +32,12 @@ class Command(BaseCommand):
         make_option('--database', action='store', dest='database',
             default=DEFAULT_DB_ALIAS, help='Nominates a specific database to load '
                 'fixtures into. Defaults to the "default" database.'),
+        make_option('--batch-size', action='store', dest='batch_size', type='int',
+            default=None, help='Inserts the new objects of each model in batches '
+                'of this size with multi-row INSERTs, instead of one at a time.'),
+        make_option('--parallel', action='store', dest='parallel', type='int',
+            default=0, help='Loads the fixtures of independent models with this '
+                'many worker processes, each fixture in its own transaction.'),
     )
 
     def handle(self, *fixture_labels, **options):
@@ -36,6 +48,7 @@ class Command(BaseCommand):
 
         verbosity = int(options.get('verbosity', 1))
         show_traceback = options.get('traceback', False)
+        batch_size = options.get('batch_size', None)
 
         # commit is a stealth option - it isn't really useful as
         # a command line option, but it can be useful when invoking
@@ -45,6 +58,20 @@ class Command(BaseCommand):
         # the transaction in place when loaddata was invoked.
         commit = options.get('commit', True)
 
+        # tables is another stealth option, used by a partial flush to only
+        # reload the objects of the tables it emptied.
+        tables = options.get('tables')
+
+        # The workers commit their own transactions, so fixtures can't be
+        # loaded in parallel within the caller's transaction. SQLite only
+        # allows one writer at a time, so concurrent workers would fail with
+        # "database is locked" rather than load faster.
+        parallel = options.get('parallel', 0)
+        if (parallel > 1 and commit and len(fixture_labels) > 1 and
+                connection.vendor != 'sqlite' and can_use_processes(connection)):
+            return self.load_in_parallel(fixture_labels, parallel, using,
+                                         verbosity, show_traceback, batch_size)
+
         # Keep a count of the installed objects and fixtures
         fixture_count = 0
         loaded_object_count = 0
@@ -70,8 +97,12 @@ class Command(BaseCommand):
                 zipfile.ZipFile.__init__(self, *args, **kwargs)
                 if settings.DEBUG:
                     assert len(self.namelist()) == 1, "Zip-compressed fixtures must contain only one file."
-            def read(self):
-                return zipfile.ZipFile.read(self, self.namelist()[0])
+                self.data = None
+            def read(self, *args):
+                # Deserializers may read the fixture a chunk at a time.
+                if self.data is None:
+                    self.data = StringIO(zipfile.ZipFile.read(self, self.namelist()[0]))
+                return self.data.read(*args)
 
         compression_types = {
             None:   file,
@@ -166,12 +197,20 @@ class Command(BaseCommand):
                                     (format, fixture_name, humanize(fixture_dir)))
                             try:
                                 objects = serializers.deserialize(format, fixture, using=using)
+                                if batch_size:
+                                    batch = DeserializedObjectBatch(batch_size, using=using)
                                 for obj in objects:
                                     objects_in_fixture += 1
-                                    if router.allow_syncdb(using, obj.object.__class__):
+                                    if (router.allow_syncdb(using, obj.object.__class__) and
+                                            (tables is None or uses_tables(obj.object, tables))):
                                         loaded_objects_in_fixture += 1
                                         models.add(obj.object.__class__)
-                                        obj.save(using=using)
+                                        if batch_size:
+                                            batch.add(obj)
+                                        else:
+                                            obj.save(using=using)
+                                if batch_size:
+                                    batch.flush()
                                 loaded_object_count += loaded_objects_in_fixture
                                 fixture_object_count += objects_in_fixture
                                 label_found = True
@@ -241,3 +280,93 @@ class Command(BaseCommand):
         # incorrect results. See Django #7572, MySQL #37735.
         if commit:
             connection.close()
+
+    def load_in_parallel(self, fixture_labels, processes, using, verbosity,
+                         show_traceback, batch_size):
+        """
+        Loads the fixtures named after a model, such as those written by
+        ``dumpdata --output-dir``, level by level in the models' dependency
+        graph, the fixtures of a level in a pool of worker processes. The
+        remaining fixtures are then loaded together in a single transaction.
+
+        A worker that fails rolls its fixtures back, and CommandError is
+        raised with its error once the other workers of its level are done.
+        The load isn't atomic though: each worker commits its own fixtures on
+        its own connection, so the fixtures loaded before stay in the database.
+        """
+        labels_by_model = SortedDict()
+        remaining = []
+        for fixture_label in fixture_labels:
+            model = fixture_model(fixture_label, using)
+            if model is None:
+                remaining.append(fixture_label)
+            else:
+                labels_by_model.setdefault(model, []).append(fixture_label)
+        options = {
+            'database': using,
+            'verbosity': verbosity,
+            'traceback': show_traceback,
+            'batch_size': batch_size,
+        }
+        # The tables written to by the workers can't be recorded here.
+        if using in write_trackers:
+            write_trackers[using].unknown = True
+        levels = dependency_levels(labels_by_model.keys())
+        for level in levels:
+            jobs = [(labels_by_model.pop(model), options) for model in level]
+            errors = []
+            for stdout, stderr in map_in_processes(load_fixtures, jobs, processes):
+                self.stdout.write(stdout)
+                if stderr:
+                    errors.append(stderr)
+            if errors:
+                # The next levels may depend on the failed fixtures.
+                raise CommandError(''.join(errors).strip())
+        # Models with circular dependencies are loaded with the others.
+        for labels in labels_by_model.values():
+            remaining.extend(labels)
+        if remaining:
+            stdout, stderr = load_fixtures((remaining, options))
+            self.stdout.write(stdout)
+            if stderr:
+                raise CommandError(stderr.strip())
+
+def uses_tables(obj, tables):
+    """
+    Returns True if saving the given object writes to one of the given
+    tables: its own table or one of its many-to-many tables.
+    """
+    opts = obj._meta
+    if opts.db_table in tables:
+        return True
+    return any([field.m2m_db_table() in tables for field in opts.many_to_many])
+
+def fixture_model(fixture_label, using):
+    """
+    Returns the model a fixture is named after, e.g. ``polls.choice.json``
+    or ``polls.choice.json.gz``, or None.
+    """
+    parts = os.path.basename(fixture_label).split('.')
+    if len(parts) > 1 and parts[-1] in ('gz', 'zip', 'bz2'):
+        parts = parts[:-1]
+    if len(parts) > 1 and parts[-1] in serializers.get_public_serializer_formats():
+        parts = parts[:-1]
+    if len(parts) > 2 and parts[-1] == using:
+        parts = parts[:-1]
+    if len(parts) == 2:
+        return get_model(*parts)
+    return None
+
+def load_fixtures(job):
+    """
+    Loads the given fixtures in a transaction of their own. Returns what was
+    written to the standard output and error.
+
+    The job is a tuple of arguments, so that it can be handed to a worker
+    process.
+    """
+    fixture_labels, options = job
+    command = Command()
+    command.stdout, command.stderr = StringIO(), StringIO()
+    command.handle(*fixture_labels, **options)
+    return command.stdout.getvalue(), command.stderr.getvalue()
@@ -0,0 +1,70 @@
+"""
+Helpers for the management commands that spread their work over a pool of
+worker processes, such as ``dumpdata --parallel`` and ``loaddata --parallel``.
+"""
+from django.core.management.base import CommandError
+from django.db import connections
+
+def can_use_processes(connection):
+    """
+    Returns True if worker processes can open connections of their own to
+    the given database, which they can't for an in-memory SQLite database.
+    """
+    return connection.settings_dict['NAME'] != ':memory:'
+
+def map_in_processes(func, jobs, processes):
+    """
+    Calls func on each of the jobs in a pool of worker processes and returns
+    the results, in order. func must be a module-level function, and the jobs
+    and the results picklable.
+
+    The database connections are closed first, so that each worker opens
+    connections of its own rather than sharing the parent's.
+    """
+    try:
+        import multiprocessing
+    except ImportError:
+        raise CommandError("--parallel requires the multiprocessing module, "
+                           "available in Python 2.6 and later.")
+    for connection in connections.all():
+        connection.close()
+    pool = multiprocessing.Pool(processes)
+    try:
+        results = pool.map(func, jobs)
+    except:
+        pool.terminate()
+        pool.join()
+        raise
+    pool.close()
+    pool.join()
+    return results
+
+def dependency_levels(models):
+    """
+    Groups the models into levels, so that the models of each level only have
+    foreign keys and many-to-many relations to models of the earlier levels
+    (or to models that aren't in the list). The models of a level can then be
+    loaded independently of each other, once the earlier levels are loaded.
+
+    Models with circular dependencies, and the models depending on them,
+    aren't in any level.
+    """
+    models = list(models)
+    dependencies = {}
+    for model in models:
+        related = set()
+        for field in model._meta.fields + model._meta.many_to_many:
+            if field.rel:
+                related.add(field.rel.to)
+        related.discard(model)
+        dependencies[model] = related.intersection(models)
+    levels = []
+    loaded = set()
+    while models:
+        level = [model for model in models if dependencies[model] <= loaded]
+        if not level:
+            break
+        levels.append(level)
+        loaded.update(level)
+        models = [model for model in models if model not in loaded]
+    return levels
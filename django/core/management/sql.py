@@ -106,20 +106,23 @@ def sql_reset(app, style, connection):
     )
     return sql_delete(app, style, connection) + sql_all(app, style, connection)
 
-def sql_flush(style, connection, only_django=False):
+def sql_flush(style, connection, only_django=False, tables=None):
     """
     Returns a list of the SQL statements used to flush the database.
 
     If only_django is True, then only table names that have associated Django
-    models and are in INSTALLED_APPS will be included.
+    models and are in INSTALLED_APPS will be included. If tables is given,
+    only the tables (and sequences of the tables) it contains are flushed.
     """
     if only_django:
-        tables = connection.introspection.django_table_names(only_existing=True)
+        flush_tables = connection.introspection.django_table_names(only_existing=True)
     else:
-        tables = connection.introspection.table_names()
-    statements = connection.ops.sql_flush(
-        style, tables, connection.introspection.sequence_list()
-    )
+        flush_tables = connection.introspection.table_names()
+    sequences = connection.introspection.sequence_list()
+    if tables is not None:
+        flush_tables = [table for table in flush_tables if table in tables]
+        sequences = [sequence for sequence in sequences if sequence['table'] in tables]
+    statements = connection.ops.sql_flush(style, flush_tables, sequences)
     return statements
 
 def sql_custom(app, style, connection):
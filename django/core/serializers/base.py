@@ -4,7 +4,8 @@ Module for abstract serializer/unserializer base classes.
 
 from StringIO import StringIO
 
-from django.db import models
+from django.db import connections, models
+from django.db.models import signals
 from django.utils.encoding import smart_str, smart_unicode
 from django.utils import datetime_safe
 
@@ -174,3 +175,103 @@ class DeserializedObject(object):
         # prevent a second (possibly accidental) call to save() from saving
         # the m2m data twice.
         self.m2m_data = None
+
+class DeserializedObjectBatch(object):
+    """
+    Saves deserialized objects in batches: the objects of a model that aren't
+    in the database yet are inserted with multi-row INSERTs, and their
+    many-to-many relations likewise, instead of being saved one at a time.
+
+    Objects are saved in the order they are added, a batch holding
+    consecutive objects of a single model. Objects that already exist in the
+    database, objects of models that can't be inserted this way and objects
+    of models with natural keys, which the objects deserialized next may look
+    up, are saved with ``DeserializedObject.save()``. The pre_save and post_save
+    signals are sent for every object, but the m2m_changed signal isn't sent
+    for the relations inserted in batches.
+
+    Call ``flush()`` to save the objects left once all of them are added.
+    """
+
+    def __init__(self, batch_size, using=None):
+        self.batch_size = batch_size
+        self.using = using
+        self.objects = []
+        self.pks = set()
+
+    def add(self, obj):
+        model = obj.object.__class__
+        opts = model._meta
+        if (obj.object.pk is None or opts.proxy or opts.order_with_respect_to or
+                hasattr(model._default_manager, 'get_by_natural_key')):
+            self.flush()
+            obj.save(using=self.using)
+            return
+        if self.objects and (self.objects[0].object.__class__ is not model or
+                             obj.object.pk in self.pks):
+            self.flush()
+        self.objects.append(obj)
+        self.pks.add(obj.object.pk)
+        if len(self.objects) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        objects, self.objects, self.pks = self.objects, [], set()
+        if not objects:
+            return
+        model = objects[0].object.__class__
+        opts = model._meta
+        manager = model._base_manager
+        connection = connections[self.using]
+
+        # Objects that are already in the database are saved as usual.
+        existing = set(manager.using(self.using).filter(
+            pk__in=[obj.object.pk for obj in objects]).values_list('pk', flat=True))
+        new = []
+        for obj in objects:
+            if obj.object.pk in existing:
+                obj.save(using=self.using)
+            else:
+                new.append(obj)
+        if not new:
+            return
+
+        send_signals = not opts.auto_created
+        if send_signals:
+            for obj in new:
+                signals.pre_save.send(sender=model, instance=obj.object,
+                                      raw=True, using=self.using)
+        # The values are prepared as Model.save_base() does for raw saves.
+        fields = opts.local_fields
+        manager._bulk_insert(fields, [
+            [f.get_db_prep_save(getattr(obj.object, f.attname) or f.pre_save(obj.object, True),
+                                connection=connection) for f in fields]
+            for obj in new], using=self.using)
+        for obj in new:
+            obj.object._state.db = self.using
+            obj.object._state.adding = False
+            if send_signals:
+                signals.post_save.send(sender=model, instance=obj.object,
+                                       created=True, raw=True, using=self.using)
+
+        # Insert the rows of the many-to-many relations together. The new
+        # objects don't have any relations to clear first.
+        for field in opts.many_to_many:
+            through = field.rel.through
+            if not through._meta.auto_created:
+                continue
+            source = through._meta.get_field(field.m2m_field_name())
+            target = through._meta.get_field(field.m2m_reverse_field_name())
+            rows = []
+            for obj in new:
+                if obj.m2m_data and field.name in obj.m2m_data:
+                    for pk in obj.m2m_data.pop(field.name):
+                        rows.append([source.get_db_prep_save(obj.object.pk, connection=connection),
+                                     target.get_db_prep_save(pk, connection=connection)])
+            if rows:
+                through._base_manager._bulk_insert([source, target], rows, using=self.using)
+        for obj in new:
+            if obj.m2m_data:
+                for accessor_name, object_list in obj.m2m_data.items():
+                    setattr(obj.object, accessor_name, object_list)
+            obj.m2m_data = None
@@ -4,7 +4,7 @@ Serialize data to/from JSON
 
 import datetime
 import decimal
-from StringIO import StringIO
+import re
 
 from django.core.serializers.python import Serializer as PythonSerializer
 from django.core.serializers.python import Deserializer as PythonDeserializer
@@ -14,11 +14,38 @@ from django.utils import simplejson
 class Serializer(PythonSerializer):
     """
     Convert a queryset to JSON.
+
+    Each object is written to the stream as soon as it has been serialized,
+    so that large querysets don't have to be held in memory.
     """
     internal_use_only = False
 
+    def start_serialization(self):
+        super(Serializer, self).start_serialization()
+        self.encoder = DjangoJSONEncoder(**self.options)
+        self.first = True
+        self.stream.write("[")
+
     def end_serialization(self):
-        simplejson.dump(self.objects, self.stream, cls=DjangoJSONEncoder, **self.options)
+        if self.encoder.indent and not self.first:
+            self.stream.write("\n")
+        self.stream.write("]")
+
+    def end_object(self, obj):
+        data = self.encoder.encode(self.get_dump_object(obj))
+        self._current = None
+        if self.encoder.indent:
+            # Indent the object as if it had been encoded within the list.
+            prefix = " " * self.encoder.indent
+            data = "\n".join([prefix + line for line in data.split("\n")])
+            if self.first:
+                self.stream.write("\n")
+            else:
+                self.stream.write(self.encoder.item_separator + "\n")
+        elif not self.first:
+            self.stream.write(self.encoder.item_separator)
+        self.stream.write(data)
+        self.first = False
 
     def getvalue(self):
         if callable(getattr(self.stream, 'getvalue', None)):
@@ -27,14 +54,124 @@ class Serializer(PythonSerializer):
 def Deserializer(stream_or_string, **options):
     """
     Deserialize a stream or string of JSON data.
+
+    Streams are parsed incrementally, one object at a time, so that large
+    fixtures don't have to be held in memory.
     """
     if isinstance(stream_or_string, basestring):
-        stream = StringIO(stream_or_string)
+        object_list = simplejson.loads(stream_or_string)
     else:
-        stream = stream_or_string
-    for obj in PythonDeserializer(simplejson.load(stream), **options):
+        object_list = iter_list(stream_or_string)
+    for obj in PythonDeserializer(object_list, **options):
         yield obj
 
+# The characters that matter to find where a JSON list or object ends.
+brackets_re = re.compile(r'["\\\[\]{}]')
+
+def scan_brackets(buf, start, in_string=False, depth=0):
+    """
+    Scans buf from start for the end of a JSON list or object, keeping track
+    of the nesting depth of brackets outside strings.
+
+    Returns a tuple of (end, in_string, depth, resume). end is the position
+    right after the closing bracket, or None if buf ends before it; scanning
+    then goes on from resume with in_string and depth once more data has been
+    appended to buf.
+    """
+    pos = start
+    while True:
+        match = brackets_re.search(buf, pos)
+        if match is None:
+            return None, in_string, depth, len(buf)
+        char, pos = match.group(), match.end()
+        if in_string:
+            if char == '"':
+                in_string = False
+            elif char == '\\':
+                if pos == len(buf):
+                    # The escaped character is in the next chunk.
+                    return None, in_string, depth, pos - 1
+                pos += 1
+        elif char == '"':
+            in_string = True
+        elif char in '[{':
+            depth += 1
+        elif char in ']}':
+            depth -= 1
+            if depth == 0:
+                return pos, in_string, depth, pos
+
+def iter_list(stream, chunk_size=64 * 1024):
+    """
+    Yields the items of the JSON list read from the given stream, reading the
+    stream a chunk at a time rather than all at once.
+    """
+    decoder = simplejson.JSONDecoder()
+    buf, pos, eof = '', 0, False
+    # What's expected next: the opening bracket, the first item (or the
+    # closing bracket), an item after a comma, or a comma (or the closing
+    # bracket) after an item.
+    state = 'start'
+    # How far a list or object item spanning several chunks has been
+    # scanned, relative to its start, and the scanner's state there.
+    scanned, in_string, depth = None, False, 0
+    while True:
+        while pos < len(buf) and buf[pos] in ' \t\n\r':
+            pos += 1
+        if pos == len(buf):
+            if eof:
+                raise ValueError("Unexpected end of JSON data")
+            buf, pos = stream.read(chunk_size), 0
+            eof = not buf
+            continue
+        char = buf[pos]
+        if state == 'start':
+            if char != '[':
+                raise ValueError("Expected a JSON list")
+            pos += 1
+            state = 'first'
+        elif state == 'comma':
+            if char == ']':
+                return
+            if char != ',':
+                raise ValueError("Expected ',' or ']' at position %d" % pos)
+            pos += 1
+            state = 'item'
+        elif state == 'first' and char == ']':
+            return
+        else:
+            if scanned is not None:
+                # Lists and objects cut short are only decoded again once
+                # their closing bracket has been read, so that large items
+                # aren't decoded from the start after every chunk.
+                end, in_string, depth, scanned = scan_brackets(
+                    buf, pos + scanned, in_string, depth)
+                scanned -= pos
+                if end is None and not eof:
+                    chunk = stream.read(chunk_size)
+                    eof = not chunk
+                    buf, pos = buf[pos:] + chunk, 0
+                    continue
+            try:
+                obj, end = decoder.raw_decode(buf, pos)
+            except ValueError:
+                if eof or scanned is not None:
+                    raise
+                end = None
+            # A number running up to the end of the buffer may be cut short,
+            # so it's decoded again once more data has been read.
+            if end is None or (end == len(buf) and not eof and char not in '[{"'):
+                if char in '[{':
+                    scanned, in_string, depth = 0, False, 0
+                chunk = stream.read(chunk_size)
+                eof = not chunk
+                buf, pos = buf[pos:] + chunk, 0
+                continue
+            yield obj
+            pos = end
+            scanned = None
+            state = 'comma'
+
 class DjangoJSONEncoder(simplejson.JSONEncoder):
     """
     JSONEncoder subclass that knows how to encode date/time and decimal types.
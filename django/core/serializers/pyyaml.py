@@ -37,8 +37,21 @@ class Serializer(PythonSerializer):
         else:
             super(Serializer, self).handle_field(obj, field)
 
+    def start_serialization(self):
+        super(Serializer, self).start_serialization()
+        self.first = True
+
+    def end_object(self, obj):
+        # Each object is written as a single-item sequence as soon as it has
+        # been serialized; together they form the sequence of all objects.
+        yaml.dump([self.get_dump_object(obj)], self.stream,
+                  Dumper=DjangoSafeDumper, **self.options)
+        self._current = None
+        self.first = False
+
     def end_serialization(self):
-        yaml.dump(self.objects, self.stream, Dumper=DjangoSafeDumper, **self.options)
+        if self.first:
+            yaml.dump([], self.stream, Dumper=DjangoSafeDumper, **self.options)
 
     def getvalue(self):
         return self.stream.getvalue()
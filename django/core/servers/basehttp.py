@@ -9,6 +9,7 @@ been reviewed for security issues. DON'T USE IT FOR PRODUCTION USE!
 
 import os
 import socket
+import SocketServer
 import sys
 import traceback
 import urllib
@@ -86,6 +87,16 @@ class WSGIServer(simple_server.WSGIServer, object):
         self.setup_environ()
 
 
+class ThreadedWSGIServer(SocketServer.ThreadingMixIn, WSGIServer):
+    """
+    A WSGIServer that handles each request in a thread of its own, so that a
+    slow request doesn't hold up the others. As database connections are
+    local to each thread, every request uses its own.
+    """
+    # Don't wait for the requests being handled when the server quits.
+    daemon_threads = True
+
+
 class WSGIRequestHandler(simple_server.WSGIRequestHandler, object):
 
     def __init__(self, *args, **kwargs):
@@ -205,8 +216,12 @@ class AdminMediaHandler(handlers.StaticFilesHandler):
         return path.startswith(self.base_url[2]) and not self.base_url[1]
 
 
-def run(addr, port, wsgi_handler, ipv6=False):
+def run(addr, port, wsgi_handler, ipv6=False, threading=False):
     server_address = (addr, port)
-    httpd = WSGIServer(server_address, WSGIRequestHandler, ipv6=ipv6)
+    if threading:
+        httpd_cls = ThreadedWSGIServer
+    else:
+        httpd_cls = WSGIServer
+    httpd = httpd_cls(server_address, WSGIRequestHandler, ipv6=ipv6)
     httpd.set_app(wsgi_handler)
     httpd.serve_forever()
@@ -87,11 +87,26 @@ def get_cookie_signer(salt='django.core.signing.get_cookie_signer'):
     return Signer('django.http.cookies' + settings.SECRET_KEY, salt=salt)
 
 
-def dumps(obj, key=None, salt='django.core.signing', compress=False):
+class JSONSerializer(object):
+    """
+    Simple wrapper around simplejson to be used in signing.dumps and
+    signing.loads.
+    """
+    def dumps(self, obj):
+        return simplejson.dumps(obj, separators=(',', ':'))
+
+    def loads(self, data):
+        return simplejson.loads(data)
+
+
+def dumps(obj, key=None, salt='django.core.signing', compress=False, serializer=JSONSerializer):
     """
     Returns URL-safe, sha1 signed base64 compressed JSON string. If key is
     None, settings.SECRET_KEY is used instead.
 
+    The serializer is expected to return a bytestring; JSON is used unless
+    another serializer class (with dumps() and loads() methods) is given.
+
     If compress is True (not the default) checks if compressing using zlib can
     save some space. Prepends a '.' to signify compression. This is included
     in the signature, to protect against zip bombs.
@@ -99,7 +114,7 @@ def dumps(obj, key=None, salt='django.core.signing', compress=False):
     Salt can be used to further salt the hash, in case you're worried
     that the NSA might try to brute-force your SHA-1 protected secret.
     """
-    json = simplejson.dumps(obj, separators=(',', ':'))
+    json = serializer().dumps(obj)
 
     # Flag for if it's been compressed or not
     is_compressed = False
@@ -116,7 +131,7 @@ def dumps(obj, key=None, salt='django.core.signing', compress=False):
     return TimestampSigner(key, salt=salt).sign(base64d)
 
 
-def loads(s, key=None, salt='django.core.signing', max_age=None):
+def loads(s, key=None, salt='django.core.signing', max_age=None, serializer=JSONSerializer):
     """
     Reverse of dumps(), raises BadSignature if signature fails
     """
@@ -130,7 +145,7 @@ def loads(s, key=None, salt='django.core.signing', max_age=None):
     json = b64_decode(base64d)
     if decompress:
         json = zlib.decompress(json)
-    return simplejson.loads(json)
+    return serializer().loads(json)
 
 
 class Signer(object):
@@ -250,6 +250,9 @@ class BaseDatabaseWrapper(local):
             cursor = self.make_debug_cursor(self._cursor())
         else:
             cursor = util.CursorWrapper(self._cursor(), self)
+        tracker = util.write_trackers.get(self.alias)
+        if tracker is not None:
+            cursor = util.CursorWriteTrackingWrapper(cursor, self, tracker)
         return cursor
 
     def make_debug_cursor(self, cursor):
@@ -286,6 +289,10 @@ class BaseDatabaseFeatures(object):
     # Usually an indication that the test database is in-memory
     test_db_allows_multiple_connections = True
 
+    # Can the test database be cloned for the workers of a parallel
+    # test run?
+    can_clone_databases = False
+
     # Can an object be saved without an explicit primary key?
     supports_unspecified_pk = False
 
@@ -335,6 +342,13 @@ class BaseDatabaseFeatures(object):
     # date_interval_sql can properly handle mixed Date/DateTime fields and timedeltas
     supports_mixed_date_datetime_comparisons = True
 
+    # Can an INSERT update the existing row when it violates a unique
+    # constraint? See DatabaseOperations.upsert_sql().
+    supports_upsert = False
+
+    # Can a single INSERT insert several rows (INSERT ... VALUES (...), (...))?
+    has_bulk_insert = False
+
     # Features that need to be confirmed at runtime
     # Cache whether the confirmation has been performed.
     _confirmed = False
@@ -541,6 +555,13 @@ class BaseDatabaseOperations(object):
         """
         return None
 
+    def bulk_batch_size(self, fields, rows):
+        """
+        Returns the maximum number of the given rows of values for fields that
+        can be inserted in a single query.
+        """
+        return len(rows)
+
     def max_name_length(self):
         """
         Returns the maximum length of table and column names, or None if there
@@ -569,6 +590,22 @@ class BaseDatabaseOperations(object):
         """
         return value
 
+    def upsert_sql(self, conflict_columns, update_columns):
+        """
+        Returns the clause appended to an INSERT to update the given
+        (quoted) columns of the existing row instead when the new one
+        conflicts with it on the unique conflict_columns. The updated columns
+        take the values the INSERT would have stored.
+
+        Only called on the backends with the supports_upsert feature. The
+        default is the ON CONFLICT clause of PostgreSQL and SQLite.
+        """
+        if not update_columns:
+            return 'ON CONFLICT (%s) DO NOTHING' % ', '.join(conflict_columns)
+        return 'ON CONFLICT (%s) DO UPDATE SET %s' % (
+            ', '.join(conflict_columns),
+            ', '.join(['%s = EXCLUDED.%s' % (c, c) for c in update_columns]))
+
     def return_insert_id(self):
         """
         For backends that support returning the last insert ID as part
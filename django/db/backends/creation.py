@@ -1,3 +1,4 @@
+import hashlib
 import sys
 import time
 
@@ -7,6 +8,10 @@ from django.conf import settings
 # the test database.
 TEST_DATABASE_PREFIX = 'test_'
 
+# The table in which a test database kept between runs records the signature
+# of the schema it was created with.
+TEST_SIGNATURE_TABLE = 'django_test_signature'
+
 class BaseDatabaseCreation(object):
     """
     This class encapsulates all backend-specific differences that pertain to
@@ -205,10 +210,13 @@ class BaseDatabaseCreation(object):
         del references_to_delete[model]
         return output
 
-    def create_test_db(self, verbosity=1, autoclobber=False):
+    def create_test_db(self, verbosity=1, autoclobber=False, keepdb=False):
         """
         Creates a test database, prompting the user for confirmation if the
         database already exists. Returns the name of the test database created.
+
+        If keepdb is True, a test database kept by a previous run is reused
+        when it was created for the same models.
         """
         # Don't import django.core.management if it isn't needed.
         from django.core.management import call_command
@@ -219,9 +227,23 @@ class BaseDatabaseCreation(object):
             test_db_repr = ''
             if verbosity >= 2:
                 test_db_repr = " ('%s')" % test_database_name
-            print "Creating test database for alias '%s'%s..." % (self.connection.alias, test_db_repr)
 
-        self._create_test_db(verbosity, autoclobber)
+        reuse = False
+        if keepdb:
+            schema_signature = self.test_db_schema_signature()
+            kept_signature = self._get_kept_test_db_signature(test_database_name)
+            reuse = kept_signature == schema_signature
+            # A kept database that is out of date was created by an earlier
+            # run, so it can be replaced without asking.
+            autoclobber = autoclobber or kept_signature is not None
+
+        if reuse:
+            if verbosity >= 1:
+                print "Using existing test database for alias '%s'%s..." % (self.connection.alias, test_db_repr)
+        else:
+            if verbosity >= 1:
+                print "Creating test database for alias '%s'%s..." % (self.connection.alias, test_db_repr)
+            self._create_test_db(verbosity, autoclobber)
 
         self.connection.close()
         self.connection.settings_dict["NAME"] = test_database_name
@@ -229,14 +251,15 @@ class BaseDatabaseCreation(object):
         # Confirm the feature set of the test database
         self.connection.features.confirm()
 
-        # Report syncdb messages at one level lower than that requested.
-        # This ensures we don't get flooded with messages during testing
-        # (unless you really ask to be flooded)
-        call_command('syncdb',
-            verbosity=max(verbosity - 1, 0),
-            interactive=False,
-            database=self.connection.alias,
-            load_initial_data=False)
+        if not reuse:
+            # Report syncdb messages at one level lower than that requested.
+            # This ensures we don't get flooded with messages during testing
+            # (unless you really ask to be flooded)
+            call_command('syncdb',
+                verbosity=max(verbosity - 1, 0),
+                interactive=False,
+                database=self.connection.alias,
+                load_initial_data=False)
 
         # We need to then do a flush to ensure that any data installed by
         # custom SQL has been removed. The only test data should come from
@@ -256,14 +279,18 @@ class BaseDatabaseCreation(object):
         if Site is not None and Site.objects.using(self.connection.alias).count() == 1:
             Site.objects.using(self.connection.alias).update(id=settings.SITE_ID)
 
-        from django.core.cache import get_cache
-        from django.core.cache.backends.db import BaseDatabaseCache
-        for cache_alias in settings.CACHES:
-            cache = get_cache(cache_alias)
-            if isinstance(cache, BaseDatabaseCache):
-                from django.db import router
-                if router.allow_syncdb(self.connection.alias, cache.cache_model_class):
-                    call_command('createcachetable', cache._table, database=self.connection.alias)
+        if not reuse:
+            from django.core.cache import get_cache
+            from django.core.cache.backends.db import BaseDatabaseCache
+            for cache_alias in settings.CACHES:
+                cache = get_cache(cache_alias)
+                if isinstance(cache, BaseDatabaseCache):
+                    from django.db import router
+                    if router.allow_syncdb(self.connection.alias, cache.cache_model_class):
+                        call_command('createcachetable', cache._table, database=self.connection.alias)
+
+            if keepdb:
+                self._record_test_db_signature(schema_signature)
 
         # Get a cursor (even though we don't need one yet). This has
         # the side effect of initializing the test database.
@@ -271,6 +298,70 @@ class BaseDatabaseCreation(object):
 
         return test_database_name
 
+    def test_db_schema_signature(self):
+        """
+        Returns a hash of the SQL that creates the tables of the installed
+        models (and database cache tables) in the test database. A test
+        database kept between runs is only reused while it matches.
+        """
+        from django.core.cache import get_cache
+        from django.core.cache.backends.db import BaseDatabaseCache
+        from django.core.management.color import no_style
+        from django.db import models, router
+
+        style = no_style()
+        signature = hashlib.sha1(repr(self.test_db_signature()))
+        known_models = set()
+        for app in models.get_apps():
+            for model in models.get_models(app, include_auto_created=True):
+                if not router.allow_syncdb(self.connection.alias, model):
+                    continue
+                sql, references = self.sql_create_model(model, style, known_models)
+                sql.extend(self.sql_indexes_for_model(model, style))
+                signature.update('\n'.join(sql))
+                known_models.add(model)
+        for cache_alias in sorted(settings.CACHES):
+            cache = get_cache(cache_alias)
+            if isinstance(cache, BaseDatabaseCache):
+                signature.update(cache._table)
+        return signature.hexdigest()
+
+    def _get_kept_test_db_signature(self, test_database_name):
+        """
+        Internal implementation - returns the schema signature recorded in the
+        given test database, or None if it doesn't exist or wasn't kept.
+        """
+        qn = self.connection.ops.quote_name
+        old_database_name = self.connection.settings_dict['NAME']
+        self.connection.close()
+        self.connection.settings_dict['NAME'] = test_database_name
+        try:
+            try:
+                cursor = self.connection.cursor()
+                cursor.execute("SELECT %s FROM %s" % (qn('signature'), qn(TEST_SIGNATURE_TABLE)))
+                row = cursor.fetchone()
+            except Exception:
+                row = None
+        finally:
+            self.connection.close()
+            self.connection.settings_dict['NAME'] = old_database_name
+        if row is None:
+            return None
+        return row[0]
+
+    def _record_test_db_signature(self, signature):
+        """
+        Internal implementation - records the schema signature in the test
+        database, so that a later run can tell whether it can be reused.
+        """
+        qn = self.connection.ops.quote_name
+        cursor = self.connection.cursor()
+        cursor.execute("CREATE TABLE %s (%s varchar(40) NOT NULL)" % (
+            qn(TEST_SIGNATURE_TABLE), qn('signature')))
+        cursor.execute("INSERT INTO %s (%s) VALUES (%%s)" % (
+            qn(TEST_SIGNATURE_TABLE), qn('signature')), [signature])
+        self.connection.commit_unless_managed()
+
     def _get_test_db_name(self):
         """
         Internal implementation - returns the name of the test DB that will be
@@ -316,10 +407,12 @@ class BaseDatabaseCreation(object):
 
         return test_database_name
 
-    def destroy_test_db(self, old_database_name, verbosity=1):
+    def destroy_test_db(self, old_database_name, verbosity=1, keepdb=False):
         """
         Destroy a test database, prompting the user for confirmation if the
         database already exists. Returns the name of the test database created.
+
+        If keepdb is True, the test database is left in place for the next run.
         """
         self.connection.close()
         test_database_name = self.connection.settings_dict['NAME']
@@ -327,9 +420,47 @@ class BaseDatabaseCreation(object):
             test_db_repr = ''
             if verbosity >= 2:
                 test_db_repr = " ('%s')" % test_database_name
-            print "Destroying test database for alias '%s'%s..." % (self.connection.alias, test_db_repr)
+            if keepdb:
+                print "Preserving test database for alias '%s'%s..." % (self.connection.alias, test_db_repr)
+            else:
+                print "Destroying test database for alias '%s'%s..." % (self.connection.alias, test_db_repr)
         self.connection.settings_dict['NAME'] = old_database_name
 
+        if not keepdb:
+            self._destroy_test_db(test_database_name, verbosity)
+
+    def get_test_db_clone_settings(self, number):
+        """
+        Returns a copy of the connection's settings that uses the given clone
+        of the test database.
+        """
+        settings_dict = self.connection.settings_dict.copy()
+        settings_dict['NAME'] = '%s_%d' % (settings_dict['NAME'], number)
+        return settings_dict
+
+    def clone_test_db(self, number, verbosity=1, autoclobber=False):
+        """
+        Creates the given (numbered) clone of the test database, for one of
+        the workers of a parallel test run.
+        """
+        if verbosity >= 1:
+            test_db_repr = ''
+            if verbosity >= 2:
+                test_db_repr = " ('%s')" % self.get_test_db_clone_settings(number)['NAME']
+            print "Cloning test database for alias '%s'%s..." % (self.connection.alias, test_db_repr)
+        # Make sure everything is written out before the database is copied.
+        self.connection.close()
+        self._clone_test_db(number, verbosity, autoclobber)
+
+    def _clone_test_db(self, number, verbosity, autoclobber):
+        "Internal implementation - copies the test db to the clone."
+        raise NotImplementedError("The database backend doesn't support cloning databases.")
+
+    def destroy_test_db_clone(self, number, verbosity=1):
+        "Destroys the given clone of the test database."
+        test_database_name = self.get_test_db_clone_settings(number)['NAME']
+        if verbosity >= 2:
+            print "Destroying test database clone '%s'..." % test_database_name
         self._destroy_test_db(test_database_name, verbosity)
 
     def _destroy_test_db(self, test_database_name, verbosity):
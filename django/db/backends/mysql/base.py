@@ -134,6 +134,8 @@ class DatabaseFeatures(BaseDatabaseFeatures):
     supports_timezones = False
     requires_explicit_null_ordering_when_grouping = True
     allows_primary_key_0 = False
+    supports_upsert = True
+    has_bulk_insert = True
 
     def _can_introspect_foreign_keys(self):
         "Confirm support for introspected foreign keys"
@@ -263,6 +265,14 @@ class DatabaseOperations(BaseDatabaseOperations):
     def max_name_length(self):
         return 64
 
+    def upsert_sql(self, conflict_columns, update_columns):
+        # MySQL finds the conflicting row by itself, and needs an assignment
+        # even when nothing is to be updated.
+        if not update_columns:
+            return 'ON DUPLICATE KEY UPDATE %s = %s' % (conflict_columns[0], conflict_columns[0])
+        return 'ON DUPLICATE KEY UPDATE %s' % ', '.join(
+            ['%s = VALUES(%s)' % (c, c) for c in update_columns])
+
 class DatabaseWrapper(BaseDatabaseWrapper):
     vendor = 'mysql'
     operators = {
@@ -111,6 +111,16 @@ class DatabaseCreation(BaseDatabaseCreation):
 
         return self.connection.settings_dict['NAME']
 
+    def _get_kept_test_db_signature(self, test_database_name):
+        # The test database is a user and tablespaces that are set up along
+        # with the connection settings by _create_test_db(), so it's always
+        # created afresh.
+        return None
+
+    def destroy_test_db(self, old_database_name, verbosity=1, keepdb=False):
+        # The connection settings are only restored by _destroy_test_db().
+        super(DatabaseCreation, self).destroy_test_db(old_database_name, verbosity)
+
     def _destroy_test_db(self, test_database_name, verbosity=1):
         """
         Destroy a test database, prompting the user for confirmation if the
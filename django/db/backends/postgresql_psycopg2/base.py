@@ -72,6 +72,13 @@ class DatabaseFeatures(BaseDatabaseFeatures):
     can_defer_constraint_checks = True
     has_select_for_update = True
     has_select_for_update_nowait = True
+    has_bulk_insert = True
+    can_clone_databases = True
+
+    def _supports_upsert(self):
+        # INSERT ... ON CONFLICT was added in PostgreSQL 9.5.
+        return self.connection.ops.postgres_version[0:2] >= (9, 5)
+    supports_upsert = property(_supports_upsert)
 
 
 class DatabaseWrapper(BaseDatabaseWrapper):
@@ -1,3 +1,5 @@
+import sys
+
 from django.db.backends.creation import BaseDatabaseCreation
 from django.db.backends.util import truncate_name
 
@@ -38,6 +40,41 @@ class DatabaseCreation(BaseDatabaseCreation):
             return "WITH ENCODING '%s'" % self.connection.settings_dict['TEST_CHARSET']
         return ''
 
+    def _clone_test_db(self, number, verbosity, autoclobber):
+        qn = self.connection.ops.quote_name
+        source_database_name = self.connection.settings_dict['NAME']
+        target_database_name = self.get_test_db_clone_settings(number)['NAME']
+        sql = "CREATE DATABASE %s WITH TEMPLATE %s" % (
+            qn(target_database_name), qn(source_database_name))
+
+        # A database can't be used as a template while there are connections
+        # to it, so connect to the maintenance database meanwhile.
+        self.connection.settings_dict['NAME'] = 'postgres'
+        try:
+            cursor = self.connection.cursor()
+            self.set_autocommit()
+            try:
+                cursor.execute(sql)
+            except Exception, e:
+                sys.stderr.write("Got an error cloning the test database: %s\n" % e)
+                if not autoclobber:
+                    confirm = raw_input("Type 'yes' if you would like to try deleting the test database '%s', or 'no' to cancel: " % target_database_name)
+                if autoclobber or confirm == 'yes':
+                    try:
+                        if verbosity >= 1:
+                            print "Destroying old test database clone '%s'..." % target_database_name
+                        cursor.execute("DROP DATABASE %s" % qn(target_database_name))
+                        cursor.execute(sql)
+                    except Exception, e:
+                        sys.stderr.write("Got an error cloning the test database: %s\n" % e)
+                        sys.exit(2)
+                else:
+                    print "Tests cancelled."
+                    sys.exit(1)
+        finally:
+            self.connection.close()
+            self.connection.settings_dict['NAME'] = source_database_name
+
     def sql_indexes_for_field(self, model, f, style):
         if f.db_index and not f.unique:
             qn = self.connection.ops.quote_name
@@ -84,7 +84,18 @@ class DatabaseOperations(BaseDatabaseOperations):
 
     def sql_flush(self, style, tables, sequences):
         if tables:
-            if self.postgres_version[0:2] >= (8,1):
+            if self.postgres_version[0:2] >= (8,4):
+                # Postgres 8.4+ can also reset the sequences owned by the
+                # tables' columns in the same statement, so they only need to
+                # be reset separately for the other tables.
+                sql = ['%s %s %s;' % \
+                    (style.SQL_KEYWORD('TRUNCATE'),
+                     style.SQL_FIELD(', '.join([self.quote_name(table) for table in tables])),
+                     style.SQL_KEYWORD('RESTART IDENTITY'),
+                )]
+                sequences = [sequence_info for sequence_info in sequences
+                             if sequence_info['table'] not in tables]
+            elif self.postgres_version[0:2] >= (8,1):
                 # Postgres 8.1+ can do 'TRUNCATE x, y, z...;'. In fact, it *has to*
                 # in order to be able to truncate tables referenced by a foreign
                 # key in any other table. The result is a single SQL TRUNCATE
@@ -54,9 +54,14 @@ class DatabaseFeatures(BaseDatabaseFeatures):
     # go.
     can_use_chunked_reads = False
     test_db_allows_multiple_connections = False
+    can_clone_databases = True
     supports_unspecified_pk = True
     supports_1000_query_parameters = False
     supports_mixed_date_datetime_comparisons = False
+    # INSERT ... ON CONFLICT DO UPDATE was added in SQLite 3.24.0.
+    supports_upsert = Database.sqlite_version_info >= (3, 24, 0)
+    # Multi-row VALUES clauses were added in SQLite 3.7.11.
+    has_bulk_insert = Database.sqlite_version_info >= (3, 7, 11)
 
     def _supports_stddev(self):
         """Confirm support for STDDEV and related stats functions
@@ -77,6 +82,15 @@ class DatabaseFeatures(BaseDatabaseFeatures):
         return has_support
 
 class DatabaseOperations(BaseDatabaseOperations):
+    def bulk_batch_size(self, fields, rows):
+        """
+        SQLite has a compile-time default (SQLITE_LIMIT_VARIABLE_NUMBER) of
+        999 variables per query.
+        """
+        if fields:
+            return max(1, 999 // len(fields))
+        return len(rows)
+
     def date_extract_sql(self, lookup_type, field_name):
         # sqlite doesn't support extract, so we fake it with the user-defined
         # function django_extract that's registered in connect(). Note that
@@ -1,4 +1,5 @@
 import os
+import shutil
 import sys
 from django.db.backends.creation import BaseDatabaseCreation
 
@@ -65,6 +66,28 @@ class DatabaseCreation(BaseDatabaseCreation):
                     sys.exit(1)
         return test_database_name
 
+    def _get_kept_test_db_signature(self, test_database_name):
+        # An in-memory database can't be kept, and connecting to a database
+        # file that doesn't exist would create it.
+        if test_database_name == ':memory:' or not os.path.exists(test_database_name):
+            return None
+        return super(DatabaseCreation, self)._get_kept_test_db_signature(test_database_name)
+
+    def get_test_db_clone_settings(self, number):
+        settings_dict = self.connection.settings_dict.copy()
+        # An in-memory database is copied into each worker process when it's
+        # forked, so the clones keep the same name.
+        if settings_dict['NAME'] != ':memory:':
+            root, ext = os.path.splitext(settings_dict['NAME'])
+            settings_dict['NAME'] = '%s_%d%s' % (root, number, ext)
+        return settings_dict
+
+    def _clone_test_db(self, number, verbosity, autoclobber):
+        source_database_name = self.connection.settings_dict['NAME']
+        if source_database_name != ':memory:':
+            shutil.copy(source_database_name,
+                        self.get_test_db_clone_settings(number)['NAME'])
+
     def _destroy_test_db(self, test_database_name, verbosity):
         if test_database_name and test_database_name != ":memory:":
             # Remove the SQLite database file
@@ -1,6 +1,7 @@
 import datetime
 import decimal
 import hashlib
+import re
 from time import time
 
 from django.utils.log import getLogger
@@ -60,6 +61,57 @@ class CursorDebugWrapper(CursorWrapper):
             )
 
 
+class TableWriteTracker(object):
+    """
+    Records the tables written to by the statements executed through the
+    cursors of a database alias, so that TransactionTestCase can reset only
+    those tables between tests. ``unknown`` is set when a statement might
+    have written to tables that can't be told from its SQL.
+    """
+    write_re = re.compile(r'^\s*(?:INSERT\s+INTO|UPDATE|DELETE\s+FROM|REPLACE\s+INTO)\s+'
+                          r'[`"\[]?([^\s`"\]\(,;]+)', re.I)
+    read_re = re.compile(r'^\s*(?:SELECT|SAVEPOINT|RELEASE|ROLLBACK|COMMIT|BEGIN|'
+                         r'SET|SHOW|PRAGMA|EXPLAIN)\b', re.I)
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.tables = set()
+        self.unknown = False
+
+    def record(self, sql):
+        match = self.write_re.match(sql)
+        if match:
+            self.tables.add(match.group(1))
+        elif not self.read_re.match(sql):
+            self.unknown = True
+
+# The TableWriteTracker for each database alias whose writes are tracked.
+write_trackers = {}
+
+class CursorWriteTrackingWrapper(CursorWrapper):
+    """
+    Wraps the cursors of a database alias while its writes are tracked.
+    """
+    def __init__(self, cursor, db, tracker):
+        super(CursorWriteTrackingWrapper, self).__init__(cursor, db)
+        self.tracker = tracker
+
+    def __getattr__(self, attr):
+        if attr in ('callproc', 'executescript'):
+            self.tracker.unknown = True
+        return super(CursorWriteTrackingWrapper, self).__getattr__(attr)
+
+    def execute(self, sql, params=()):
+        self.tracker.record(sql)
+        return self.cursor.execute(sql, params)
+
+    def executemany(self, sql, param_list):
+        self.tracker.record(sql)
+        return self.cursor.executemany(sql, param_list)
+
+
 ###############################################
 # Converters from database (string) to Python #
 ###############################################
@@ -72,6 +72,8 @@ class ModelBase(type):
                     new_class._meta.ordering = base_meta.ordering
                 if not hasattr(meta, 'get_latest_by'):
                     new_class._meta.get_latest_by = base_meta.get_latest_by
+                if not hasattr(meta, 'track_changes'):
+                    new_class._meta.track_changes = base_meta.track_changes
 
         is_proxy = new_class._meta.proxy
 
@@ -270,6 +272,9 @@ class ModelState(object):
         # Necessary for correct validation of new instances of objects with explicit (non-auto) PKs.
         # This impacts validation only; it has no effect on the actual save.
         self.adding = True
+        # The field values the instance was loaded or last saved with, keyed
+        # by attname, for models with Meta.track_changes.
+        self.original_values = None
 
 class Model(object):
     __metaclass__ = ModelBase
@@ -365,6 +370,8 @@ class Model(object):
                     pass
             if kwargs:
                 raise TypeError("'%s' is an invalid keyword argument for this function" % kwargs.keys()[0])
+        if self._meta.track_changes:
+            self._store_original_values()
         super(Model, self).__init__()
         signals.post_init.send(sender=self.__class__, instance=self)
 
@@ -449,7 +456,43 @@ class Model(object):
             return getattr(self, field_name)
         return getattr(self, field.attname)
 
-    def save(self, force_insert=False, force_update=False, using=None):
+    def _store_original_values(self, field_names=None):
+        """
+        Remembers the current value of every loaded field, to tell later which
+        ones have changed. If ``field_names`` is given, only the values of
+        those fields and of the primary key are refreshed.
+
+        The values are copied, so that mutable values changed in place, such
+        as the lists of a custom field, are seen as changed.
+        """
+        if field_names is None:
+            self._state.original_values = dict([(f.attname, copy.deepcopy(self.__dict__[f.attname]))
+                for f in self._meta.fields if f.attname in self.__dict__])
+            return
+        if self._state.original_values is None:
+            self._state.original_values = {}
+        for f in self._meta.fields:
+            if ((f.primary_key or f.name in field_names)
+                    and f.attname in self.__dict__):
+                self._state.original_values[f.attname] = copy.deepcopy(self.__dict__[f.attname])
+
+    def _get_changed_fields(self):
+        """
+        Returns the names of the non-primary key fields whose value differs
+        from the one the instance was loaded or last saved with. Deferred
+        fields that haven't been loaded are never considered changed.
+        """
+        original = self._state.original_values or {}
+        changed = []
+        for f in self._meta.fields:
+            if f.primary_key or f.attname not in self.__dict__:
+                continue
+            if f.attname not in original or original[f.attname] != self.__dict__[f.attname]:
+                changed.append(f.name)
+        return changed
+
+    def save(self, force_insert=False, force_update=False, using=None,
+             update_fields=None):
         """
         Saves the current instance. Override this in a subclass if you want to
         control the saving process.
@@ -457,15 +500,53 @@ class Model(object):
         The 'force_insert' and 'force_update' parameters can be used to insist
         that the "save" must be an SQL insert or update (or equivalent for
         non-SQL backends), respectively. Normally, they should not be set.
+
+        The 'update_fields' parameter restricts the UPDATE to the given fields.
         """
         if force_insert and force_update:
             raise ValueError("Cannot force both insert and updating in model saving.")
-        self.save_base(using=using, force_insert=force_insert, force_update=force_update)
+
+        if update_fields is not None:
+            if force_insert:
+                raise ValueError("Cannot force an insert in model saving with update_fields.")
+            fields = {}
+            for f in self._meta.fields:
+                fields[f.name] = fields[f.attname] = f
+            names = set()
+            for name in update_fields:
+                if name not in fields or fields[name].primary_key:
+                    raise ValueError("'%s' is not a non-primary key field of %s "
+                                     "and cannot be used in update_fields."
+                                     % (name, self._meta.object_name))
+                names.add(fields[name].name)
+            if not names:
+                return
+            update_fields = frozenset(names)
+        elif (self._meta.track_changes and not force_insert
+              and not self._state.adding and self._get_pk_val() is not None
+              and self._get_pk_val() == (self._state.original_values or {}).get(self._meta.pk.attname)
+              and (using or router.db_for_write(self.__class__, instance=self)) == self._state.db):
+            # The instance is saved to the row and database it was loaded
+            # from, so only the fields that changed need to be written.
+            changed = self._get_changed_fields()
+            if not changed:
+                # Nothing changed since the instance was loaded or saved.
+                return
+            # Fields that set their value on every save, such as dates with
+            # auto_now, are kept up to date along with the changed ones.
+            changed.extend([f.name for f in self._meta.fields
+                             if getattr(f, 'auto_now', False)])
+            update_fields = frozenset(changed)
+
+        self.save_base(using=using, force_insert=force_insert,
+                       force_update=force_update, update_fields=update_fields)
+        if self._meta.track_changes:
+            self._store_original_values(update_fields)
 
     save.alters_data = True
 
     def save_base(self, raw=False, cls=None, origin=None, force_insert=False,
-            force_update=False, using=None):
+            force_update=False, using=None, update_fields=None):
         """
         Does the heavy-lifting involved in saving. Subclasses shouldn't need to
         override this method. It's separate from save() in order to hide the
@@ -474,7 +555,7 @@ class Model(object):
         """
         using = using or router.db_for_write(self.__class__, instance=self)
         connection = connections[using]
-        assert not (force_insert and force_update)
+        assert not (force_insert and (force_update or update_fields is not None))
         if cls is None:
             cls = self.__class__
             meta = cls._meta
@@ -504,7 +585,8 @@ class Model(object):
                 if field and getattr(self, parent._meta.pk.attname) is None and getattr(self, field.attname) is not None:
                     setattr(self, parent._meta.pk.attname, getattr(self, field.attname))
 
-                self.save_base(cls=parent, origin=org, using=using)
+                self.save_base(cls=parent, origin=org, using=using,
+                               update_fields=update_fields)
 
                 if field:
                     setattr(self, field.attname, self._get_pk_val(parent._meta))
@@ -517,21 +599,27 @@ class Model(object):
             # First, try an UPDATE. If that doesn't update anything, do an INSERT.
             pk_val = self._get_pk_val(meta)
             pk_set = pk_val is not None
-            record_exists = True
+            record_exists = False
             manager = cls._base_manager
-            if pk_set:
-                # Determine whether a record with the primary key already exists.
-                if (force_update or (not force_insert and
-                        manager.using(using).filter(pk=pk_val).exists())):
-                    # It does already exist, so do an UPDATE.
-                    if force_update or non_pks:
-                        values = [(f, None, (raw and getattr(self, f.attname) or f.pre_save(self, False))) for f in non_pks]
-                        rows = manager.using(using).filter(pk=pk_val)._update(values)
-                        if force_update and not rows:
-                            raise DatabaseError("Forced update did not affect any rows.")
+            if pk_set and not force_insert:
+                base_qs = manager.using(using).filter(pk=pk_val)
+                if update_fields is not None:
+                    non_pks = [f for f in non_pks if f.name in update_fields]
+                if non_pks:
+                    # The number of rows matched by the UPDATE tells whether a
+                    # record with the primary key already exists, saving the
+                    # query that would check it beforehand.
+                    values = [(f, None, (raw and getattr(self, f.attname) or f.pre_save(self, False))) for f in non_pks]
+                    record_exists = base_qs._update(values) > 0
+                elif update_fields is not None:
+                    # None of the fields to update are stored in this table.
+                    record_exists = True
                 else:
-                    record_exists = False
-            if not pk_set or not record_exists:
+                    # There's nothing to update, so check for existence.
+                    record_exists = base_qs.exists()
+                if (force_update or update_fields is not None) and not record_exists:
+                    raise DatabaseError("Forced update did not affect any rows.")
+            if not record_exists:
                 if meta.order_with_respect_to:
                     # If this is a model with an order_with_respect_to
                     # autopopulate the _order field
@@ -540,7 +628,7 @@ class Model(object):
                     self._order = order_value
 
                 if not pk_set:
-                    if force_update:
+                    if force_update or update_fields is not None:
                         raise ValueError("Cannot force an update in save() with no primary key.")
                     values = [(f, f.get_db_prep_save(raw and getattr(self, f.attname) or f.pre_save(self, True), connection=connection))
                         for f in meta.local_fields if not isinstance(f, AutoField)]
@@ -548,8 +636,6 @@ class Model(object):
                     values = [(f, f.get_db_prep_save(raw and getattr(self, f.attname) or f.pre_save(self, True), connection=connection))
                         for f in meta.local_fields]
 
-                record_exists = False
-
                 update_pk = bool(meta.has_auto_field and not pk_set)
                 if values:
                     # Create a new record.
@@ -1,7 +1,8 @@
 import copy
 from django.conf import settings
 from django.db import router
-from django.db.models.query import QuerySet, EmptyQuerySet, insert_query, RawQuerySet
+from django.db.models.query import (QuerySet, EmptyQuerySet, insert_query,
+    bulk_insert_query, RawQuerySet)
 from django.db.models import signals
 from django.db.models.fields import FieldDoesNotExist
 
@@ -134,6 +135,12 @@ class Manager(object):
     def get_or_create(self, **kwargs):
         return self.get_query_set().get_or_create(**kwargs)
 
+    def update_or_create(self, **kwargs):
+        return self.get_query_set().update_or_create(**kwargs)
+
+    def upsert(self, **kwargs):
+        return self.get_query_set().upsert(**kwargs)
+
     def create(self, **kwargs):
         return self.get_query_set().create(**kwargs)
 
@@ -197,6 +204,9 @@ class Manager(object):
     def _insert(self, values, **kwargs):
         return insert_query(self.model, values, **kwargs)
 
+    def _bulk_insert(self, fields, rows, **kwargs):
+        return bulk_insert_query(self.model, fields, rows, **kwargs)
+
     def _update(self, values, **kwargs):
         return self.get_query_set()._update(values, **kwargs)
 
@@ -17,7 +17,8 @@ get_verbose_name = lambda class_name: re.sub('(((?<=[a-z])[A-Z])|([A-Z](?![A-Z]|
 DEFAULT_NAMES = ('verbose_name', 'verbose_name_plural', 'db_table', 'ordering',
                  'unique_together', 'permissions', 'get_latest_by',
                  'order_with_respect_to', 'app_label', 'db_tablespace',
-                 'abstract', 'managed', 'proxy', 'auto_created')
+                 'abstract', 'managed', 'proxy', 'auto_created',
+                 'track_changes')
 
 class Options(object):
     def __init__(self, meta, app_label=None):
@@ -44,6 +45,7 @@ class Options(object):
         self.parents = SortedDict()
         self.duplicate_targets = {}
         self.auto_created = False
+        self.track_changes = False
 
         # To handle various inheritance situations, we need to track where
         # managers came from (concrete or abstract base classes).
@@ -158,12 +160,15 @@ class Options(object):
             self.local_many_to_many.insert(bisect(self.local_many_to_many, field), field)
             if hasattr(self, '_m2m_cache'):
                 del self._m2m_cache
+                del self._m2m_name_index
         else:
             self.local_fields.insert(bisect(self.local_fields, field), field)
             self.setup_pk(field)
             if hasattr(self, '_field_cache'):
                 del self._field_cache
                 del self._field_name_cache
+                del self._field_name_index
+                del self._field_attname_index
 
         if hasattr(self, '_name_map'):
             del self._name_map
@@ -242,6 +247,13 @@ class Options(object):
         cache.extend([(f, None) for f in self.local_fields])
         self._field_cache = tuple(cache)
         self._field_name_cache = [x for x, _ in cache]
+        # Index the fields by name and attname for get_field() and
+        # get_field_by_attname(). The first field with a name wins, as it
+        # would when searching the list.
+        self._field_name_index, self._field_attname_index = {}, {}
+        for f in self._field_name_cache:
+            self._field_name_index.setdefault(f.name, f)
+            self._field_attname_index.setdefault(f.attname, f)
 
     def _many_to_many(self):
         try:
@@ -272,17 +284,46 @@ class Options(object):
         for field in self.local_many_to_many:
             cache[field] = None
         self._m2m_cache = cache
+        self._m2m_name_index = {}
+        for f in cache:
+            self._m2m_name_index.setdefault(f.name, f)
 
     def get_field(self, name, many_to_many=True):
         """
         Returns the requested field by name. Raises FieldDoesNotExist on error.
         """
-        to_search = many_to_many and (self.fields + self.many_to_many) or self.fields
-        for f in to_search:
-            if f.name == name:
-                return f
+        try:
+            self._field_name_index
+        except AttributeError:
+            self._fill_fields_cache()
+        try:
+            return self._field_name_index[name]
+        except KeyError:
+            if many_to_many:
+                try:
+                    self._m2m_name_index
+                except AttributeError:
+                    self._fill_m2m_cache()
+                if name in self._m2m_name_index:
+                    return self._m2m_name_index[name]
         raise FieldDoesNotExist('%s has no field named %r' % (self.object_name, name))
 
+    def get_field_by_attname(self, attname):
+        """
+        Returns the non-many-to-many field whose attribute name (e.g.
+        "author_id" for a foreign key named "author") is attname. Raises
+        FieldDoesNotExist on error.
+        """
+        try:
+            self._field_attname_index
+        except AttributeError:
+            self._fill_fields_cache()
+        try:
+            return self._field_attname_index[attname]
+        except KeyError:
+            raise FieldDoesNotExist('%s has no field with the attribute name %r'
+                    % (self.object_name, attname))
+
     def get_field_by_name(self, name):
         """
         Returns the (field_object, model, direct, m2m), where field_object is
@@ -2,12 +2,14 @@
 The main QuerySet implementation. This provides the public API for the ORM.
 """
 
+from __future__ import with_statement
+
 import copy
 from itertools import izip
 
 from django.db import connections, router, transaction, IntegrityError
 from django.db.models.aggregates import Aggregate
-from django.db.models.fields import DateField
+from django.db.models.fields import AutoField, DateField, FieldDoesNotExist
 from django.db.models.query_utils import (Q, select_related_descend,
     deferred_class_factory, InvalidQuery)
 from django.db.models.deletion import Collector
@@ -369,28 +371,163 @@ class QuerySet(object):
         assert kwargs, \
                 'get_or_create() must be passed at least one keyword argument'
         defaults = kwargs.pop('defaults', {})
-        lookup = kwargs.copy()
-        for f in self.model._meta.fields:
-            if f.attname in lookup:
-                lookup[f.name] = lookup.pop(f.attname)
+        lookup, params = self._extract_model_params(defaults, **kwargs)
         try:
             self._for_write = True
             return self.get(**lookup), False
         except self.model.DoesNotExist:
+            return self._create_object_from_params(lookup, params)
+
+    def update_or_create(self, defaults=None, **kwargs):
+        """
+        Looks up an object with the given kwargs and updates it with the
+        values in defaults, creating it from both if it doesn't exist.
+        Returns a tuple of (object, created), where created is a boolean
+        specifying whether an object was created.
+
+        The object is locked with SELECT ... FOR UPDATE until it's saved, in
+        a transaction, so that concurrent updates don't overwrite each other.
+        """
+        assert kwargs, \
+                'update_or_create() must be passed at least one keyword argument'
+        defaults = defaults or {}
+        lookup, params = self._extract_model_params(defaults, **kwargs)
+        self._for_write = True
+        with transaction.commit_on_success(using=self.db):
+            queryset = self.select_for_update()
             try:
-                params = dict([(k, v) for k, v in kwargs.items() if '__' not in k])
-                params.update(defaults)
-                obj = self.model(**params)
-                sid = transaction.savepoint(using=self.db)
-                obj.save(force_insert=True, using=self.db)
-                transaction.savepoint_commit(sid, using=self.db)
-                return obj, True
-            except IntegrityError, e:
-                transaction.savepoint_rollback(sid, using=self.db)
-                try:
-                    return self.get(**lookup), False
-                except self.model.DoesNotExist:
-                    raise e
+                obj = queryset.get(**lookup)
+            except self.model.DoesNotExist:
+                obj, created = queryset._create_object_from_params(lookup, params)
+                if created:
+                    return obj, created
+            if defaults:
+                for k, v in defaults.items():
+                    setattr(obj, k, v)
+                obj.save(using=self.db)
+        return obj, False
+
+    def upsert(self, defaults=None, **kwargs):
+        """
+        Inserts a row with the values in kwargs and defaults or, if a row with
+        the values in kwargs already exists, updates it with the values in
+        defaults, in a single query on the databases that support it.
+
+        The kwargs must be the fields of the primary key, a unique field or a
+        unique_together constraint. Returns nothing.
+
+        Unlike update_or_create(), this doesn't call save(), so no pre_save or
+        post_save signals are sent. Fields with auto_now are set on insert and
+        whenever defaults are updated, and fields with auto_now_add only on
+        insert.
+        """
+        assert kwargs, \
+                'upsert() must be passed at least one keyword argument'
+        defaults = defaults or {}
+        opts = self.model._meta
+        fields = {}
+        for f in opts.fields:
+            fields[f.name] = fields[f.attname] = f
+        for name in kwargs.keys() + defaults.keys():
+            if name not in fields:
+                raise TypeError("upsert() got an unexpected field '%s'" % name)
+        conflict_fields = set([fields[name].name for name in kwargs])
+        unique_sets = [set([opts.pk.name])]
+        unique_sets.extend([set([f.name]) for f in opts.fields if f.unique])
+        unique_sets.extend([set(names) for names in opts.unique_together])
+        if conflict_fields not in unique_sets:
+            raise ValueError("The arguments of upsert() must be the fields of "
+                             "a unique constraint of %s." % opts.object_name)
+
+        self._for_write = True
+        connection = connections[self.db]
+        if opts.parents or not connection.features.supports_upsert:
+            self._upsert_fallback(kwargs, defaults)
+            return
+
+        params = kwargs.copy()
+        params.update(defaults)
+        obj = self.model(**params)
+        values = [(f, f.get_db_prep_save(f.pre_save(obj, True), connection=connection))
+                  for f in opts.local_fields
+                  if not (isinstance(f, AutoField) and f.name not in conflict_fields)]
+        update_columns = [f.column for f in self._upsert_update_fields(defaults)
+                          if f.name not in conflict_fields]
+        query = sql.InsertQuery(self.model)
+        query.insert_values(values)
+        query.on_conflict = ([fields[name].column for name in kwargs], update_columns)
+        query.get_compiler(using=self.db).execute_sql()
+        transaction.commit_unless_managed(using=self.db)
+    upsert.alters_data = True
+
+    def _upsert_update_fields(self, defaults):
+        """
+        Returns the fields upsert() updates in an existing row: those in
+        defaults and, if there are any, those with auto_now. Fields with
+        auto_now_add keep the value they were inserted with.
+        """
+        if not defaults:
+            return []
+        return [f for f in self.model._meta.fields
+                if (f.name in defaults or f.attname in defaults
+                    or getattr(f, 'auto_now', False))
+                and not getattr(f, 'auto_now_add', False)]
+
+    def _upsert_fallback(self, kwargs, defaults):
+        """
+        Implements upsert() with an UPDATE, followed by an INSERT if no row
+        was updated, for the databases that can't do both in one query.
+        """
+        queryset = self.filter(**kwargs)
+        if defaults:
+            obj = self.model(**defaults)
+            values = dict([(f.name, f.pre_save(obj, False))
+                           for f in self._upsert_update_fields(defaults)])
+            updated = queryset.update(**values)
+        else:
+            updated = queryset.exists()
+        if not updated:
+            lookup, params = self._extract_model_params(defaults, **kwargs)
+            obj, created = self._create_object_from_params(lookup, params)
+            if not created and defaults:
+                # Another process inserted the row in the meantime.
+                queryset.update(**values)
+
+    def _extract_model_params(self, defaults, **kwargs):
+        """
+        Prepares the lookup used to find an object from the keyword arguments
+        of get_or_create() and update_or_create(), and the parameters used to
+        create it.
+        """
+        lookup = kwargs.copy()
+        for name in kwargs:
+            try:
+                f = self.model._meta.get_field_by_attname(name)
+            except FieldDoesNotExist:
+                continue
+            lookup[f.name] = lookup.pop(name)
+        params = dict([(k, v) for k, v in kwargs.items() if '__' not in k])
+        params.update(defaults)
+        return lookup, params
+
+    def _create_object_from_params(self, lookup, params):
+        """
+        Creates an object from params in a savepoint. If that fails because
+        another process created it in the meantime, returns the existing
+        object found with lookup instead. Returns a tuple of (object, created).
+        """
+        try:
+            obj = self.model(**params)
+            sid = transaction.savepoint(using=self.db)
+            obj.save(force_insert=True, using=self.db)
+            transaction.savepoint_commit(sid, using=self.db)
+            return obj, True
+        except IntegrityError, e:
+            transaction.savepoint_rollback(sid, using=self.db)
+            try:
+                return self.get(**lookup), False
+            except self.model.DoesNotExist:
+                raise e
 
     def latest(self, field_name=None):
         """
@@ -1454,3 +1591,19 @@ def insert_query(model, values, return_id=False, raw_values=False, using=None):
     query = sql.InsertQuery(model)
     query.insert_values(values, raw_values)
     return query.get_compiler(using=using).execute_sql(return_id)
+
+def bulk_insert_query(model, fields, rows, using=None):
+    """
+    Inserts several new records for the given model, with as few queries as
+    the database allows. Each row is a sequence of values for the given
+    fields, prepared for the database. It is not part of the public API.
+    """
+    connection = connections[using]
+    rows = list(rows)
+    per_query = max(1, connection.ops.bulk_batch_size(fields, rows))
+    for start in xrange(0, len(rows), per_query):
+        batch = rows[start:start + per_query]
+        query = sql.InsertQuery(model)
+        query.insert_values(zip(fields, batch[0]))
+        query.add_rows(batch[1:])
+        query.get_compiler(using=using).execute_sql()
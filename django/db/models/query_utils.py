@@ -91,8 +91,7 @@ class DeferredAttribute(object):
                 cls._meta.get_field_by_name(self.field_name)
                 name = self.field_name
             except FieldDoesNotExist:
-                name = [f.name for f in cls._meta.fields
-                    if f.attname == self.field_name][0]
+                name = cls._meta.get_field_by_attname(self.field_name).name
             # We use only() instead of values() here because we want the
             # various data coersion methods (to_python(), etc.) to be called
             # here.
@@ -102,6 +101,9 @@ class DeferredAttribute(object):
                 self.field_name
             )
             data[self.field_name] = val
+            if instance._state.original_values is not None:
+                # A freshly loaded value isn't a change.
+                instance._state.original_values[self.field_name] = val
         return data[self.field_name]
 
     def __set__(self, instance, value):
@@ -796,8 +796,19 @@ class SQLInsertCompiler(SQLCompiler):
         result = ['INSERT INTO %s' % qn(opts.db_table)]
         result.append('(%s)' % ', '.join([qn(c) for c in self.query.columns]))
         values = [self.placeholder(*v) for v in self.query.values]
-        result.append('VALUES (%s)' % ', '.join(values))
         params = self.query.params
+        if self.query.extra_rows and self.connection.features.has_bulk_insert:
+            rows = [values] + [[self.placeholder(*v) for v in row]
+                               for row in self.query.extra_rows]
+            result.append('VALUES %s' % ', '.join(['(%s)' % ', '.join(row) for row in rows]))
+            for row in self.query.extra_rows:
+                params = params + tuple([v for f, v in row])
+        else:
+            result.append('VALUES (%s)' % ', '.join(values))
+        if self.query.on_conflict is not None:
+            conflict_columns, update_columns = self.query.on_conflict
+            result.append(self.connection.ops.upsert_sql(
+                [qn(c) for c in conflict_columns], [qn(c) for c in update_columns]))
         if self.return_id and self.connection.features.can_return_id_from_insert:
             col = "%s.%s" % (qn(opts.db_table), qn(opts.pk.column))
             r_fmt, r_params = self.connection.ops.return_insert_id()
@@ -807,6 +818,15 @@ class SQLInsertCompiler(SQLCompiler):
 
     def execute_sql(self, return_id=False):
         self.return_id = return_id
+        if self.query.extra_rows:
+            assert not return_id, "Can't return the id of several inserted rows."
+            if not self.connection.features.has_bulk_insert:
+                # Insert the rows one at a time, with a single call.
+                sql, params = self.as_sql()
+                rows = [params] + [tuple([v for f, v in row])
+                                   for row in self.query.extra_rows]
+                self.connection.cursor().executemany(sql, rows)
+                return
         cursor = super(SQLInsertCompiler, self).execute_sql(None)
         if not (return_id and cursor):
             return
@@ -1237,17 +1237,20 @@ class Query(object):
             try:
                 field, model, direct, m2m = opts.get_field_by_name(name)
             except FieldDoesNotExist:
-                for f in opts.fields:
-                    if allow_explicit_fk and name == f.attname:
-                        # XXX: A hack to allow foo_id to work in values() for
-                        # backwards compatibility purposes. If we dropped that
-                        # feature, this could be removed.
-                        field, model, direct, m2m = opts.get_field_by_name(f.name)
-                        break
-                else:
+                f = None
+                if allow_explicit_fk:
+                    # XXX: A hack to allow foo_id to work in values() for
+                    # backwards compatibility purposes. If we dropped that
+                    # feature, this could be removed.
+                    try:
+                        f = opts.get_field_by_attname(name)
+                    except FieldDoesNotExist:
+                        pass
+                if f is None:
                     names = opts.get_all_field_names() + self.aggregate_select.keys()
                     raise FieldError("Cannot resolve keyword %r into field. "
                             "Choices are: %s" % (name, ", ".join(names)))
+                field, model, direct, m2m = opts.get_field_by_name(f.name)
 
             if not allow_many and (m2m or not direct):
                 for alias in joins:
@@ -141,12 +141,18 @@ class InsertQuery(Query):
         self.columns = []
         self.values = []
         self.params = ()
+        # A (conflict_columns, update_columns) tuple, for upserts.
+        self.on_conflict = None
+        # Further rows of (field, value) pairs, see add_rows().
+        self.extra_rows = []
 
     def clone(self, klass=None, **kwargs):
         extras = {
             'columns': self.columns[:],
             'values': self.values[:],
-            'params': self.params
+            'params': self.params,
+            'on_conflict': self.on_conflict,
+            'extra_rows': self.extra_rows[:],
         }
         extras.update(kwargs)
         return super(InsertQuery, self).clone(klass, **extras)
@@ -172,6 +178,16 @@ class InsertQuery(Query):
             self.params += tuple(values)
             self.values.extend(placeholders)
 
+    def add_rows(self, rows):
+        """
+        Adds more rows to insert with the same query. Each row is a sequence
+        of values for the fields given to insert_values(), in the same order.
+        Raw values can't be used.
+        """
+        fields = [field for field, val in self.values]
+        for row in rows:
+            self.extra_rows.append(zip(fields, row))
+
 class DateQuery(Query):
     """
     A DateQuery is a normal query, except that it specifically selects a single
@@ -1,4 +1,5 @@
 import datetime
+import mimetypes
 import os
 import re
 import time
@@ -385,6 +386,18 @@ class HttpRequest(object):
     def readlines(self):
         return list(iter(self))
 
+    def chunks(self, chunk_size=64 * 2 ** 10):
+        """
+        Yields the request body in chunks of at most ``chunk_size`` bytes (64 KB
+        by default), so that it can be processed without holding all of it in
+        memory.
+        """
+        while True:
+            chunk = self.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+
 class QueryDict(MultiValueDict):
     """
     A specialized MultiValueDict that takes a query string when initialized.
@@ -566,6 +579,9 @@ class HttpResponse(object):
         else:
             self._container = [content]
             self._is_string = True
+        # Iterators replaced by setting streaming_content, closed along with
+        # the response.
+        self._replaced_containers = []
         self.cookies = SimpleCookie()
         if status:
             self.status_code = status
@@ -674,19 +690,44 @@ class HttpResponse(object):
 
     content = property(_get_content, _set_content)
 
-    def __iter__(self):
-        self._iterator = iter(self._container)
-        return self
+    def _get_streaming(self):
+        # Whether the content is produced while the response is being sent,
+        # from an iterator or a file, so that reading it all in advance should
+        # be avoided.
+        return not self._is_string
 
-    def next(self):
-        chunk = self._iterator.next()
+    streaming = property(_get_streaming)
+
+    def _encode_chunk(self, chunk):
         if isinstance(chunk, unicode):
             chunk = chunk.encode(self._charset)
         return str(chunk)
 
+    def _get_streaming_content(self):
+        return (self._encode_chunk(chunk) for chunk in self._container)
+
+    def _set_streaming_content(self, value):
+        if not self._is_string:
+            self._replaced_containers.append(self._container)
+        self._container = value
+        self._is_string = False
+
+    # An iterator of the content's byte strings. Setting it replaces the
+    # content with another iterator, e.g. one that transforms the chunks of
+    # the original content as they are sent.
+    streaming_content = property(_get_streaming_content, _set_streaming_content)
+
+    def __iter__(self):
+        self._iterator = iter(self.streaming_content)
+        return self
+
+    def next(self):
+        return self._iterator.next()
+
     def close(self):
-        if hasattr(self._container, 'close'):
-            self._container.close()
+        for container in [self._container] + self._replaced_containers:
+            if hasattr(container, 'close'):
+                container.close()
 
     # The remaining methods partially implement the file-like object interface.
     # See http://docs.python.org/lib/bltin-file-objects.html
@@ -703,6 +744,164 @@ class HttpResponse(object):
             raise Exception("This %s instance cannot tell its position" % self.__class__)
         return sum([len(chunk) for chunk in self._container])
 
+class FileResponse(HttpResponse):
+    """
+    An HTTP response that sends an open file in blocks, rather than reading it
+    into memory. Under a WSGI server that provides ``wsgi.file_wrapper`` the
+    file is handed over to the server, which may send it with ``sendfile()``.
+
+    The response takes care of closing the file.
+    """
+    block_size = 8192
+    range_re = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+    def __init__(self, file, mimetype=None, status=None, content_type=None,
+                 size=None):
+        super(FileResponse, self).__init__('', mimetype, status, content_type)
+        self.file = file
+        self._is_string = False
+        # Whether the content is still read straight from the file, rather
+        # than replaced or wrapped in another iterator.
+        self._from_file = True
+        if size is None:
+            try:
+                size = os.fstat(file.fileno()).st_size
+            except (AttributeError, EnvironmentError):
+                pass
+        self.size = size
+        # The section of the file to send: from its current position to its
+        # end, until set_range() restricts it. The position is only known, and
+        # returned to, for files that can seek.
+        try:
+            self.start = file.tell()
+        except (AttributeError, EnvironmentError):
+            self.start = None
+        self.length = None
+        if size is not None:
+            self.length = size - (self.start or 0)
+            self['Content-Length'] = str(self.length)
+            if self.start is not None:
+                self['Accept-Ranges'] = 'bytes'
+
+    def set_range(self, request):
+        """
+        Restricts the response to the byte range asked for by the Range header
+        of the request, if there is one. A range is ignored if the request's
+        If-Range header doesn't match the response's ETag or Last-Modified
+        header, so call this once those are set.
+        """
+        header = request.META.get('HTTP_RANGE')
+        if (not header or not self._from_file or self.size is None or
+                self.status_code != 200 or not self.has_header('Accept-Ranges')):
+            return
+        if_range = request.META.get('HTTP_IF_RANGE')
+        if if_range and if_range not in (self.get('ETag', None), self.get('Last-Modified', None)):
+            return
+        # Only single ranges are supported; the whole file is sent otherwise.
+        match = self.range_re.match(header.strip())
+        if match is None:
+            return
+        first, last = match.groups()
+        if first:
+            start = int(first)
+            end = self.size - 1
+            if last:
+                if int(last) < start:
+                    return
+                end = min(int(last), end)
+        elif last:
+            # A suffix range, giving the length of the end of the file to send.
+            start = max(self.size - int(last), 0)
+            end = self.size - 1
+        else:
+            return
+        if start >= self.size or end < start:
+            self.content = ''
+            self.status_code = 416
+            self['Content-Range'] = 'bytes */%d' % self.size
+            self['Content-Length'] = '0'
+            return
+        self.status_code = 206
+        self.start = start
+        self.length = end - start + 1
+        self['Content-Range'] = 'bytes %d-%d/%d' % (start, end, self.size)
+        self['Content-Length'] = str(self.length)
+
+    def wsgi_file(self):
+        """
+        Returns the file positioned at the start of the content, for the WSGI
+        server's file_wrapper, or None if the content isn't the rest of the
+        file and so has to be sent by iterating over the response.
+        """
+        if not self._from_file:
+            return None
+        if self.start is not None:
+            if self.start + self.length != self.size:
+                return None
+            self.file.seek(self.start)
+        return self.file
+
+    def _read_blocks(self):
+        if self.start is not None:
+            self.file.seek(self.start)
+        remaining = self.length
+        while remaining is None or remaining > 0:
+            if remaining is None:
+                block = self.file.read(self.block_size)
+            else:
+                block = self.file.read(min(self.block_size, remaining))
+                remaining -= len(block)
+            if not block:
+                break
+            yield block
+
+    def _get_content(self):
+        if not self._from_file:
+            return super(FileResponse, self)._get_content()
+        return ''.join(self._read_blocks())
+
+    def _set_content(self, value):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+        self._from_file = False
+        super(FileResponse, self)._set_content(value)
+
+    content = property(_get_content, _set_content)
+
+    def _get_streaming_content(self):
+        if not self._from_file:
+            return super(FileResponse, self)._get_streaming_content()
+        return self._read_blocks()
+
+    def _set_streaming_content(self, value):
+        # The file is left open for the new iterator to read from, and closed
+        # along with the response.
+        self._from_file = False
+        super(FileResponse, self)._set_streaming_content(value)
+
+    streaming_content = property(_get_streaming_content, _set_streaming_content)
+
+    def close(self):
+        super(FileResponse, self).close()
+        if self.file is not None:
+            self.file.close()
+
+class SendfileResponse(HttpResponse):
+    """
+    An empty HTTP response asking the front-end web server to send a file
+    itself, for instance once a view has checked that the user may download
+    it. With the default ``X-Sendfile`` header (Apache's mod_xsendfile,
+    lighttpd) ``path`` is the file's path on disk; with nginx's
+    ``X-Accel-Redirect`` header it's the URI of an internal location.
+    """
+    def __init__(self, path, mimetype=None, status=None, content_type=None,
+                 header='X-Sendfile'):
+        if not mimetype and not content_type:
+            mimetype = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+        super(SendfileResponse, self).__init__('', mimetype, status, content_type)
+        self[header] = path
+
 class HttpResponseRedirect(HttpResponse):
     status_code = 302
 
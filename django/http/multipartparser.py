@@ -6,6 +6,8 @@ file upload handlers for processing.
 """
 
 import cgi
+import sys
+
 from django.conf import settings
 from django.core.exceptions import SuspiciousOperation
 from django.utils.datastructures import MultiValueDict
@@ -215,8 +217,15 @@ class MultiPartParser(object):
                                     break
 
                     except SkipFile, e:
+                        self.handle_upload_interrupted()
                         # Just use up the rest of this file...
                         exhaust(field_stream)
+                    except:
+                        # Let the handlers discard the partial file before
+                        # the error (or StopUpload) propagates.
+                        exc_info = sys.exc_info()
+                        self.handle_upload_interrupted()
+                        raise exc_info[0], exc_info[1], exc_info[2]
                     else:
                         # Handle file upload completions on next iteration.
                         old_field_name = field_name
@@ -252,6 +261,13 @@ class MultiPartParser(object):
                                        file_obj)
                 break
 
+    def handle_upload_interrupted(self):
+        """
+        Signal to the handlers that the current file won't be completed.
+        """
+        for handler in self._upload_handlers:
+            handler.upload_interrupted()
+
     def IE_sanitize(self, filename):
         """Cleanup filename from Internet Explorer full paths."""
         return filename and filename[filename.rfind("\\")+1:].strip()
@@ -263,6 +279,10 @@ class LazyStream(object):
     Given a producer object (an iterator that yields bytestrings), the
     LazyStream object will support iteration, reading, and keeping a "look-back"
     variable in case you need to "unget" some bytes.
+
+    The bytes that have been produced but not read yet are kept in a buffer
+    along with an offset, so that reading part of the buffer (with read(),
+    or with fill() and skip()) doesn't copy the rest of it.
     """
     def __init__(self, producer, length=None):
         """
@@ -274,6 +294,7 @@ class LazyStream(object):
         self._producer = producer
         self._empty = False
         self._leftover = ''
+        self._offset = 0
         self.length = length
         self.position = 0
         self._remaining = length
@@ -283,29 +304,52 @@ class LazyStream(object):
         return self.position
 
     def read(self, size=None):
-        def parts():
-            remaining = (size is not None and [size] or [self._remaining])[0]
-            # do the whole thing in one shot if no limit was provided.
-            if remaining is None:
-                yield ''.join(self)
-                return
-
-            # otherwise do some bookkeeping to return exactly enough
-            # of the stream and stashing any extra content we get from
-            # the producer
-            while remaining != 0:
-                assert remaining > 0, 'remaining bytes to read should never go negative'
-
-                chunk = self.next()
-
-                emitting = chunk[:remaining]
-                self.unget(chunk[remaining:])
-                remaining -= len(emitting)
-                yield emitting
-
-        out = ''.join(parts())
+        if size is None:
+            size = self._remaining
+        # do the whole thing in one shot if no limit was provided.
+        if size is None:
+            return ''.join(self)
+        assert size >= 0, 'the number of bytes to read should never be negative'
+
+        data, start = self.fill(size)
+        out = data[start:start + size]
+        self.skip(len(out))
         return out
 
+    def fill(self, size):
+        """
+        Makes sure that at least ``size`` bytes are buffered, unless the
+        producer runs out first, without consuming them.
+
+        Returns a ``(data, start)`` tuple: the buffered bytes are
+        ``data[start:]``. Use skip() to consume some of them.
+        """
+        available = len(self._leftover) - self._offset
+        if available >= size:
+            return self._leftover, self._offset
+        chunks = [self._leftover[self._offset:]]
+        while available < size:
+            try:
+                chunk = self._producer.next()
+            except StopIteration:
+                break
+            self._unget_history = []
+            chunks.append(chunk)
+            available += len(chunk)
+        self._leftover = ''.join(chunks)
+        self._offset = 0
+        return self._leftover, 0
+
+    def skip(self, num_bytes):
+        """
+        Consumes the first ``num_bytes`` bytes buffered by fill().
+        """
+        self._offset += num_bytes
+        self.position += num_bytes
+        if self._offset >= len(self._leftover):
+            self._leftover = ''
+            self._offset = 0
+
     def next(self):
         """
         Used when the exact number of bytes to read is unimportant.
@@ -314,9 +358,10 @@ class LazyStream(object):
         from the iterator instead. Useful to avoid unnecessary bookkeeping if
         performance is an issue.
         """
-        if self._leftover:
-            output = self._leftover
+        if self._offset < len(self._leftover):
+            output = self._leftover[self._offset:]
             self._leftover = ''
+            self._offset = 0
         else:
             output = self._producer.next()
             self._unget_history = []
@@ -346,7 +391,8 @@ class LazyStream(object):
             return
         self._update_unget_history(len(bytes))
         self.position -= len(bytes)
-        self._leftover = ''.join([bytes, self._leftover])
+        self._leftover = ''.join([bytes, self._leftover[self._offset:]])
+        self._offset = 0
 
     def _update_unget_history(self, num_bytes):
         """
@@ -433,8 +479,12 @@ class BoundaryIter(object):
     A Producer that is sensitive to boundaries.
 
     Will happily yield bytes until a boundary is found. Will yield the bytes
-    before the boundary, throw away the boundary bytes themselves, and push the
-    post-boundary bytes back on the stream.
+    before the boundary, throw away the boundary bytes themselves, and leave the
+    post-boundary bytes on the stream.
+
+    The boundary is searched for in the stream's buffer, starting at its
+    offset, so that finding each of many small parts in a large chunk doesn't
+    copy the rest of the chunk.
 
     The future calls to .next() after locating the boundary will raise a
     StopIteration exception.
@@ -448,17 +498,9 @@ class BoundaryIter(object):
         # this: CRLF<boundary>[--CRLF]
         self._rollback = len(boundary) + 6
 
-        # Try to use mx fast string search if available. Otherwise
-        # use Python find. Wrap the latter for consistency.
-        unused_char = self._stream.read(1)
-        if not unused_char:
+        data, start = self._stream.fill(1)
+        if start == len(data):
             raise InputStreamExhausted()
-        self._stream.unget(unused_char)
-        try:
-            from mx.TextTools import FS
-            self._fs = FS(boundary).find
-        except ImportError:
-            self._fs = lambda data: data.find(boundary)
 
     def __iter__(self):
         return self
@@ -470,43 +512,34 @@ class BoundaryIter(object):
         stream = self._stream
         rollback = self._rollback
 
-        bytes_read = 0
-        chunks = []
-        for bytes in stream:
-            bytes_read += len(bytes)
-            chunks.append(bytes)
-            if bytes_read > rollback:
-                break
-            if not bytes:
-                break
-        else:
+        data, start = stream.fill(rollback + 1)
+        if start == len(data):
             self._done = True
-
-        if not chunks:
             raise StopIteration()
 
-        chunk = ''.join(chunks)
-        boundary = self._find_boundary(chunk, len(chunk) < self._rollback)
+        boundary = self._find_boundary(data, start)
 
         if boundary:
             end, next = boundary
-            stream.unget(chunk[next:])
+            stream.skip(next - start)
+            self._done = True
+            return data[start:end]
+        elif len(data) - start <= rollback:
+            # The stream ran out before a boundary was found, so there's
+            # nothing left but this chunk.
+            stream.skip(len(data) - start)
             self._done = True
-            return chunk[:end]
+            return data[start:]
         else:
             # make sure we dont treat a partial boundary (and
             # its separators) as data
-            if not chunk[:-rollback]:# and len(chunk) >= (len(self._boundary) + 6):
-                # There's nothing left, we should just return and mark as done.
-                self._done = True
-                return chunk
-            else:
-                stream.unget(chunk[-rollback:])
-                return chunk[:-rollback]
-
-    def _find_boundary(self, data, eof = False):
+            end = len(data) - rollback
+            stream.skip(end - start)
+            return data[start:end]
+
+    def _find_boundary(self, data, start=0):
         """
-        Finds a multipart boundary in data.
+        Finds a multipart boundary in data, from the given index on.
 
         Should no boundry exist in the data None is returned instead. Otherwise
         a tuple containing the indices of the following are returned:
@@ -514,16 +547,16 @@ class BoundaryIter(object):
          * the end of current encapsulation
          * the start of the next encapsulation
         """
-        index = self._fs(data)
+        index = data.find(self._boundary, start)
         if index < 0:
             return None
         else:
             end = index
             next = index + len(self._boundary)
             # backup over CRLF
-            if data[max(0,end-1)] == '\n':
+            if end > start and data[end-1] == '\n':
                 end -= 1
-            if data[max(0,end-1)] == '\r':
+            if end > start and data[end-1] == '\r':
                 end -= 1
             return end, next
 
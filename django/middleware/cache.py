@@ -93,7 +93,7 @@ class UpdateCacheMiddleware(object):
         if not self._should_update_cache(request, response):
             # We don't need to update the cache, just return.
             return response
-        if not response.status_code == 200:
+        if not response.status_code == 200 or response.streaming:
             return response
         # Try to get the timeout from the "max-age" section of the "Cache-
         # Control" header before reverting to using the default cache_timeout
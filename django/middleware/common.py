@@ -108,12 +108,18 @@ class CommonMiddleware(object):
                                   fail_silently=True)
                 return response
 
-        # Use ETags, if requested.
-        if settings.USE_ETAGS:
+        # Use ETags, if requested. The content of streamed responses isn't
+        # read to compute one.
+        if settings.USE_ETAGS and (response.has_header('ETag') or not response.streaming):
             if response.has_header('ETag'):
                 etag = response['ETag']
             else:
-                etag = '"%s"' % hashlib.md5(response.content).hexdigest()
+                # Hash the content chunk by chunk, rather than joining the
+                # chunks written to the response into one string.
+                md5 = hashlib.md5()
+                for chunk in response.streaming_content:
+                    md5.update(chunk)
+                etag = '"%s"' % md5.hexdigest()
             if response.status_code >= 200 and response.status_code < 300 and request.META.get('HTTP_IF_NONE_MATCH') == etag:
                 cookies = response.cookies
                 response = http.HttpResponseNotModified()
@@ -1,6 +1,6 @@
 import re
 
-from django.utils.text import compress_string
+from django.utils.text import compress_sequence, compress_string
 from django.utils.cache import patch_vary_headers
 
 re_accepts_gzip = re.compile(r'\bgzip\b')
@@ -12,8 +12,11 @@ class GZipMiddleware(object):
     on the Accept-Encoding header.
     """
     def process_response(self, request, response):
-        # It's not worth compressing non-OK or really short responses.
-        if response.status_code != 200 or len(response.content) < 200:
+        # It's not worth compressing non-OK or really short responses. The
+        # length of streamed responses isn't known in advance.
+        if response.status_code != 200:
+            return response
+        if not response.streaming and len(response.content) < 200:
             return response
 
         patch_vary_headers(response, ('Accept-Encoding',))
@@ -32,7 +35,15 @@ class GZipMiddleware(object):
         if not re_accepts_gzip.search(ae):
             return response
 
-        response.content = compress_string(response.content)
+        if response.streaming:
+            # Compress the content chunk by chunk as it's sent, rather than
+            # reading it all into memory.
+            response.streaming_content = compress_sequence(response.streaming_content)
+            del response['Content-Length']
+            # Byte ranges would refer to the uncompressed content.
+            del response['Accept-Ranges']
+        else:
+            response.content = compress_string(response.content)
+            response['Content-Length'] = str(len(response.content))
         response['Content-Encoding'] = 'gzip'
-        response['Content-Length'] = str(len(response.content))
         return response
@@ -1,37 +1,133 @@
 import hashlib
+from django.conf import settings
 from django.template import Library, Node, TemplateSyntaxError, Variable, VariableDoesNotExist
 from django.template import resolve_variable
-from django.core.cache import cache
+from django.core.cache import cache, get_cache
 from django.utils.encoding import force_unicode
 from django.utils.http import urlquote
 
 register = Library()
 
-class CacheNode(Node):
-    def __init__(self, nodelist, expire_time_var, fragment_name, vary_on):
+# Caches used through the "using" argument, by alias, so that their
+# connections are reused across renders. Only the aliases of the CACHES
+# setting are accepted, so this doesn't grow any further.
+_fragment_caches = {}
+
+def make_fragment_key(fragment_name, vary_on):
+    "Builds a cache key for a template fragment and its vary-on values."
+    args = hashlib.md5(u':'.join([urlquote(var) for var in vary_on]))
+    return 'template.cache.%s.%s' % (fragment_name, args.hexdigest())
+
+class BaseCacheNode(Node):
+    def __init__(self, nodelist, expire_time_var, fragment_name, vary_on, cache_name=None):
         self.nodelist = nodelist
         self.expire_time_var = Variable(expire_time_var)
         self.fragment_name = fragment_name
         self.vary_on = vary_on
+        self.cache_name = cache_name
 
-    def render(self, context):
+    def get_expire_time(self, context):
         try:
             expire_time = self.expire_time_var.resolve(context)
         except VariableDoesNotExist:
-            raise TemplateSyntaxError('"cache" tag got an unknown variable: %r' % self.expire_time_var.var)
+            raise TemplateSyntaxError('"%s" tag got an unknown variable: %r' % (self.tag_name, self.expire_time_var.var))
         try:
-            expire_time = int(expire_time)
+            return int(expire_time)
         except (ValueError, TypeError):
-            raise TemplateSyntaxError('"cache" tag got a non-integer timeout value: %r' % expire_time)
+            raise TemplateSyntaxError('"%s" tag got a non-integer timeout value: %r' % (self.tag_name, expire_time))
+
+    def get_cache(self, context):
+        if self.cache_name is None:
+            return cache
+        alias = self.cache_name.resolve(context, True)
+        if alias not in settings.CACHES:
+            raise TemplateSyntaxError('"%s" tag got an unknown cache alias: %r' % (self.tag_name, alias))
+        if alias not in _fragment_caches:
+            _fragment_caches[alias] = get_cache(alias)
+        return _fragment_caches[alias]
+
+    def get_cache_key(self, context):
         # Build a unicode key for this fragment and all vary-on's.
-        args = hashlib.md5(u':'.join([urlquote(resolve_variable(var, context)) for var in self.vary_on]))
-        cache_key = 'template.cache.%s.%s' % (self.fragment_name, args.hexdigest())
-        value = cache.get(cache_key)
+        return make_fragment_key(self.fragment_name,
+                                 [resolve_variable(var, context) for var in self.vary_on])
+
+class CacheNode(BaseCacheNode):
+    tag_name = 'cache'
+
+    def render(self, context):
+        expire_time = self.get_expire_time(context)
+        fragment_cache = self.get_cache(context)
+        cache_key = self.get_cache_key(context)
+        value = fragment_cache.get(cache_key)
         if value is None:
             value = self.nodelist.render(context)
-            cache.set(cache_key, value, expire_time)
+            fragment_cache.set(cache_key, value, expire_time)
         return value
 
+class CacheManyNode(BaseCacheNode):
+    tag_name = 'cache_many'
+
+    def __init__(self, nodelist, expire_time_var, fragment_name, loopvar, sequence, vary_on, cache_name=None):
+        super(CacheManyNode, self).__init__(nodelist, expire_time_var, fragment_name, vary_on, cache_name)
+        self.loopvar, self.sequence = loopvar, sequence
+
+    def render(self, context):
+        expire_time = self.get_expire_time(context)
+        fragment_cache = self.get_cache(context)
+        try:
+            values = self.sequence.resolve(context, True)
+        except VariableDoesNotExist:
+            values = []
+        values = list(values or [])
+        len_values = len(values)
+
+        if 'forloop' in context:
+            parentloop = context['forloop']
+        else:
+            parentloop = {}
+        context.push()
+        try:
+            # The loop variable and forloop are set as {% for %} does.
+            loop_dict = context['forloop'] = {'parentloop': parentloop}
+            def set_item(i, item):
+                context[self.loopvar] = item
+                loop_dict['counter0'] = i
+                loop_dict['counter'] = i + 1
+                loop_dict['revcounter'] = len_values - i
+                loop_dict['revcounter0'] = len_values - i - 1
+                loop_dict['first'] = (i == 0)
+                loop_dict['last'] = (i == len_values - 1)
+
+            # Work out every fragment's key first, so they can all be fetched
+            # with a single get_many().
+            keys = []
+            for i, item in enumerate(values):
+                set_item(i, item)
+                keys.append(self.get_cache_key(context))
+            fragments = fragment_cache.get_many(keys)
+
+            rendered = {}
+            output = []
+            for i, (item, key) in enumerate(zip(values, keys)):
+                if key not in fragments:
+                    set_item(i, item)
+                    fragments[key] = rendered[key] = self.nodelist.render(context)
+                output.append(force_unicode(fragments[key]))
+        finally:
+            context.pop()
+        if rendered:
+            fragment_cache.set_many(rendered, expire_time)
+        return u''.join(output)
+
+def parse_using(parser, tokens):
+    """
+    Removes a trailing ``using="alias"`` argument from the tag's tokens,
+    returning the compiled alias, or None if there isn't one.
+    """
+    if len(tokens) > 1 and tokens[-1].startswith('using='):
+        return parser.compile_filter(tokens.pop()[len('using='):])
+    return None
+
 @register.tag('cache')
 def do_cache(parser, token):
     """
@@ -53,10 +149,46 @@ def do_cache(parser, token):
         {% endcache %}
 
     Each unique set of arguments will result in a unique cache entry.
+
+    The fragment is stored in the default cache, unless the last argument
+    names another one from the ``CACHES`` setting::
+
+        {% cache [expire_time] [fragment_name] [var1] .. using="alias" %}
     """
     nodelist = parser.parse(('endcache',))
     parser.delete_first_token()
     tokens = token.contents.split()
+    cache_name = parse_using(parser, tokens)
     if len(tokens) < 3:
         raise TemplateSyntaxError(u"'%r' tag requires at least 2 arguments." % tokens[0])
-    return CacheNode(nodelist, tokens[1], tokens[2], tokens[3:])
+    return CacheNode(nodelist, tokens[1], tokens[2], tokens[3:], cache_name)
+
+@register.tag('cache_many')
+def do_cache_many(parser, token):
+    """
+    Renders and caches a template fragment for each item of a sequence, as a
+    ``{% cache %}`` inside a ``{% for %}`` loop would, but fetches all the
+    cached fragments with a single query and stores all the ones that had to
+    be rendered at once.
+
+    Usage::
+
+        {% load cache %}
+        {% cache_many [expire_time] [fragment_name] for [var] in [sequence] [var1] [var2] .. %}
+            .. some expensive processing of var ..
+        {% endcache_many %}
+
+    The vary-on arguments are resolved with the loop variable set to each
+    item, so they will usually refer to it (e.g. ``item.pk``). As with
+    ``{% cache %}``, a final ``using="alias"`` argument selects the cache.
+    """
+    nodelist = parser.parse(('endcache_many',))
+    parser.delete_first_token()
+    tokens = token.contents.split()
+    cache_name = parse_using(parser, tokens)
+    if len(tokens) < 7 or tokens[3] != 'for' or tokens[5] != 'in':
+        raise TemplateSyntaxError(u"'%s' tag should use the format "
+                                  u"'%s expire_time fragment_name for var in sequence [var1] ..'"
+                                  % (tokens[0], tokens[0]))
+    sequence = parser.compile_filter(tokens[6])
+    return CacheManyNode(nodelist, tokens[1], tokens[2], tokens[4], sequence, tokens[7:], cache_name)
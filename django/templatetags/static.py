@@ -1,3 +1,5 @@
+from urlparse import urljoin
+
 from django import template
 from django.utils.encoding import iri_to_uri
 
@@ -82,3 +84,28 @@ def get_media_prefix(parser, token):
 
     """
     return PrefixNode.handle_token(parser, token, "MEDIA_URL")
+
+@register.simple_tag
+def static(path):
+    """
+    Returns the URL of the given static file.
+
+    With the staticfiles app installed, the URL is built by its storage
+    (``settings.STATICFILES_STORAGE``), e.g. pointing to a hashed copy of
+    the file. Otherwise the path is joined to ``settings.STATIC_URL``.
+
+    Usage::
+
+        {% static path %}
+
+    Examples::
+
+        {% static "css/base.css" %}
+        {% static variable_with_path %}
+
+    """
+    from django.conf import settings
+    if 'django.contrib.staticfiles' in settings.INSTALLED_APPS:
+        from django.contrib.staticfiles.storage import staticfiles_storage
+        return staticfiles_storage.url(path)
+    return urljoin(PrefixNode.handle_simple("STATIC_URL"), path)
@@ -1,4 +1,8 @@
+from __future__ import with_statement
+
+import os
 import unittest as real_unittest
+from optparse import make_option
 
 from django.conf import settings
 from django.core.exceptions import ImproperlyConfigured
@@ -185,6 +189,193 @@ def reorder_suite(suite, classes):
         bins[0].addTests(bins[i+1])
     return bins[0]
 
+def partition_suite_by_case(suite):
+    """
+    Partitions a test suite into lists of consecutive tests of the same
+    TestCase class.
+    """
+    groups = []
+    def add_tests(suite):
+        for test in suite:
+            if isinstance(test, unittest.TestSuite):
+                add_tests(test)
+            elif groups and type(groups[-1][0]) is type(test):
+                groups[-1].append(test)
+            else:
+                groups.append([test])
+    add_tests(suite)
+    return groups
+
+class RemoteTestResult(unittest.TestResult):
+    """
+    Records the outcome of the tests run in a worker process of a parallel
+    test run, so that it can be reported by the main process.
+
+    Tests are identified by their position in the list of tests given, and
+    errors are recorded as formatted tracebacks.
+    """
+    def __init__(self, tests, failfast=False):
+        super(RemoteTestResult, self).__init__()
+        self.failfast = failfast
+        self.positions = dict([(id(test), i) for i, test in enumerate(tests)])
+        self.events = []
+
+    def record(self, name, test, *args):
+        # Errors in class and module fixtures are reported against
+        # placeholders that aren't in the list; they're described instead.
+        self.events.append((name, self.positions.get(id(test), str(test)), args))
+
+    def startTest(self, test):
+        super(RemoteTestResult, self).startTest(test)
+        self.record('startTest', test)
+
+    def stopTest(self, test):
+        super(RemoteTestResult, self).stopTest(test)
+        self.record('stopTest', test)
+
+    def addSuccess(self, test):
+        super(RemoteTestResult, self).addSuccess(test)
+        self.record('addSuccess', test)
+
+    def addError(self, test, err):
+        super(RemoteTestResult, self).addError(test, err)
+        self.record('addError', test, self._exc_info_to_string(err, test))
+
+    def addFailure(self, test, err):
+        super(RemoteTestResult, self).addFailure(test, err)
+        self.record('addFailure', test, self._exc_info_to_string(err, test))
+
+    def addSkip(self, test, reason):
+        super(RemoteTestResult, self).addSkip(test, reason)
+        self.record('addSkip', test, reason)
+
+    def addExpectedFailure(self, test, err):
+        super(RemoteTestResult, self).addExpectedFailure(test, err)
+        self.record('addExpectedFailure', test, self._exc_info_to_string(err, test))
+
+    def addUnexpectedSuccess(self, test):
+        super(RemoteTestResult, self).addUnexpectedSuccess(test)
+        self.record('addUnexpectedSuccess', test)
+
+class ParallelTextTestResult(unittest.TextTestResult):
+    """
+    A TextTestResult that also accepts the tracebacks formatted by the
+    worker processes of a parallel test run in place of exc_info tuples.
+    """
+    def _exc_info_to_string(self, err, test):
+        if isinstance(err, basestring):
+            return err
+        return super(ParallelTextTestResult, self)._exc_info_to_string(err, test)
+
+class RemoteErrorHolder(object):
+    """
+    Stands for the class or module fixture that an error was reported
+    against in a worker process.
+    """
+    def __init__(self, description):
+        self.description = description
+
+    def id(self):
+        return self.description
+
+    def shortDescription(self):
+        return None
+
+    def __str__(self):
+        return self.description
+
+# The tests of the ParallelTestSuite being run, which the forked worker
+# processes inherit.
+_worker_subsuites = None
+
+def get_worker_cache_settings(params, number):
+    """
+    Returns a copy of the settings of a cache for the worker process
+    ``number`` of a parallel test run, so that the workers don't share
+    cached values: the keys get a prefix of their own, and local-memory and
+    file-based caches a location of their own.
+    """
+    params = params.copy()
+    prefix = params.get('KEY_PREFIX')
+    params['KEY_PREFIX'] = prefix and '%s_worker_%d' % (prefix, number) or 'worker_%d' % number
+    backend = params.get('BACKEND', '')
+    if backend.endswith('.locmem.LocMemCache'):
+        params['LOCATION'] = '%s_worker_%d' % (params.get('LOCATION', ''), number)
+    elif backend.endswith('.filebased.FileBasedCache'):
+        params['LOCATION'] = os.path.join(params['LOCATION'], 'worker_%d' % number)
+    return params
+
+def _init_worker(counter):
+    """
+    Switches the database connections of a worker process of a parallel
+    test run to the worker's own clone of the test databases, and the
+    caches to the worker's own keys.
+    """
+    from django.db import connections
+    with counter.get_lock():
+        counter.value += 1
+        number = counter.value
+    for alias in connections:
+        connection = connections[alias]
+        connection.settings_dict.update(connection.creation.get_test_db_clone_settings(number))
+    for alias, params in settings.CACHES.items():
+        settings.CACHES[alias] = get_worker_cache_settings(params, number)
+
+def _run_subsuite(args):
+    index, failfast = args
+    tests = _worker_subsuites[index]
+    result = RemoteTestResult(tests, failfast)
+    unittest.TestSuite(tests).run(result)
+    return index, result.events
+
+class ParallelTestSuite(unittest.TestSuite):
+    """
+    Runs the tests of a suite in a pool of worker processes and reports
+    their outcome to the result as they were run in this process. All the
+    tests of a TestCase class are run by the same worker, so that its class
+    fixtures are only set up once.
+
+    The workers are forked, which copies the tests and any in-memory
+    database into them. They then connect to their own clone of the test
+    databases, made by DjangoTestSuiteRunner.setup_databases(), and use
+    their own keys in the caches of the CACHES setting.
+    """
+    def __init__(self, suite, processes, failfast=False):
+        super(ParallelTestSuite, self).__init__([suite])
+        self.subsuites = partition_suite_by_case(suite)
+        self.processes = processes
+        self.failfast = failfast
+
+    def run(self, result):
+        global _worker_subsuites
+        import multiprocessing
+        from django.db import connections
+
+        # The workers must open connections of their own rather than share
+        # the ones of this process.
+        for connection in connections.all():
+            connection.close()
+        _worker_subsuites = self.subsuites
+        counter = multiprocessing.Value('i', 0)
+        pool = multiprocessing.Pool(self.processes, _init_worker, (counter,))
+        try:
+            jobs = [(index, self.failfast) for index in range(len(self.subsuites))]
+            for index, events in pool.imap_unordered(_run_subsuite, jobs):
+                tests = self.subsuites[index]
+                for name, position, args in events:
+                    if isinstance(position, int):
+                        test = tests[position]
+                    else:
+                        test = RemoteErrorHolder(position)
+                    getattr(result, name)(test, *args)
+                if result.shouldStop:
+                    break
+        finally:
+            pool.terminate()
+            pool.join()
+            _worker_subsuites = None
+        return result
+
 def dependency_ordered(test_databases, dependencies):
     """Reorder test_databases into an order that honors the dependencies
     described in TEST_DEPENDENCIES.
@@ -221,10 +412,22 @@ def dependency_ordered(test_databases, dependencies):
     return ordered_test_databases
 
 class DjangoTestSuiteRunner(object):
-    def __init__(self, verbosity=1, interactive=True, failfast=True, **kwargs):
+    option_list = (
+        make_option('--parallel', action='store', dest='parallel', type='int',
+            default=0, help='Runs the tests in this many worker processes, '
+                'each with its own clone of the test databases.'),
+        make_option('--keepdb', action='store_true', dest='keepdb', default=False,
+            help='Preserves the test databases between runs, and reuses them '
+                'while the models are unchanged.'),
+    )
+
+    def __init__(self, verbosity=1, interactive=True, failfast=True, parallel=0,
+                 keepdb=False, **kwargs):
         self.verbosity = verbosity
         self.interactive = interactive
         self.failfast = failfast
+        self.parallel = parallel
+        self.keepdb = keepdb
 
     def setup_test_environment(self, **kwargs):
         setup_test_environment()
@@ -251,9 +454,34 @@ class DjangoTestSuiteRunner(object):
 
         return reorder_suite(suite, (TestCase,))
 
+    def check_parallel(self):
+        """
+        Falls back to running the tests in this process, with a warning, if
+        they can't be run in parallel.
+        """
+        from django.db import connections
+        reason = None
+        try:
+            import multiprocessing
+        except ImportError:
+            reason = "the multiprocessing module isn't available"
+        if not hasattr(os, 'fork'):
+            reason = "worker processes can't be forked on this platform"
+        for alias in connections:
+            connection = connections[alias]
+            if (not connection.settings_dict['TEST_MIRROR'] and
+                    not connection.features.can_clone_databases):
+                reason = "the database backend of '%s' can't clone databases" % alias
+        if reason:
+            print "Running the tests serially, as %s." % reason
+            self.parallel = 0
+
     def setup_databases(self, **kwargs):
         from django.db import connections, DEFAULT_DB_ALIAS
 
+        if self.parallel > 1:
+            self.check_parallel()
+
         # First pass -- work out which databases actually need to be created,
         # and which ones are test mirrors or duplicate entries in DATABASES
         mirrored_aliases = {}
@@ -288,7 +516,9 @@ class DjangoTestSuiteRunner(object):
             # Actually create the database for the first connection
             connection = connections[aliases[0]]
             old_names.append((connection, db_name, True))
-            test_db_name = connection.creation.create_test_db(self.verbosity, autoclobber=not self.interactive)
+            test_db_name = connection.creation.create_test_db(self.verbosity,
+                autoclobber=not self.interactive, keepdb=self.keepdb)
+            self.clone_test_db(connection)
             for alias in aliases[1:]:
                 connection = connections[alias]
                 if db_name:
@@ -299,7 +529,9 @@ class DjangoTestSuiteRunner(object):
                     # the name isn't important -- e.g., SQLite, which uses :memory:.
                     # Force create the database instead of assuming it's a duplicate.
                     old_names.append((connection, db_name, True))
-                    connection.creation.create_test_db(self.verbosity, autoclobber=not self.interactive)
+                    connection.creation.create_test_db(self.verbosity,
+                        autoclobber=not self.interactive, keepdb=self.keepdb)
+                    self.clone_test_db(connection)
 
         for alias, mirror_alias in mirrored_aliases.items():
             mirrors.append((alias, connections[alias].settings_dict['NAME']))
@@ -307,7 +539,18 @@ class DjangoTestSuiteRunner(object):
 
         return old_names, mirrors
 
+    def clone_test_db(self, connection):
+        "Makes a clone of the test database for each worker process."
+        if self.parallel > 1:
+            for number in range(1, self.parallel + 1):
+                connection.creation.clone_test_db(number, self.verbosity,
+                                                  autoclobber=not self.interactive)
+
     def run_suite(self, suite, **kwargs):
+        if self.parallel > 1:
+            return unittest.TextTestRunner(verbosity=self.verbosity, failfast=self.failfast,
+                                           resultclass=ParallelTextTestResult).run(
+                ParallelTestSuite(suite, self.parallel, self.failfast))
         return unittest.TextTestRunner(verbosity=self.verbosity, failfast=self.failfast).run(suite)
 
     def teardown_databases(self, old_config, **kwargs):
@@ -319,7 +562,10 @@ class DjangoTestSuiteRunner(object):
         # Destroy all the non-mirror databases
         for connection, old_name, destroy in old_names:
             if destroy:
-                connection.creation.destroy_test_db(old_name, self.verbosity)
+                if self.parallel > 1:
+                    for number in range(1, self.parallel + 1):
+                        connection.creation.destroy_test_db_clone(number, self.verbosity)
+                connection.creation.destroy_test_db(old_name, self.verbosity, self.keepdb)
             else:
                 connection.settings_dict['NAME'] = old_name
 
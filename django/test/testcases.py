@@ -12,7 +12,8 @@ from django.core.management import call_command
 from django.core.signals import request_started
 from django.core.urlresolvers import clear_url_caches
 from django.db import (transaction, connection, connections, DEFAULT_DB_ALIAS,
-    reset_queries)
+    reset_queries, DatabaseError)
+from django.db.backends.util import TableWriteTracker, write_trackers
 from django.http import QueryDict
 from django.test import _doctest as doctest
 from django.test.client import Client
@@ -60,6 +61,120 @@ def restore_transaction_methods():
     transaction.leave_transaction_management = real_leave_transaction_management
     transaction.managed = real_managed
 
+class FixtureCache(object):
+    """
+    Keeps the fixtures of a TestCase class loaded between its tests, on
+    databases that support savepoints. The fixtures are loaded once in a
+    transaction, and every test is rolled back to a savepoint taken after
+    loading them instead of rolling back the whole transaction.
+    """
+    def __init__(self):
+        self.key = None
+        self.savepoints = {}
+        self.connections = {}
+
+    def store(self, key, databases):
+        """
+        Takes the savepoints for the fixtures that were just loaded into the
+        given databases for the test case identified by key.
+        """
+        self.key = key
+        for db in databases:
+            self.savepoints[db] = transaction.savepoint(using=db)
+            self.connections[db] = connections[db].connection
+
+    def rollback(self):
+        """
+        Undoes the changes made by a test, keeping the fixtures loaded. If a
+        connection was closed during the test, its fixtures were lost along
+        with the transaction, so the cache is cleared instead.
+        """
+        for db, sid in self.savepoints.items():
+            if connections[db].connection is not self.connections[db]:
+                return self.clear()
+        try:
+            for db, sid in self.savepoints.items():
+                transaction.savepoint_rollback(sid, using=db)
+        except DatabaseError:
+            self.clear()
+            raise
+
+    def clear(self):
+        """
+        Rolls back the transactions holding the cached fixtures.
+        """
+        for db in self.savepoints:
+            real_rollback(using=db)
+            real_leave_transaction_management(using=db)
+        self.key = None
+        self.savepoints = {}
+        self.connections = {}
+
+fixture_cache = FixtureCache()
+
+def tracked_aliases(db):
+    """
+    Returns the given database alias and the aliases that mirror it, whose
+    writes all end up in the same test database.
+    """
+    return [db] + [alias for alias in connections
+                   if connections[alias].settings_dict['TEST_MIRROR'] == db]
+
+def track_writes(db):
+    """
+    Starts recording the tables written to in the given database afresh.
+    """
+    for alias in tracked_aliases(db):
+        write_trackers.setdefault(alias, TableWriteTracker()).clear()
+
+def tables_to_flush(db):
+    """
+    Returns the Django tables of the given database that were written to since
+    track_writes() was called, along with the tables whose foreign keys point
+    to them. Returns None if those can't be told, in which case the whole
+    database needs flushing.
+    """
+    from django.db import models, router
+
+    written = set()
+    for alias in tracked_aliases(db):
+        tracker = write_trackers.get(alias)
+        if tracker is None or tracker.unknown:
+            return None
+        written.update(tracker.tables)
+    if not written:
+        return set()
+
+    qn = connections[db].ops.quote_name
+    known_tables = {}
+    flushable = set()
+    referencing = {}
+    for model in models.get_models(include_auto_created=True):
+        table = model._meta.db_table
+        # Table names appear quoted in the SQL, which changes their case and
+        # length on some backends.
+        for name in (table, qn(table).strip('`"[]')):
+            known_tables[name] = known_tables[name.lower()] = table
+        if model._meta.managed and router.allow_syncdb(db, model):
+            flushable.add(table)
+        for field in model._meta.local_fields:
+            if field.rel:
+                referencing.setdefault(field.rel.to._meta.db_table, set()).add(table)
+
+    pending = []
+    for name in written:
+        table = known_tables.get(name, known_tables.get(name.lower()))
+        if table is None:
+            return None
+        pending.append(table)
+    tables = set()
+    while pending:
+        table = pending.pop()
+        if table in flushable and table not in tables:
+            tables.add(table)
+            pending.extend(referencing.get(table, ()))
+    return tables
+
 class OutputChecker(doctest.OutputChecker):
     def check_output(self, want, got, optionflags):
         "The entry method for doctest output checking. Defers to a sequence of child checkers"
@@ -244,7 +359,7 @@ class TransactionTestCase(ut2.TestCase):
     def _pre_setup(self):
         """Performs any pre-test setup. This includes:
 
-            * Flushing the database.
+            * Flushing the tables written to by the previous tests.
             * If the Test Case class has a 'fixtures' member, installing the
               named fixtures.
             * If the Test Case class has a 'urls' member, replace the
@@ -256,14 +371,21 @@ class TransactionTestCase(ut2.TestCase):
         mail.outbox = []
 
     def _fixture_setup(self):
+        fixture_cache.clear()
+
         # If the test case has a multi_db=True flag, flush all databases.
-        # Otherwise, just flush default.
+        # Otherwise, just flush default. Only the tables written to since the
+        # previous flush are emptied, when they are known.
         if getattr(self, 'multi_db', False):
             databases = connections
         else:
             databases = [DEFAULT_DB_ALIAS]
         for db in databases:
-            call_command('flush', verbosity=0, interactive=False, database=db)
+            tables = tables_to_flush(db)
+            if tables is None or tables:
+                call_command('flush', verbosity=0, interactive=False, database=db,
+                             tables=tables)
+            track_writes(db)
 
             if hasattr(self, 'fixtures'):
                 # We have to use this slightly awkward syntax due to the fact
@@ -321,9 +443,12 @@ class TransactionTestCase(ut2.TestCase):
         # of tests (e.g., losing a timezone setting causing objects to
         # be created with the wrong time).
         # To make sure this doesn't happen, get a clean connection at the
-        # start of every test.
+        # start of every test. Connections holding the fixtures cached for the
+        # next test are kept: they are only rolled back to a savepoint taken
+        # after those statements.
         for connection in connections.all():
-            connection.close()
+            if connection.alias not in fixture_cache.savepoints:
+                connection.close()
 
     def _fixture_teardown(self):
         pass
@@ -562,6 +687,13 @@ class TestCase(TransactionTestCase):
     to use TransactionTestCase, if you need transaction management inside a test.
     """
 
+    @classmethod
+    def tearDownClass(cls):
+        fixture_cache.clear()
+
+    def _fixture_cache_key(self, databases):
+        return (self.__class__, tuple(getattr(self, 'fixtures', ())), tuple(databases))
+
     def _fixture_setup(self):
         if not connections_support_transactions():
             return super(TestCase, self)._fixture_setup()
@@ -573,12 +705,21 @@ class TestCase(TransactionTestCase):
         else:
             databases = [DEFAULT_DB_ALIAS]
 
+        from django.contrib.sites.models import Site
+
+        # The fixtures may still be loaded by the previous test of this class.
+        key = self._fixture_cache_key(databases)
+        if fixture_cache.key == key:
+            disable_transaction_methods()
+            Site.objects.clear_cache()
+            return
+        fixture_cache.clear()
+
         for db in databases:
             transaction.enter_transaction_management(using=db)
             transaction.managed(True, using=db)
         disable_transaction_methods()
 
-        from django.contrib.sites.models import Site
         Site.objects.clear_cache()
 
         for db in databases:
@@ -589,6 +730,10 @@ class TestCase(TransactionTestCase):
                                                             'database': db
                                                             })
 
+        if hasattr(self, 'fixtures') and all(
+                connections[db].features.uses_savepoints for db in databases):
+            fixture_cache.store(key, databases)
+
     def _fixture_teardown(self):
         if not connections_support_transactions():
             return super(TestCase, self)._fixture_teardown()
@@ -601,6 +746,9 @@ class TestCase(TransactionTestCase):
             databases = [DEFAULT_DB_ALIAS]
 
         restore_transaction_methods()
+        if fixture_cache.key == self._fixture_cache_key(databases):
+            fixture_cache.rollback()
+            return
         for db in databases:
             transaction.rollback(using=db)
             transaction.leave_transaction_management(using=db)
@@ -7,6 +7,7 @@ import warnings
 from django.conf import settings, UserSettingsHolder
 from django.core import mail
 from django.core.mail.backends import locmem
+from django.db.backends.util import write_trackers
 from django.test.signals import template_rendered, setting_changed
 from django.template import Template, loader, TemplateDoesNotExist
 from django.template.loaders import cached
@@ -89,6 +90,7 @@ def teardown_test_environment():
 
         - Restoring the original test renderer
         - Restoring the email sending functions
+        - Stopping the tracking of the tables written to in the databases
 
     """
     Template._render = Template.original_render
@@ -99,6 +101,8 @@ def teardown_test_environment():
 
     del mail.outbox
 
+    write_trackers.clear()
+
 
 def get_warnings_state():
     """
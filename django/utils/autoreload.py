@@ -28,7 +28,7 @@
 # OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
-import os, sys, time, signal
+import os, sys, time, signal, select, struct
 
 try:
     import thread
@@ -47,16 +47,121 @@ try:
 except ImportError:
     termios = None
 
+# inotify is called through ctypes, on the systems that have it (Linux).
+try:
+    import ctypes, ctypes.util
+    _libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+    _inotify_init = _libc.inotify_init
+    _inotify_add_watch = _libc.inotify_add_watch
+    _inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+    USE_INOTIFY = True
+except (ImportError, OSError, AttributeError, TypeError):
+    USE_INOTIFY = False
+
+# IN_MODIFY | IN_ATTRIB | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+_INOTIFY_MASK = 0x002 | 0x004 | 0x040 | 0x080 | 0x100 | 0x200
+# The wd, mask, cookie and len fields of struct inotify_event.
+_INOTIFY_EVENT = struct.Struct('iIII')
+
 RUN_RELOADER = True
 
 _mtimes = {}
 _win = (sys.platform == "win32")
+_locale_filenames = None
 
-def code_changed():
-    global _mtimes, _win
-    for filename in filter(lambda v: v, map(lambda m: getattr(m, "__file__", None), sys.modules.values())):
+def gen_filenames():
+    """
+    Yields the source files of the loaded modules, and the compiled
+    translation catalogs of Django, the project and its applications.
+    """
+    global _locale_filenames
+    for module in sys.modules.values():
+        filename = getattr(module, "__file__", None)
+        if not filename:
+            continue
         if filename.endswith(".pyc") or filename.endswith(".pyo"):
             filename = filename[:-1]
+        yield filename
+    if _locale_filenames is None:
+        # Translation catalogs aren't added at run time, so they're only
+        # looked for once.
+        _locale_filenames = []
+        for localedir in locale_paths():
+            for dirpath, dirnames, filenames in os.walk(localedir):
+                for filename in filenames:
+                    if filename.endswith(".mo"):
+                        _locale_filenames.append(os.path.join(dirpath, filename))
+    for filename in _locale_filenames:
+        yield filename
+
+def locale_paths():
+    """
+    Returns the directories translation catalogs are loaded from, in the
+    same places django.utils.translation looks for them.
+    """
+    from django.conf import settings
+    from django.utils.importlib import import_module
+    import django
+    paths = [os.path.join(os.path.dirname(django.__file__), 'conf', 'locale')]
+    project = sys.modules.get(settings.SETTINGS_MODULE)
+    if getattr(project, '__file__', None):
+        paths.append(os.path.join(os.path.dirname(project.__file__), 'locale'))
+    for appname in settings.INSTALLED_APPS:
+        app = import_module(appname)
+        paths.append(os.path.join(os.path.dirname(app.__file__), 'locale'))
+    paths.extend(settings.LOCALE_PATHS)
+    return [path for path in paths if os.path.isdir(path)]
+
+def inotify_code_changed():
+    """
+    Waits until one of the files returned by gen_filenames() changes, using
+    inotify to watch the directories they're in, and returns True. Returns
+    False if the reloader is stopped meanwhile.
+
+    Raises OSError if inotify can't be used, e.g. because the limit on the
+    number of watches is reached.
+    """
+    fd = _inotify_init()
+    if fd < 0:
+        raise OSError(ctypes.get_errno(), "inotify_init() failed")
+    try:
+        directories = {}
+        watched = set()
+        filenames = set()
+        module_count = None
+        while RUN_RELOADER:
+            # Watch the modules that were imported since the last check.
+            if len(sys.modules) != module_count:
+                module_count = len(sys.modules)
+                filenames = set([os.path.abspath(filename) for filename in gen_filenames()
+                                 if os.path.exists(filename)])
+                for dirname in set(map(os.path.dirname, filenames)):
+                    if dirname in watched:
+                        continue
+                    wd = _inotify_add_watch(fd, dirname, _INOTIFY_MASK)
+                    if wd < 0:
+                        raise OSError(ctypes.get_errno(),
+                                      "Can't watch %s with inotify" % dirname)
+                    directories[wd] = dirname
+                    watched.add(dirname)
+            if not select.select([fd], [], [], 1)[0]:
+                continue
+            data = os.read(fd, 64 * 1024)
+            offset = 0
+            while offset < len(data):
+                wd, mask, cookie, length = _INOTIFY_EVENT.unpack_from(data, offset)
+                offset += _INOTIFY_EVENT.size
+                name = data[offset:offset + length].rstrip('\0')
+                offset += length
+                if wd in directories and os.path.join(directories[wd], name) in filenames:
+                    return True
+        return False
+    finally:
+        os.close(fd)
+
+def code_changed():
+    global _mtimes, _win
+    for filename in gen_filenames():
         if not os.path.exists(filename):
             continue # File might be in an egg, so it can't be reloaded.
         stat = os.stat(filename)
@@ -88,6 +193,13 @@ def ensure_echo_on():
 
 def reloader_thread():
     ensure_echo_on()
+    if USE_INOTIFY:
+        try:
+            if inotify_code_changed():
+                sys.exit(3) # force reload
+            return
+        except OSError:
+            pass # Fall back to checking the modification times.
     while RUN_RELOADER:
         if code_changed():
             sys.exit(3) # force reload
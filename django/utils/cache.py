@@ -101,8 +101,11 @@ def patch_response_headers(response, cache_timeout=None):
         cache_timeout = settings.CACHE_MIDDLEWARE_SECONDS
     if cache_timeout < 0:
         cache_timeout = 0 # Can't have max-age negative
-    if settings.USE_ETAGS and not response.has_header('ETag'):
-        response['ETag'] = '"%s"' % hashlib.md5(response.content).hexdigest()
+    if settings.USE_ETAGS and not response.has_header('ETag') and not response.streaming:
+        md5 = hashlib.md5()
+        for chunk in response.streaming_content:
+            md5.update(chunk)
+        response['ETag'] = '"%s"' % md5.hexdigest()
     if not response.has_header('Last-Modified'):
         response['Last-Modified'] = http_date()
     if not response.has_header('Expires'):
@@ -1,4 +1,5 @@
 import re
+import zlib
 from django.utils.encoding import force_unicode
 from django.utils.functional import allow_lazy
 from django.utils.translation import ugettext_lazy, ugettext as _
@@ -187,6 +188,20 @@ def compress_string(s):
     zfile.close()
     return zbuf.getvalue()
 
+def compress_sequence(sequence):
+    """
+    Compresses a sequence of strings into gzip data, yielding it as the strings
+    are consumed rather than joining them in memory. Each string is flushed, so
+    that the client receives what has been produced so far.
+    """
+    # A window size above 16 makes zlib write a gzip header and trailer.
+    zobj = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for item in sequence:
+        data = zobj.compress(item) + zobj.flush(zlib.Z_SYNC_FLUSH)
+        if data:
+            yield data
+    yield zobj.flush()
+
 ustring_re = re.compile(u"([\u0080-\uffff])")
 
 def javascript_quote(s, quote_double_quotes=False):
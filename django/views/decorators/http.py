@@ -2,6 +2,7 @@
 Decorators for views based on HTTP headers.
 """
 
+import hashlib
 from calendar import timegm
 from datetime import timedelta
 from functools import wraps
@@ -74,6 +75,21 @@ def condition(etag_func=None, last_modified_func=None):
     plus If-modified-since headers) will result in the view function being
     called.
     """
+    def validators_func(request, *args, **kwargs):
+        res_etag = res_last_modified = None
+        if etag_func:
+            res_etag = etag_func(request, *args, **kwargs)
+        if last_modified_func:
+            res_last_modified = last_modified_func(request, *args, **kwargs)
+        return res_etag, res_last_modified
+    return _condition(validators_func)
+
+def _condition(validators_func):
+    """
+    Builds the decorator of condition(), given a callable taking the view's
+    arguments and returning the ETag and the last modified time of the
+    requested resource.
+    """
     def decorator(func):
         def inner(request, *args, **kwargs):
             # Get HTTP request headers
@@ -96,16 +112,9 @@ def condition(etag_func=None, last_modified_func=None):
                     if_match = None
 
             # Compute values (if any) for the requested resource.
-            if etag_func:
-                res_etag = etag_func(request, *args, **kwargs)
-            else:
-                res_etag = None
-            if last_modified_func:
-                dt = last_modified_func(request, *args, **kwargs)
-                if dt:
-                    res_last_modified = timegm(dt.utctimetuple())
-                else:
-                    res_last_modified = None
+            res_etag, dt = validators_func(request, *args, **kwargs)
+            if dt:
+                res_last_modified = timegm(dt.utctimetuple())
             else:
                 res_last_modified = None
 
@@ -164,3 +173,37 @@ def etag(etag_func):
 def last_modified(last_modified_func):
     return condition(last_modified_func=last_modified_func)
 
+
+def queryset_condition(queryset, field='updated_at'):
+    """
+    Decorator to support conditional retrieval for a view showing the objects
+    of a queryset, answering with a 304 response before the view renders
+    anything when none of the objects has changed.
+
+    ``queryset`` is a QuerySet, Manager or model, or a callable taking the
+    same parameters as the view and returning one (e.g. to select the object
+    of a detail view). ``field`` names a DateTimeField set whenever an object
+    is saved, e.g. with ``auto_now=True``. A single aggregate query fetches its
+    most recent value, sent as the Last-Modified time, and the number of
+    objects, which goes into the ETag along with it so that deletions are
+    noticed. If there are no objects, the view is always called.
+    """
+    def validators_func(request, *args, **kwargs):
+        from django.db.models import Count, Max
+        from django.db.models.base import ModelBase
+        qs = queryset
+        if callable(qs) and not isinstance(qs, ModelBase):
+            qs = qs(request, *args, **kwargs)
+        if isinstance(qs, ModelBase):
+            qs = qs._default_manager.all()
+        else:
+            # A Manager or a QuerySet.
+            qs = qs.all()
+        result = qs.aggregate(latest=Max(field), count=Count('pk'))
+        if not result['count']:
+            return None, None
+        latest = result['latest']
+        res_etag = hashlib.md5('%d:%s' % (result['count'],
+                               latest and latest.isoformat())).hexdigest()
+        return res_etag, latest
+    return _condition(validators_func)
@@ -2,8 +2,6 @@
 Views and functions for serving static files. These are only to be used
 during development, and SHOULD NOT be used in a production setting.
 """
-from __future__ import with_statement
-
 import mimetypes
 import os
 import stat
@@ -11,9 +9,10 @@ import posixpath
 import re
 import urllib
 
-from django.http import Http404, HttpResponse, HttpResponseRedirect, HttpResponseNotModified
+from django.http import (Http404, HttpResponse, HttpResponseRedirect,
+    HttpResponseNotModified, FileResponse)
 from django.template import loader, Template, Context, TemplateDoesNotExist
-from django.utils.http import http_date, parse_http_date
+from django.utils.http import http_date, parse_http_date, parse_etags, quote_etag
 
 def serve(request, path, document_root=None, show_indexes=False):
     """
@@ -51,20 +50,26 @@ def serve(request, path, document_root=None, show_indexes=False):
         raise Http404("Directory indexes are not allowed here.")
     if not os.path.exists(fullpath):
         raise Http404('"%s" does not exist' % fullpath)
-    # Respect the If-Modified-Since header.
+    # Respect the If-None-Match and If-Modified-Since headers. The ETag is
+    # derived from the file's modification time and size, so that it's known
+    # without reading the file.
     statobj = os.stat(fullpath)
     mimetype, encoding = mimetypes.guess_type(fullpath)
     mimetype = mimetype or 'application/octet-stream'
+    etag = '%x-%x' % (int(statobj.st_mtime), statobj.st_size)
     if not was_modified_since(request.META.get('HTTP_IF_MODIFIED_SINCE'),
-                              statobj.st_mtime, statobj.st_size):
+                              statobj.st_mtime, statobj.st_size,
+                              request.META.get('HTTP_IF_NONE_MATCH'), etag):
         return HttpResponseNotModified(mimetype=mimetype)
-    with open(fullpath, 'rb') as f:
-        response = HttpResponse(f.read(), mimetype=mimetype)
-    response["Last-Modified"] = http_date(statobj.st_mtime)
+    size = None
     if stat.S_ISREG(statobj.st_mode):
-        response["Content-Length"] = statobj.st_size
+        size = statobj.st_size
+    response = FileResponse(open(fullpath, 'rb'), mimetype=mimetype, size=size)
+    response["Last-Modified"] = http_date(statobj.st_mtime)
+    response["ETag"] = quote_etag(etag)
     if encoding:
         response["Content-Encoding"] = encoding
+    response.set_range(request)
     return response
 
 
@@ -109,7 +114,7 @@ def directory_index(path, fullpath):
     })
     return HttpResponse(t.render(c))
 
-def was_modified_since(header=None, mtime=0, size=0):
+def was_modified_since(header=None, mtime=0, size=0, etag_header=None, etag=None):
     """
     Was something modified since the user last downloaded it?
 
@@ -122,7 +127,20 @@ def was_modified_since(header=None, mtime=0, size=0):
 
     size
       This is the size of the item we're talking about.
+
+    etag_header
+      This is the value of the If-None-Match header. If it's given, it takes
+      precedence over the If-Modified-Since header.
+
+    etag
+      This is the unquoted ETag of the item we're talking about.
     """
+    if etag_header is not None and etag is not None:
+        try:
+            etags = parse_etags(etag_header)
+        except ValueError:
+            return True
+        return etag not in etags and '*' not in etags
     try:
         if header is None:
             raise ValueError
@@ -1,14 +1,29 @@
+import gzip
+import os
+import shutil
 import StringIO
 import sys
+import tempfile
 
 from django.conf import settings
 from django.contrib.sites.models import Site
 from django.core import management
-from django.db import DEFAULT_DB_ALIAS
+from django.core.management.parallel import can_use_processes, dependency_levels
+from django.core.management.commands.loaddata import fixture_model
+from django.db import connection, DEFAULT_DB_ALIAS
 from django.test import TestCase, TransactionTestCase, skipUnlessDBFeature
+from django.utils import unittest
 
 from models import Article, Blog, Book, Category, Person, Spy, Tag, Visa
 
+# The --parallel tests require multiprocessing, which might not be available.
+try:
+    import multiprocessing
+except ImportError:
+    multiprocessing = None
+requires_multiprocessing = unittest.skipUnless(multiprocessing,
+                                               'requires multiprocessing')
+
 
 class TestCaseFixtureLoadingTests(TestCase):
     fixtures = ['fixture1.json', 'fixture2.json']
@@ -23,6 +38,30 @@ class TestCaseFixtureLoadingTests(TestCase):
             '<Article: Python program becomes self aware>'
         ])
 
+class TestCaseFixtureIsolationTests(TestCase):
+    fixtures = ['fixture1.json', 'fixture2.json']
+
+    def test_1_change_fixtures(self):
+        Article.objects.filter(headline__startswith='Poker').delete()
+        Article.objects.create(headline='Added by a test', pub_date='2006-06-16 15:00:00')
+        self.assertEqual(Article.objects.count(), 4)
+
+    def test_2_fixtures_restored(self):
+        "Changes made by a test are undone before the next one, even if the fixtures are kept loaded"
+        self.assertQuerysetEqual(Article.objects.all(), [
+            '<Article: Django conquers world!>',
+            '<Article: Copyright is fine the way it is>',
+            '<Article: Poker has no place on ESPN>',
+            '<Article: Python program becomes self aware>'
+        ])
+
+    @skipUnlessDBFeature('uses_savepoints')
+    def test_3_fixtures_cached(self):
+        "On databases with savepoints, the fixtures are loaded once for the whole class"
+        from django.test.testcases import fixture_cache
+        self.assertEqual(fixture_cache.key[0], self.__class__)
+        self.assertEqual(fixture_cache.savepoints.keys(), [DEFAULT_DB_ALIAS])
+
 class FixtureLoadingTests(TestCase):
 
     def _dumpdata_assert(self, args, output, format='json', natural_keys=False,
@@ -213,6 +252,76 @@ class FixtureLoadingTests(TestCase):
         # even those normally filtered by the manager
         self._dumpdata_assert(['fixtures.Spy'], '[{"pk": %d, "model": "fixtures.spy", "fields": {"cover_blown": true}}, {"pk": %d, "model": "fixtures.spy", "fields": {"cover_blown": false}}]' % (spy2.pk, spy1.pk), use_base_manager=True)
 
+    def test_dumpdata_output_files(self):
+        management.call_command('loaddata', 'fixture1.json', verbosity=0, commit=False)
+        output = '[{"pk": 1, "model": "fixtures.category", "fields": {"description": "Latest news stories", "title": "News Stories"}}, {"pk": 3, "model": "fixtures.article", "fields": {"headline": "Time to reform copyright", "pub_date": "2006-06-16 13:00:00"}}]'
+        Article.objects.exclude(pk=3).delete()
+        tmpdir = tempfile.mkdtemp()
+        try:
+            # A single file, compressed or not.
+            filename = os.path.join(tmpdir, 'dump.json')
+            management.call_command('dumpdata', 'fixtures.Category',
+                                    'fixtures.Article', output=filename)
+            self.assertEqual(open(filename).read(), output)
+            management.call_command('dumpdata', 'fixtures.Category',
+                                    'fixtures.Article', output=filename + '.gz',
+                                    gzip=True)
+            self.assertEqual(gzip.open(filename + '.gz').read(), output)
+
+            # A file per model, named after it; models without objects are
+            # left out.
+            outdir = os.path.join(tmpdir, 'models')
+            os.mkdir(outdir)
+            management.call_command('dumpdata', 'fixtures', output_dir=outdir,
+                                    gzip=True)
+            self.assertEqual(sorted(os.listdir(outdir)),
+                             ['fixtures.article.json.gz', 'fixtures.category.json.gz'])
+
+            # The files can be loaded back.
+            Article.objects.all().delete()
+            Category.objects.all().delete()
+            management.call_command('loaddata',
+                                    os.path.join(outdir, 'fixtures.category.json.gz'),
+                                    os.path.join(outdir, 'fixtures.article.json.gz'),
+                                    verbosity=0, commit=False, parallel=2)
+            self._dumpdata_assert(['fixtures.Category', 'fixtures.Article'], output)
+        finally:
+            shutil.rmtree(tmpdir)
+
+    def test_parallel_loading_order(self):
+        self.assertEqual(dependency_levels([Book, Visa, Person, Spy, Article, Blog, Category]),
+                         [[Person, Article, Category], [Book, Visa, Spy, Blog]])
+        self.assertEqual(fixture_model('fixtures.article.json.gz', 'default'), Article)
+        self.assertEqual(fixture_model('/tmp/fixtures.person.default.xml', 'default'), Person)
+        self.assertEqual(fixture_model('fixture1.json', 'default'), None)
+        self.assertEqual(fixture_model('fixtures.nonexistent.json', 'default'), None)
+
+    def test_loading_in_batches(self):
+        management.call_command('loaddata', 'fixture1.json', 'fixture6.json',
+                                'fixture8.json', verbosity=0, batch_size=2, commit=False)
+        self.assertQuerysetEqual(Article.objects.all(), [
+            '<Article: Time to reform copyright>',
+            '<Article: Poker has no place on ESPN>',
+            '<Article: Python program becomes self aware>'
+        ])
+        self.assertQuerysetEqual(Visa.objects.all(), [
+            '<Visa: Django Reinhardt Can add user, Can change user, Can delete user>',
+            '<Visa: Stephane Grappelli Can add user>',
+            '<Visa: Prince >'
+        ])
+
+        # Objects that are already in the database are updated.
+        management.call_command('loaddata', 'fixture9.xml', verbosity=0,
+                                batch_size=2, commit=False)
+        self.assertQuerysetEqual(Visa.objects.all(), [
+            '<Visa: Django Reinhardt Can add user, Can change user, Can delete user>',
+            '<Visa: Stephane Grappelli Can add user, Can delete user>',
+            '<Visa: Artist formerly known as "Prince" Can change user>'
+        ])
+        self.assertQuerysetEqual(Book.objects.all(), [
+            '<Book: Music for all ages by Artist formerly known as "Prince" and Django Reinhardt>'
+        ])
+
     def test_compress_format_loading(self):
         # Load fixture 4 (compressed), using format specification
         management.call_command('loaddata', 'fixture4.json', verbosity=0, commit=False)
@@ -338,3 +447,79 @@ class FixtureTransactionTests(TransactionTestCase):
             '<Article: Poker has no place on ESPN>',
             '<Article: Python program becomes self aware>'
         ])
+
+
+class ParallelFixtureTests(TransactionTestCase):
+    """
+    Dumps and loads fixtures with --parallel, in worker processes that
+    connect to the test database and commit their own transactions.
+    """
+    def setUp(self):
+        if not can_use_processes(connection):
+            raise unittest.SkipTest("Worker processes can't connect to an "
+                                    "in-memory database")
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def write_fixture(self, name, content):
+        f = open(os.path.join(self.tmpdir, name), 'w')
+        try:
+            f.write(content)
+        finally:
+            f.close()
+        return os.path.join(self.tmpdir, name)
+
+    @requires_multiprocessing
+    def test_dumpdata(self):
+        Category.objects.create(pk=1, title='News Stories', description='Latest news stories')
+        Article.objects.create(pk=3, headline='Time to reform copyright', pub_date='2006-06-16 13:00:00')
+        management.call_command('dumpdata', 'fixtures', output_dir=self.tmpdir,
+                                parallel=2)
+        self.assertEqual(sorted(os.listdir(self.tmpdir)),
+                         ['fixtures.article.json', 'fixtures.category.json'])
+        self.assertEqual(open(os.path.join(self.tmpdir, 'fixtures.category.json')).read(),
+                         '[{"pk": 1, "model": "fixtures.category", "fields": {"description": "Latest news stories", "title": "News Stories"}}]')
+        self.assertEqual(open(os.path.join(self.tmpdir, 'fixtures.article.json')).read(),
+                         '[{"pk": 3, "model": "fixtures.article", "fields": {"headline": "Time to reform copyright", "pub_date": "2006-06-16 13:00:00"}}, {"pk": 1, "model": "fixtures.article", "fields": {"headline": "Python program becomes self aware", "pub_date": "2006-06-16 11:00:00"}}]')
+
+    @requires_multiprocessing
+    @unittest.skipIf(connection.vendor == 'sqlite',
+                     "loaddata doesn't use worker processes with SQLite")
+    def test_loaddata(self):
+        category = self.write_fixture('fixtures.category.json',
+            '[{"pk": 1, "model": "fixtures.category", "fields": {"description": "Latest news stories", "title": "News Stories"}}]')
+        article = self.write_fixture('fixtures.article.json',
+            '[{"pk": 3, "model": "fixtures.article", "fields": {"headline": "Time to reform copyright", "pub_date": "2006-06-16 13:00:00"}}]')
+        blog = self.write_fixture('fixtures.blog.json',
+            '[{"pk": 1, "model": "fixtures.blog", "fields": {"name": "Django", "featured": 3, "articles": [3]}}]')
+        management.call_command('loaddata', category, article, blog,
+                                verbosity=0, parallel=2)
+        self.assertQuerysetEqual(Category.objects.all(), ['<Category: News Stories>'])
+        self.assertQuerysetEqual(Article.objects.all(), [
+            '<Article: Time to reform copyright>',
+            '<Article: Python program becomes self aware>'
+        ])
+        self.assertEqual(Blog.objects.get().featured.pk, 3)
+
+    @requires_multiprocessing
+    @unittest.skipIf(connection.vendor == 'sqlite',
+                     "loaddata doesn't use worker processes with SQLite")
+    def test_loaddata_error(self):
+        # A failing worker raises CommandError (turned into SystemExit by
+        # call_command()) and rolls its fixtures back, but the levels loaded
+        # before it stay in the database.
+        article = self.write_fixture('fixtures.article.json',
+            '[{"pk": 3, "model": "fixtures.article", "fields": {"headline": "Time to reform copyright", "pub_date": "2006-06-16 13:00:00"}}]')
+        blog = self.write_fixture('fixtures.blog.json',
+            '[{"pk": 1, "model": "fixtures.blog", "fields": {"name": "Django", "featured": 3')
+        new_io = StringIO.StringIO()
+        self.assertRaises(SystemExit, management.call_command, 'loaddata',
+                          article, blog, verbosity=0, parallel=2, stderr=new_io)
+        self.assertTrue('Problem installing fixture' in new_io.getvalue())
+        self.assertQuerysetEqual(Article.objects.all(), [
+            '<Article: Time to reform copyright>',
+            '<Article: Python program becomes self aware>'
+        ])
+        self.assertEqual(Blog.objects.count(), 0)
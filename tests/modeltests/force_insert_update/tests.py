@@ -36,3 +36,22 @@ class ForceTests(TestCase):
         # the data isn't in the database already.
         obj = WithCustomPK(name=1, value=1)
         self.assertRaises(DatabaseError, obj.save, force_update=True)
+
+    def test_save_queries(self):
+        # Saving an existing object only issues an UPDATE.
+        c = Counter.objects.create(name="one", value=1)
+        c.value = 2
+        self.assertNumQueries(1, c.save)
+        self.assertEqual(Counter.objects.get(pk=c.pk).value, 2)
+
+        # A new object with its primary key set is inserted once the UPDATE
+        # has matched no rows.
+        obj = WithCustomPK(name=1, value=1)
+        self.assertNumQueries(2, obj.save)
+        obj.value = 2
+        self.assertNumQueries(1, obj.save)
+        self.assertEqual(WithCustomPK.objects.get(pk=1).value, 2)
+
+        # Forcing an insert skips the UPDATE.
+        obj = WithCustomPK(name=2, value=1)
+        self.assertNumQueries(1, obj.save, force_insert=True)
@@ -19,3 +19,22 @@ class Person(models.Model):
 class ManualPrimaryKeyTest(models.Model):
     id = models.IntegerField(primary_key=True)
     data = models.CharField(max_length=100)
+
+class Tag(models.Model):
+    name = models.CharField(max_length=50, unique=True)
+    uses = models.IntegerField(default=0)
+    description = models.CharField(max_length=100, blank=True)
+
+class DailyCount(models.Model):
+    name = models.CharField(max_length=50)
+    day = models.DateField()
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = ('name', 'day')
+
+class Page(models.Model):
+    slug = models.CharField(max_length=50, unique=True)
+    views = models.IntegerField(default=0)
+    created = models.DateTimeField(auto_now_add=True)
+    modified = models.DateTimeField(auto_now=True)
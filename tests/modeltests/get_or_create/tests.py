@@ -1,9 +1,11 @@
-from datetime import date
+from __future__ import with_statement
 
-from django.db import IntegrityError
-from django.test import TestCase
+from datetime import date, datetime
 
-from models import Person, ManualPrimaryKeyTest
+from django.db import connection, IntegrityError
+from django.test import TestCase, skipUnlessDBFeature
+
+from models import Person, ManualPrimaryKeyTest, Tag, DailyCount, Page
 
 
 class GetOrCreateTests(TestCase):
@@ -50,3 +52,113 @@ class GetOrCreateTests(TestCase):
             ManualPrimaryKeyTest.objects.get_or_create, id=1, data="Different"
         )
         self.assertEqual(ManualPrimaryKeyTest.objects.get(id=1).data, "Original")
+
+
+class UpdateOrCreateTests(TestCase):
+    def test_update_or_create(self):
+        p, created = Person.objects.update_or_create(
+            first_name='John', last_name='Lennon', defaults={
+                'birthday': date(1940, 10, 10)
+            }
+        )
+        self.assertTrue(created)
+        self.assertEqual(p.birthday, date(1940, 10, 10))
+
+        p, created = Person.objects.update_or_create(
+            first_name='John', last_name='Lennon', defaults={
+                'birthday': date(1940, 10, 9)
+            }
+        )
+        self.assertFalse(created)
+        self.assertEqual(p.birthday, date(1940, 10, 9))
+        self.assertEqual(Person.objects.count(), 1)
+        self.assertEqual(Person.objects.get().birthday, date(1940, 10, 9))
+
+    def test_update_or_create_locks(self):
+        Person.objects.create(first_name='John', last_name='Lennon',
+                              birthday=date(1940, 10, 9))
+        with self.assertNumQueries(2):
+            Person.objects.update_or_create(first_name='John', last_name='Lennon',
+                                            defaults={'birthday': date(1940, 10, 10)})
+            select = connection.queries[-2]['sql']
+        if connection.features.has_select_for_update:
+            self.assertTrue('FOR UPDATE' in select)
+
+    def test_update_or_create_no_defaults(self):
+        ManualPrimaryKeyTest.objects.create(id=1, data="Original")
+        with self.assertNumQueries(1):
+            m, created = ManualPrimaryKeyTest.objects.update_or_create(id=1)
+        self.assertFalse(created)
+        self.assertEqual(m.data, "Original")
+
+
+class UpsertTests(TestCase):
+    def check_upsert(self):
+        Tag.objects.upsert(name='django', defaults={'uses': 1})
+        self.assertEqual(Tag.objects.get(name='django').uses, 1)
+
+        Tag.objects.create(name='python', uses=5, description='A language')
+        Tag.objects.upsert(name='python', defaults={'uses': 6})
+        tag = Tag.objects.get(name='python')
+        self.assertEqual(tag.uses, 6)
+        # Only the defaults are updated.
+        self.assertEqual(tag.description, 'A language')
+
+        # Without defaults, an existing row is left alone.
+        Tag.objects.upsert(name='python')
+        Tag.objects.upsert(name='ruby')
+        self.assertEqual(Tag.objects.get(name='python').uses, 6)
+        self.assertEqual(Tag.objects.get(name='ruby').uses, 0)
+        self.assertEqual(Tag.objects.count(), 3)
+
+        # unique_together constraints can be used.
+        today = date(2011, 9, 1)
+        DailyCount.objects.upsert(name='hits', day=today, defaults={'count': 3})
+        DailyCount.objects.upsert(name='hits', day=today, defaults={'count': 4})
+        self.assertEqual(DailyCount.objects.get().count, 4)
+
+        # And so can primary keys.
+        ManualPrimaryKeyTest.objects.upsert(id=1, defaults={'data': 'Original'})
+        ManualPrimaryKeyTest.objects.upsert(id=1, defaults={'data': 'Different'})
+        self.assertEqual(ManualPrimaryKeyTest.objects.get(id=1).data, 'Different')
+
+        # Updates set auto_now fields but leave auto_now_add fields alone.
+        past = datetime(2000, 1, 1)
+        Page.objects.upsert(slug='home', defaults={'views': 1})
+        Page.objects.update(created=past, modified=past)
+        Page.objects.upsert(slug='home')
+        self.assertEqual(Page.objects.get().modified, past)
+        Page.objects.upsert(slug='home', defaults={'views': 2, 'created': datetime.now()})
+        page = Page.objects.get()
+        self.assertEqual(page.views, 2)
+        self.assertEqual(page.created, past)
+        self.assertTrue(page.modified > past)
+
+    def test_upsert(self):
+        self.check_upsert()
+
+    def test_upsert_fallback(self):
+        # supports_upsert may be a read-only property, so it's overridden
+        # in a subclass of the backend's DatabaseFeatures.
+        features_class = connection.features.__class__
+        connection.features.__class__ = type('DatabaseFeatures',
+            (features_class,), {'supports_upsert': False})
+        try:
+            self.check_upsert()
+        finally:
+            connection.features.__class__ = features_class
+
+    @skipUnlessDBFeature('supports_upsert')
+    def test_upsert_queries(self):
+        Tag.objects.create(name='python', uses=5)
+        with self.assertNumQueries(1):
+            Tag.objects.upsert(name='python', defaults={'uses': 6})
+        with self.assertNumQueries(1):
+            Tag.objects.upsert(name='django', defaults={'uses': 1})
+
+    def test_upsert_errors(self):
+        # The arguments must match a unique constraint.
+        self.assertRaises(ValueError, Tag.objects.upsert, uses=1)
+        self.assertRaises(ValueError, DailyCount.objects.upsert, name='hits')
+        self.assertRaises(TypeError, Tag.objects.upsert, name='django',
+                          defaults={'missing': 1})
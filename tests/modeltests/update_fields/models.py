@@ -0,0 +1,54 @@
+from django.db import models
+
+
+class Person(models.Model):
+    name = models.CharField(max_length=20)
+    bio = models.TextField(blank=True)
+    employer = models.ForeignKey('Employer', null=True, blank=True)
+
+    def __unicode__(self):
+        return self.name
+
+
+class Employee(Person):
+    salary = models.IntegerField(default=0)
+
+
+class Employer(models.Model):
+    name = models.CharField(max_length=20)
+
+
+class TrackedPerson(models.Model):
+    name = models.CharField(max_length=20)
+    bio = models.TextField(blank=True)
+    last_seen = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        track_changes = True
+
+    def __unicode__(self):
+        return self.name
+
+
+class TrackedEmployee(TrackedPerson):
+    salary = models.IntegerField(default=0)
+
+
+class ListField(models.TextField):
+    "A field storing a list of strings as comma-separated text."
+    __metaclass__ = models.SubfieldBase
+
+    def to_python(self, value):
+        if isinstance(value, list):
+            return value
+        return value and value.split(',') or []
+
+    def get_prep_value(self, value):
+        return ','.join(value)
+
+
+class TrackedTags(models.Model):
+    tags = ListField(blank=True)
+
+    class Meta:
+        track_changes = True
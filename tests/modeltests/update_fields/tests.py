@@ -0,0 +1,202 @@
+from __future__ import with_statement
+
+from django.db import connection, DatabaseError
+from django.db.models.signals import pre_save, post_save
+from django.test import TestCase
+
+from models import (Person, Employee, Employer, TrackedPerson, TrackedEmployee,
+    TrackedTags)
+
+
+class UpdateFieldsTests(TestCase):
+    def test_update_fields(self):
+        p = Person.objects.create(name="Sara", bio="Long biography")
+        p.name = "Sarah"
+        p.bio = "Changed"
+        p.save(update_fields=['name'])
+
+        p = Person.objects.get(pk=p.pk)
+        self.assertEqual(p.name, "Sarah")
+        self.assertEqual(p.bio, "Long biography")
+
+    def test_update_fields_sql(self):
+        p = Person.objects.create(name="Sara", bio="Long biography")
+        with self.assertNumQueries(1):
+            p.save(update_fields=['name'])
+        sql = connection.queries[-1]['sql'].lower()
+        self.assertTrue('"name"' in sql or '`name`' in sql)
+        self.assertFalse('bio' in sql)
+
+    def test_update_fields_attname(self):
+        e = Employer.objects.create(name="Acme")
+        p = Person.objects.create(name="Sara")
+        p.employer = e
+        p.save(update_fields=['employer_id'])
+        self.assertEqual(Person.objects.get(pk=p.pk).employer, e)
+
+    def test_empty_update_fields(self):
+        p = Person.objects.create(name="Sara")
+        p.name = "Sarah"
+        with self.assertNumQueries(0):
+            p.save(update_fields=[])
+        self.assertEqual(Person.objects.get(pk=p.pk).name, "Sara")
+
+    def test_invalid_update_fields(self):
+        p = Person.objects.create(name="Sara")
+        self.assertRaises(ValueError, p.save, update_fields=['missing'])
+        self.assertRaises(ValueError, p.save, update_fields=['id'])
+        self.assertRaises(ValueError, p.save, update_fields=['name'],
+                          force_insert=True)
+
+    def test_update_fields_unsaved(self):
+        self.assertRaises(ValueError, Person(name="Sara").save,
+                          update_fields=['name'])
+        self.assertRaises(DatabaseError, Person(pk=1000, name="Sara").save,
+                          update_fields=['name'])
+        self.assertEqual(Person.objects.count(), 0)
+
+    def test_update_fields_inheritance(self):
+        e = Employee.objects.create(name="Sara", salary=100)
+        e.name = "Sarah"
+        e.salary = 200
+        # Only the parent's table has a field to update.
+        with self.assertNumQueries(1):
+            e.save(update_fields=['name'])
+        e = Employee.objects.get(pk=e.pk)
+        self.assertEqual(e.name, "Sarah")
+        self.assertEqual(e.salary, 100)
+
+        e.salary = 200
+        e.save(update_fields=['salary'])
+        self.assertEqual(Employee.objects.get(pk=e.pk).salary, 200)
+
+    def test_update_fields_signals(self):
+        received = []
+        def handler(sender, instance, created, **kwargs):
+            received.append(created)
+        post_save.connect(handler, sender=Person)
+        try:
+            p = Person.objects.create(name="Sara")
+            p.save(update_fields=['name'])
+        finally:
+            post_save.disconnect(handler, sender=Person)
+        self.assertEqual(received, [True, False])
+
+
+class TrackChangesTests(TestCase):
+    def test_unchanged(self):
+        p = TrackedPerson.objects.create(name="Sara", bio="Long biography")
+        # Nothing changed since the object was created...
+        with self.assertNumQueries(0):
+            p.save()
+        # ... or loaded.
+        p = TrackedPerson.objects.get(pk=p.pk)
+        with self.assertNumQueries(0):
+            p.save()
+
+    def test_changed(self):
+        p = TrackedPerson.objects.create(name="Sara", bio="Long biography")
+        p = TrackedPerson.objects.get(pk=p.pk)
+        last_seen = p.last_seen
+        p.name = "Sarah"
+        with self.assertNumQueries(1):
+            p.save()
+        sql = connection.queries[-1]['sql'].lower()
+        self.assertFalse('bio' in sql)
+        # auto_now fields are refreshed along with the changed fields.
+        self.assertTrue('last_seen' in sql)
+
+        p = TrackedPerson.objects.get(pk=p.pk)
+        self.assertEqual(p.name, "Sarah")
+        self.assertEqual(p.bio, "Long biography")
+        self.assertTrue(p.last_seen >= last_seen)
+
+        # Saving again doesn't write anything.
+        with self.assertNumQueries(0):
+            p.save()
+
+    def test_changed_in_place(self):
+        t = TrackedTags.objects.create(tags=['a', 'b'])
+        t = TrackedTags.objects.get(pk=t.pk)
+        # A mutable value changed in place is saved too.
+        t.tags.append('c')
+        with self.assertNumQueries(1):
+            t.save()
+        self.assertEqual(TrackedTags.objects.get(pk=t.pk).tags, ['a', 'b', 'c'])
+        with self.assertNumQueries(0):
+            t.save()
+
+    def test_concurrent_change_kept(self):
+        p = TrackedPerson.objects.create(name="Sara", bio="Long biography")
+        TrackedPerson.objects.filter(pk=p.pk).update(bio="Changed elsewhere")
+        p.name = "Sarah"
+        p.save()
+        p = TrackedPerson.objects.get(pk=p.pk)
+        self.assertEqual(p.name, "Sarah")
+        self.assertEqual(p.bio, "Changed elsewhere")
+
+    def test_deferred(self):
+        p = TrackedPerson.objects.create(name="Sara", bio="Long biography")
+        p = TrackedPerson.objects.defer('bio').get(pk=p.pk)
+        # Loading a deferred field doesn't count as a change.
+        self.assertEqual(p.bio, "Long biography")
+        with self.assertNumQueries(0):
+            p.save()
+        p.name = "Sarah"
+        p.save()
+        self.assertEqual(TrackedPerson.objects.get(pk=p.pk).bio, "Long biography")
+
+    def test_force_insert_and_update_fields(self):
+        p = TrackedPerson.objects.create(name="Sara", bio="Long biography")
+        # Explicit update_fields override the tracked changes.
+        p.bio = "Changed"
+        with self.assertNumQueries(1):
+            p.save(update_fields=['bio'])
+        self.assertEqual(TrackedPerson.objects.get(pk=p.pk).bio, "Changed")
+
+        p2 = TrackedPerson(pk=p.pk + 1, name="Other")
+        p2.save(force_insert=True)
+        self.assertEqual(TrackedPerson.objects.count(), 2)
+
+    def test_unsaved_changes_kept_after_update_fields(self):
+        p = TrackedPerson.objects.create(name="Sara", bio="old")
+        p.name = "Sarah"
+        p.bio = "new"
+        p.save(update_fields=['name'])
+        self.assertEqual(TrackedPerson.objects.get(pk=p.pk).bio, "old")
+        # The bio change wasn't written, so it's still pending.
+        p.save()
+        self.assertEqual(TrackedPerson.objects.get(pk=p.pk).bio, "new")
+
+    def test_changed_pk(self):
+        p = TrackedPerson.objects.create(name="Sara", bio="Long biography")
+        old_pk = p.pk
+        # A copy saved under another primary key is written in full.
+        p.pk = old_pk + 100
+        p.save()
+        copy = TrackedPerson.objects.get(pk=old_pk + 100)
+        self.assertEqual((copy.name, copy.bio), ("Sara", "Long biography"))
+        self.assertEqual(TrackedPerson.objects.count(), 2)
+        with self.assertNumQueries(0):
+            p.save()
+
+    def test_inheritance(self):
+        e = TrackedEmployee.objects.create(name="Sara", salary=100)
+        e = TrackedEmployee.objects.get(pk=e.pk)
+        with self.assertNumQueries(0):
+            e.save()
+        e.salary = 200
+        e.save()
+        e = TrackedEmployee.objects.get(pk=e.pk)
+        self.assertEqual((e.name, e.salary), ("Sara", 200))
+
+
+class TrackChangesMultiDBTests(TestCase):
+    multi_db = True
+
+    def test_other_database(self):
+        p = TrackedPerson.objects.create(name="Sara", bio="Long biography")
+        # Copying the unchanged instance to another database saves it.
+        p.save(using='other')
+        copy = TrackedPerson.objects.using('other').get(pk=p.pk)
+        self.assertEqual((copy.name, copy.bio), ("Sara", "Long biography"))
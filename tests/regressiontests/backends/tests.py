@@ -1,13 +1,19 @@
 # -*- coding: utf-8 -*-
 # Unit and doctests for specific database backends.
 import datetime
+import os
+import shutil
+import tempfile
 
 from django.conf import settings
+from django.core.management import call_command
 from django.core.management.color import no_style
 from django.db import backend, connection, connections, DEFAULT_DB_ALIAS, IntegrityError
 from django.db.backends.signals import connection_created
+from django.db.backends.util import TableWriteTracker, write_trackers
 from django.db.backends.postgresql_psycopg2 import version as pg_version
 from django.test import TestCase, skipUnlessDBFeature, TransactionTestCase
+from django.test.testcases import tables_to_flush, track_writes
 from django.utils import unittest
 
 from regressiontests.backends import models
@@ -237,6 +243,15 @@ class EscapingChecks(TestCase):
         # response should be an non-zero integer
         self.assertTrue(int(response))
 
+    @unittest.skipUnless(connection.vendor == 'sqlite',
+                         "This is a sqlite-specific issue")
+    def test_bulk_batch_size(self):
+        # SQLite accepts at most 999 parameters per query.
+        rows = [(1, 2, 3)] * 1000
+        self.assertEqual(connection.ops.bulk_batch_size(['a', 'b', 'c'], rows), 333)
+        self.assertEqual(connection.ops.bulk_batch_size(['a'] * 2000, rows), 1)
+        self.assertEqual(connection.ops.bulk_batch_size([], rows), 1000)
+
 
 class BackendTestCase(TestCase):
     def test_cursor_executemany(self):
@@ -283,6 +298,81 @@ class BackendTestCase(TestCase):
         self.assertEqual(connection, connection.ops.connection)
 
 
+class TableWriteTrackerTest(unittest.TestCase):
+    def test_record(self):
+        tracker = TableWriteTracker()
+        tracker.record('SELECT "id" FROM "backends_square"')
+        tracker.record('SAVEPOINT s1')
+        self.assertEqual(tracker.tables, set())
+        self.assertFalse(tracker.unknown)
+
+        tracker.record('INSERT INTO "backends_square" ("root") VALUES (%s)')
+        tracker.record('update `backends_person` SET `first_name` = %s')
+        tracker.record('DELETE FROM backends_reporter WHERE id = 1')
+        self.assertEqual(tracker.tables,
+                         set(['backends_square', 'backends_person', 'backends_reporter']))
+        self.assertFalse(tracker.unknown)
+
+        tracker.record('CREATE TABLE "backends_other" ("id" integer)')
+        self.assertTrue(tracker.unknown)
+
+        tracker.clear()
+        self.assertEqual(tracker.tables, set())
+        self.assertFalse(tracker.unknown)
+
+class TablesToFlushTest(TransactionTestCase):
+    def test_1_written_tables(self):
+        track_writes(DEFAULT_DB_ALIAS)
+        self.assertEqual(tables_to_flush(DEFAULT_DB_ALIAS), set())
+
+        models.Square.objects.create(root=2, square=4)
+        self.assertEqual(tables_to_flush(DEFAULT_DB_ALIAS),
+                         set([models.Square._meta.db_table]))
+
+    def test_2_referencing_tables(self):
+        "Tables with foreign keys to a written table are flushed along with it"
+        track_writes(DEFAULT_DB_ALIAS)
+        models.Reporter.objects.create(first_name='John', last_name='Smith')
+        self.assertEqual(tables_to_flush(DEFAULT_DB_ALIAS),
+                         set([models.Reporter._meta.db_table, models.Article._meta.db_table]))
+
+    def test_3_unknown_writes(self):
+        "The whole database is flushed when the written tables aren't known"
+        track_writes(DEFAULT_DB_ALIAS)
+        write_trackers[DEFAULT_DB_ALIAS].record('INSERT INTO "not_a_django_table" VALUES (1)')
+        self.assertEqual(tables_to_flush(DEFAULT_DB_ALIAS), None)
+
+        track_writes(DEFAULT_DB_ALIAS)
+        write_trackers[DEFAULT_DB_ALIAS].record('DROP TABLE "backends_square"')
+        self.assertEqual(tables_to_flush(DEFAULT_DB_ALIAS), None)
+
+    def test_4_previous_writes_flushed(self):
+        "The rows written by the previous tests of this class have been removed"
+        self.assertEqual(models.Square.objects.count(), 0)
+        self.assertEqual(models.Reporter.objects.count(), 0)
+
+    def test_5_partial_flush(self):
+        "A partial flush only reloads the initial data of the flushed tables"
+        fixture_dir = tempfile.mkdtemp()
+        f = open(os.path.join(fixture_dir, 'initial_data.json'), 'w')
+        f.write('[{"pk": 1, "model": "backends.square", "fields": {"root": 2, "square": 4}},'
+                ' {"pk": 1, "model": "backends.reporter", "fields": {"first_name": "John", "last_name": "Smith"}}]')
+        f.close()
+        old_fixture_dirs = settings.FIXTURE_DIRS
+        settings.FIXTURE_DIRS = [fixture_dir]
+        try:
+            track_writes(DEFAULT_DB_ALIAS)
+            call_command('flush', verbosity=0, interactive=False,
+                         tables=set([models.Square._meta.db_table]))
+        finally:
+            settings.FIXTURE_DIRS = old_fixture_dirs
+            shutil.rmtree(fixture_dir)
+        self.assertEqual(models.Square.objects.count(), 1)
+        self.assertEqual(models.Reporter.objects.count(), 0)
+        self.assertEqual(tables_to_flush(DEFAULT_DB_ALIAS),
+                         set([models.Square._meta.db_table]))
+
+
 # We don't make these tests conditional because that means we would need to
 # check and differentiate between:
 # * MySQL+InnoDB, MySQL+MYISAM (something we currently can't do).
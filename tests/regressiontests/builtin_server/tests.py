@@ -1,6 +1,9 @@
+import threading
+import urllib2
 from StringIO import StringIO
 
-from django.core.servers.basehttp import ServerHandler
+from django.core.servers.basehttp import (ServerHandler, ThreadedWSGIServer,
+    WSGIRequestHandler)
 from django.utils.unittest import TestCase
 
 #
@@ -50,3 +53,39 @@ class WSGIFileWrapperTests(TestCase):
         handler.run(wsgi_app)
         self.assertFalse(handler._used_sendfile)
         self.assertEqual(handler.stdout.getvalue().splitlines()[-1],'Hello World!')
+
+
+class QuietRequestHandler(WSGIRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+class ThreadedServerTests(TestCase):
+    """
+    Test that the threaded server handles requests concurrently.
+    """
+
+    def test_slow_request_does_not_block(self):
+        release = threading.Event()
+        def app(environ, start_response):
+            if environ['PATH_INFO'] == '/slow/':
+                release.wait(10)
+            start_response('200 OK', [('Content-Type', 'text/plain')])
+            return [environ['PATH_INFO']]
+
+        server = ThreadedWSGIServer(('127.0.0.1', 0), QuietRequestHandler)
+        server.set_app(app)
+        server_thread = threading.Thread(target=server.serve_forever)
+        server_thread.daemon = True
+        server_thread.start()
+        url = 'http://127.0.0.1:%d' % server.server_port
+        slow = threading.Thread(target=lambda: urllib2.urlopen(url + '/slow/').read())
+        slow.start()
+        try:
+            # The slow request is still being handled.
+            self.assertEqual(urllib2.urlopen(url + '/fast/', timeout=5).read(), '/fast/')
+            self.assertFalse(release.is_set())
+        finally:
+            release.set()
+            slow.join()
+            server.shutdown()
+            server.server_close()
@@ -5,6 +5,12 @@
 
 import hashlib
 import os
+import shutil
+from StringIO import StringIO
+try:
+    import cPickle as pickle
+except ImportError:
+    import pickle
 import tempfile
 import time
 import warnings
@@ -13,6 +19,10 @@ from django.conf import settings
 from django.core import management
 from django.core.cache import get_cache, DEFAULT_CACHE_ALIAS
 from django.core.cache.backends.base import CacheKeyWarning
+from django.core.cache.compressors import ZlibCompressor
+from django.core.cache.serializers import PickleSerializer, JSONSerializer
+from django.core.cache.stats import get_key_prefix
+from django.core.exceptions import ImproperlyConfigured
 from django.http import HttpResponse, HttpRequest, QueryDict
 from django.middleware.cache import FetchFromCacheMiddleware, UpdateCacheMiddleware, CacheMiddleware
 from django.test import RequestFactory
@@ -56,6 +66,13 @@ class DummyCacheTests(unittest.TestCase):
         self.assertEqual(self.cache.get("does_not_exist"), None)
         self.assertEqual(self.cache.get("does_not_exist", "bang!"), "bang!")
 
+    def test_tags(self):
+        "Tags are accepted and ignored by the dummy cache backend"
+        self.cache.set('key', 'value', tags=['tag'])
+        self.cache.set_many({'a': 'a'}, tags=['tag'])
+        self.cache.invalidate_tags(['tag'])
+        self.assertEqual(self.cache.get('key'), None)
+
     def test_get_many(self):
         "get_many returns nothing for the dummy cache backend"
         self.cache.set('a', 'a')
@@ -724,6 +741,88 @@ class BaseCacheTests(object):
         self.assertEqual(self.custom_key_cache.get('answer2'), 42)
         self.assertEqual(self.custom_key_cache2.get('answer2'), 42)
 
+    def test_tags(self):
+        # Values stored with tags disappear when one of their tags is invalidated
+        self.cache.set('user42', 'profile', tags=['user:42'])
+        self.cache.set('both', 'page', tags=['user:42', 'user:43'])
+        self.cache.add('user43', 'friends', tags=['user:43'])
+        self.cache.set_many({'a': 1, 'b': 2}, tags=['letters'])
+        self.cache.set('untagged', 'value')
+        self.assertEqual(self.cache.get('user42'), 'profile')
+        self.assertEqual(self.cache.get_many(['both', 'user43', 'a', 'b']),
+                         {'both': 'page', 'user43': 'friends', 'a': 1, 'b': 2})
+
+        self.cache.invalidate_tags(['user:42', 'letters'])
+        self.assertEqual(self.cache.get('user42'), None)
+        self.assertEqual(self.cache.get('both', 'default'), 'default')
+        self.assertEqual(self.cache.get('user43'), 'friends')
+        self.assertEqual(self.cache.get('untagged'), 'value')
+        self.assertEqual(self.cache.get_many(['user42', 'both', 'user43', 'a']),
+                         {'user43': 'friends'})
+
+        # Storing again after invalidation uses the tag's new generation
+        self.cache.set('user42', 'new profile', tags=['user:42'])
+        self.assertEqual(self.cache.get('user42'), 'new profile')
+
+        # Tags are independent of the version of the keys they're used with
+        self.cache.set('user42', 'v2 profile', version=2, tags=['user:42'])
+        self.assertEqual(self.cache.get('user42', version=2), 'v2 profile')
+        self.cache.invalidate_tags(['user:42'])
+        self.assertEqual(self.cache.get('user42', version=2), None)
+
+    def test_tags_incr(self):
+        # Incrementing a tagged value, or its version, keeps its tags
+        self.cache.set('counter', 1, tags=['counters'])
+        self.assertEqual(self.cache.incr('counter'), 2)
+        self.assertEqual(self.cache.get('counter'), 2)
+        self.assertEqual(self.cache.incr_version('counter'), 2)
+        self.assertEqual(self.cache.get('counter', version=2), 2)
+        self.cache.invalidate_tags(['counters'])
+        self.assertEqual(self.cache.get('counter', version=2), None)
+        self.assertRaises(ValueError, self.cache.incr, 'counter', version=2)
+
+    def test_tag_generations(self):
+        # Tags' counters don't clash with the keys of cached values
+        self.cache.set('tag:user', 'value')
+        self.cache.set('profile', 'profile', tags=['user'])
+        self.assertEqual(self.cache.get('tag:user'), 'value')
+        self.assertEqual(self.cache.get('profile'), 'profile')
+
+        # Invalidation increments the tag's counter rather than dropping it
+        generation = self.cache.get('django.core.cache.tag:user')
+        self.cache.invalidate_tags(['user', 'unknown'])
+        self.assertEqual(self.cache.get('django.core.cache.tag:user'), generation + 1)
+        self.assertEqual(self.cache.get('profile'), None)
+        self.assertEqual(self.cache.get('django.core.cache.tag:unknown'), None)
+
+        # A counter created by another process between the lookup of the
+        # tag and the creation of its counter is kept, so that the values
+        # that process has just stored with it stay valid.
+        self.cache.set('other', 'other', tags=['new'])
+        get_many = self.cache.get_many
+        def get_many_once(keys, version=None):
+            # Only the first lookup misses the counter.
+            self.cache.get_many = get_many
+            return {}
+        self.cache.get_many = get_many_once
+        try:
+            self.cache.set('mine', 'mine', tags=['new'])
+        finally:
+            self.cache.get_many = get_many
+        self.assertEqual(self.cache.get_many(['other', 'mine']),
+                         {'other': 'other', 'mine': 'mine'})
+        self.cache.invalidate_tags(['new'])
+        self.assertEqual(self.cache.get_many(['other', 'mine']), {})
+
+    def test_tag_generation_timeout(self):
+        # A tag's generation outlives the value that created it, so values
+        # stored later with a longer timeout stay valid.
+        self.cache.set('short', 'value', 1, tags=['tag'])
+        self.cache.set('long', 'value', 3600, tags=['tag'])
+        time.sleep(2)
+        self.assertEqual(self.cache.get('short'), None)
+        self.assertEqual(self.cache.get('long'), 'value')
+
 def custom_key_func(key, key_prefix, version):
     "A customized cache key function"
     return 'CUSTOM-' + '-'.join([key_prefix, str(version), key])
@@ -902,6 +1001,266 @@ class CustomCacheKeyValidationTests(unittest.TestCase):
         cache.set(key, val)
         self.assertEqual(cache.get(key), val)
 
+class SmallZlibCompressor(ZlibCompressor):
+    min_length = 10
+
+class CacheSerializationTests(unittest.TestCase):
+    """
+    Tests for the SERIALIZER and COMPRESSOR cache arguments.
+    """
+    def setUp(self):
+        self.dirname = tempfile.mkdtemp()
+        self._table_name = 'test cache table'
+        management.call_command('createcachetable', self._table_name, verbosity=0, interactive=False)
+
+    def tearDown(self):
+        from django.db import connection
+        cursor = connection.cursor()
+        cursor.execute('DROP TABLE %s' % connection.ops.quote_name(self._table_name))
+        get_cache('django.core.cache.backends.filebased.FileBasedCache', LOCATION=self.dirname).clear()
+
+    def get_caches(self, **params):
+        return [
+            get_cache('django.core.cache.backends.locmem.LocMemCache', LOCATION='serialization', **params),
+            get_cache('django.core.cache.backends.filebased.FileBasedCache', LOCATION=self.dirname, **params),
+            get_cache('django.core.cache.backends.db.DatabaseCache', LOCATION=self._table_name, **params),
+        ]
+
+    def test_defaults(self):
+        cache = get_cache('django.core.cache.backends.locmem.LocMemCache')
+        self.assertTrue(isinstance(cache.serializer, PickleSerializer))
+        self.assertEqual(cache.compressor, None)
+        self.assertEqual(cache.encode(42), pickle.dumps(42, pickle.HIGHEST_PROTOCOL))
+
+    def test_json_serializer(self):
+        value = {'list': [1, 2, 3], 'text': u'Iñtërnâtiônàlizætiøn'}
+        for cache in self.get_caches(SERIALIZER='django.core.cache.serializers.JSONSerializer'):
+            cache.set('json', value)
+            self.assertEqual(cache.get('json'), value)
+            cache.set_many({'a': [1], 'b': None})
+            self.assertEqual(cache.get_many(['a', 'b']), {'a': [1]})
+
+    def test_json_serializer_tags(self):
+        for cache in self.get_caches(SERIALIZER='django.core.cache.serializers.JSONSerializer'):
+            cache.set('a', 1, tags=['t'])
+            cache.set_many({'b': [2], 'c': {'x': 3}}, tags=['t', 'u'])
+            self.assertEqual(cache.get('a'), 1)
+            self.assertEqual(cache.get_many(['a', 'b', 'c']),
+                             {'a': 1, 'b': [2], 'c': {'x': 3}})
+            self.assertEqual(cache.incr('a'), 2)
+            cache.invalidate_tags(['u'])
+            self.assertEqual(cache.get_many(['a', 'b', 'c']), {'a': 2})
+            cache.invalidate_tags(['t'])
+            self.assertEqual(cache.get('a'), None)
+
+    def test_zlib_compressor(self):
+        value = 'spam' * 1000
+        for cache in self.get_caches(COMPRESSOR='django.core.cache.compressors.ZlibCompressor'):
+            self.assertTrue(len(cache.encode(value)) < len(value))
+            cache.set('compressed', value)
+            self.assertEqual(cache.get('compressed'), value)
+            cache.set('small', 'spam')
+            self.assertEqual(cache.get('small'), 'spam')
+            cache.set('answer', 41)
+            self.assertEqual(cache.incr('answer'), 42)
+
+    def test_undecodable_values(self):
+        # Values that can't be decoded, e.g. because they were stored before
+        # the serializer or compressor changed, are misses and get deleted.
+        json_caches = self.get_caches(SERIALIZER='django.core.cache.serializers.JSONSerializer')
+        zlib_caches = self.get_caches(COMPRESSOR='django.core.cache.compressors.ZlibCompressor')
+        for cache, json_cache, zlib_cache in zip(self.get_caches(), json_caches, zlib_caches):
+            cache.set('pickled', {'a': 1})
+            self.assertEqual(json_cache.get('pickled', 'default'), 'default')
+            self.assertFalse(cache.has_key('pickled'))
+
+            cache.set_many({'a': 'a', 'b': 'b'})
+            json_cache.set('c', 'c')
+            self.assertEqual(json_cache.get_many(['a', 'b', 'c']), {'c': 'c'})
+            self.assertEqual(cache.get_many(['a', 'b']), {})
+
+            cache.set('uncompressed', 'spam' * 100)
+            self.assertEqual(zlib_cache.get('uncompressed'), None)
+            self.assertFalse(cache.has_key('uncompressed'))
+
+    def test_compressor_threshold(self):
+        cache = get_cache('django.core.cache.backends.locmem.LocMemCache', COMPRESSOR=SmallZlibCompressor)
+        compressor = cache.compressor
+        self.assertEqual(compressor.compress('short'), '-short')
+        self.assertEqual(compressor.decompress(compressor.compress('short')), 'short')
+        self.assertEqual(compressor.compress('a' * 100)[:1], 'z')
+        self.assertEqual(compressor.decompress(compressor.compress('a' * 100)), 'a' * 100)
+
+    def test_component_instances(self):
+        serializer = JSONSerializer()
+        cache = get_cache('django.core.cache.backends.locmem.LocMemCache', SERIALIZER=serializer)
+        self.assertTrue(cache.serializer is serializer)
+
+    def test_invalid_component(self):
+        self.assertRaises(ImproperlyConfigured, get_cache,
+            'django.core.cache.backends.locmem.LocMemCache',
+            SERIALIZER='django.core.cache.serializers.MissingSerializer')
+
+class CacheStatsTests(unittest.TestCase):
+    """
+    Tests for the STATS cache argument and the cachestats command.
+    """
+    backend_name = 'django.core.cache.backends.locmem.LocMemCache'
+
+    def setUp(self):
+        self.cache = get_cache(self.backend_name, LOCATION='stats', STATS=True,
+                               OPTIONS={'MAX_ENTRIES': 30})
+        self.cache.clear()
+
+    def test_disabled_by_default(self):
+        cache = get_cache(self.backend_name)
+        self.assertEqual(cache.stats, None)
+        self.assertEqual(cache.get_stats(), {})
+
+    def test_hits_and_misses(self):
+        self.cache.set('a', 1)
+        self.cache.set_many({'b': 2, 'c': None})
+        self.assertEqual(self.cache.get('a'), 1)
+        self.assertEqual(self.cache.get('missing', 'default'), 'default')
+        self.assertEqual(self.cache.get_many(['a', 'b', 'missing']), {'a': 1, 'b': 2})
+        self.assertEqual(self.cache.incr('a'), 2)
+        self.assertRaises(ValueError, self.cache.incr, 'missing')
+        self.assertTrue('a' in self.cache)
+
+        stats = self.cache.get_stats()
+        # get_many() and incr() use get() and set() internally, but are only
+        # counted once.
+        self.assertEqual(stats['hits'], 5)
+        self.assertEqual(stats['misses'], 3)
+        self.assertEqual(stats['sets'], 3)
+        self.assertEqual(stats['hit_ratio'], 5.0 / 8)
+        self.assertEqual(stats['operations']['get']['calls'], 2)
+        self.assertEqual(stats['operations']['get_many']['calls'], 1)
+        self.assertEqual(stats['operations']['incr']['calls'], 2)
+        self.assertTrue(stats['bytes_written'] > 0)
+        self.assertTrue(stats['bytes_read'] > 0)
+
+        self.cache.stats.reset()
+        self.assertEqual(self.cache.get_stats()['hits'], 0)
+
+    def test_deletes_and_evictions(self):
+        for i in range(40):
+            self.cache.set('key%d' % i, i)
+        self.cache.delete('key39')
+        self.cache.delete_many(['key%d' % i for i in range(39)])
+        stats = self.cache.get_stats()
+        self.assertEqual(stats['deletes'], 40)
+        self.assertTrue(stats['evictions'] > 0)
+        # The statistics aren't kept in the cache, so clearing it leaves them.
+        self.cache.clear()
+        self.assertEqual(self.cache.get_stats()['deletes'], 40)
+
+    def test_prefixes(self):
+        self.assertEqual(get_key_prefix('user:42'), 'user:')
+        self.assertEqual(get_key_prefix('template.cache.sidebar.d41d8cd9'),
+                         'template.cache.sidebar.')
+        self.assertEqual(get_key_prefix('key'), '')
+
+        self.cache.set('user:1', 'John')
+        self.cache.get('user:1')
+        self.cache.get('user:2')
+        self.cache.get_many(['user:3', 'page.home'])
+        self.cache.has_key('page.about')
+        self.cache.set('page.about', 'About')
+        self.cache.get('page.about')
+        prefixes = self.cache.get_stats()['prefixes']
+        self.assertEqual(prefixes, {
+            'user:': {'hits': 1, 'misses': 2, 'hit_ratio': 1.0 / 3},
+            'page.': {'hits': 1, 'misses': 2, 'hit_ratio': 1.0 / 3},
+        })
+
+        self.cache.get('user:1')
+        self.cache.stats.reset()
+        self.assertEqual(self.cache.get_stats()['prefixes'], {})
+
+    def test_shared_by_alias(self):
+        old_caches = settings.CACHES
+        settings.CACHES = {
+            'default': old_caches['default'],
+            'stats': {
+                'BACKEND': self.backend_name,
+                'LOCATION': 'stats',
+                'STATS': True,
+            },
+        }
+        try:
+            cache = get_cache('stats')
+            cache.stats.reset()
+            cache.get('key')
+            self.assertTrue(get_cache('stats').stats is cache.stats)
+            self.assertEqual(get_cache('stats').get_stats()['misses'], 1)
+
+            settings.CACHES['stats']['STATS'] = 'stats'
+            self.assertRaises(ImproperlyConfigured, get_cache, 'stats')
+        finally:
+            settings.CACHES = old_caches
+
+    def test_stats_alias(self):
+        # With STATS naming another alias, the statistics are added to that
+        # cache, so a cache built elsewhere from the same settings -- e.g. by
+        # the cachestats command running in another process -- reads those
+        # recorded by all of its users.
+        dirname = tempfile.mkdtemp()
+        old_caches = settings.CACHES
+        settings.CACHES = {
+            'default': old_caches['default'],
+            'stats': {
+                'BACKEND': self.backend_name,
+                'LOCATION': 'stats-alias',
+                'STATS': 'stats_store',
+            },
+            'stats_store': {
+                'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+                'LOCATION': dirname,
+            },
+        }
+        try:
+            cache = get_cache('stats')
+            cache.stats.reset()
+            cache.set('user:1', 'value')
+            cache.get('user:1')
+            cache.get('user:2')
+            cache.get('user:3')
+            cache.get('page.home')
+            cache.stats.flush()
+            self.assertEqual(get_cache('stats_store').get('django.core.cache.stats:misses'), 3)
+
+            # Another process has its own CacheStats object.
+            other = get_cache(self.backend_name, LOCATION='stats-alias',
+                              STATS='stats_store')
+            self.assertFalse(other.stats is cache.stats)
+            other.get('user:1')
+            other.clear()
+            stats = other.get_stats()
+            self.assertEqual(stats['hits'], 2)
+            self.assertEqual(stats['misses'], 3)
+            self.assertEqual(stats['operations']['get']['calls'], 5)
+            self.assertEqual(stats['prefixes']['user:']['hits'], 2)
+
+            out = StringIO()
+            management.call_command('cachestats', 'stats', 'default', stdout=out)
+            output = out.getvalue()
+            self.assertTrue('[stats]' in output)
+            self.assertTrue('hit_ratio: 40.0%' in output)
+            self.assertTrue("prefix 'page.': 0 hits, 1 misses, 0.0% hit ratio\n"
+                            "  prefix 'user:': 2 hits, 2 misses, 50.0% hit ratio" in output)
+            self.assertTrue('No statistics recorded' in output)
+
+            out = StringIO()
+            management.call_command('cachestats', 'stats', prefixes=1, stdout=out)
+            self.assertFalse("prefix 'user:'" in out.getvalue())
+
+            cache.stats.reset()
+            self.assertEqual(other.get_stats()['prefixes'], {})
+        finally:
+            settings.CACHES = old_caches
+            shutil.rmtree(dirname)
+
 class CacheUtils(unittest.TestCase):
     """TestCase for django.utils.cache functions."""
 
@@ -1071,6 +1430,8 @@ class CacheI18nTest(unittest.TestCase):
         self.path = '/cache/test/'
 
     def tearDown(self):
+        # Don't leave the pages cached by the test to the following tests.
+        get_cache('default').clear()
         settings.CACHE_MIDDLEWARE_SECONDS = self.orig_cache_middleware_seconds
         settings.CACHE_MIDDLEWARE_KEY_PREFIX = self.orig_cache_middleware_key_prefix
         settings.CACHES = self.orig_caches
@@ -1194,7 +1555,7 @@ class PrefixedCacheI18nTest(CacheI18nTest):
 
     def tearDown(self):
         super(PrefixedCacheI18nTest, self).tearDown()
-        if self.old_cache_key_prefix is not None:
+        if self.old_cache_key_prefix is None:
             del settings.CACHES['default']['KEY_PREFIX']
         else:
             settings.CACHES['default']['KEY_PREFIX'] = self.old_cache_key_prefix
@@ -1,6 +1,7 @@
 # -*- coding:utf-8 -*-
 from datetime import datetime
 
+from django.db import models
 from django.test import TestCase
 from django.utils import unittest
 from django.utils.http import parse_etags, quote_etag, parse_http_date
@@ -15,6 +16,11 @@ ETAG = 'b4246ffc4f62314ca13147c9d4f76974'
 EXPIRED_ETAG = '7fae4cd4b0f81e7d2914700043aa8ed6'
 
 
+class Article(models.Model):
+    title = models.CharField(max_length=100)
+    updated_at = models.DateTimeField()
+
+
 class ConditionalGet(TestCase):
     urls = 'regressiontests.conditional_processing.urls'
 
@@ -129,6 +135,68 @@ class ConditionalGet(TestCase):
         self.assertFullResponse(response, check_last_modified=False)
 
 
+class QuerysetConditionalGet(TestCase):
+    urls = 'regressiontests.conditional_processing.urls'
+
+    def setUp(self):
+        self.first = Article.objects.create(title='First', updated_at=LAST_MODIFIED)
+        self.second = Article.objects.create(title='Second',
+                                             updated_at=datetime(2007, 10, 20, 12, 0, 0))
+
+    def testValidators(self):
+        response = self.client.get('/condition/articles/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, 'First, Second')
+        self.assertEqual(response['Last-Modified'], LAST_MODIFIED_STR)
+        self.assertTrue(response.has_header('ETag'))
+
+    def testNotModified(self):
+        etag = self.client.get('/condition/articles/')['ETag']
+        self.client.defaults['HTTP_IF_NONE_MATCH'] = etag
+        response = self.client.get('/condition/articles/')
+        self.assertEqual(response.status_code, 304)
+        del self.client.defaults['HTTP_IF_NONE_MATCH']
+        self.client.defaults['HTTP_IF_MODIFIED_SINCE'] = LAST_MODIFIED_STR
+        response = self.client.get('/condition/articles/')
+        self.assertEqual(response.status_code, 304)
+
+    def testChanges(self):
+        etag = self.client.get('/condition/articles/')['ETag']
+        self.client.defaults['HTTP_IF_NONE_MATCH'] = etag
+        # An update changes the most recent modification time...
+        self.second.updated_at = datetime(2010, 10, 18, 16, 56, 23)
+        self.second.save()
+        response = self.client.get('/condition/articles/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Last-Modified'], LAST_MODIFIED_NEWER_STR)
+        # ... and a deletion the number of objects, even if it doesn't.
+        self.client.defaults['HTTP_IF_NONE_MATCH'] = response['ETag']
+        self.first.delete()
+        response = self.client.get('/condition/articles/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, 'Second')
+        self.assertEqual(response['Last-Modified'], LAST_MODIFIED_NEWER_STR)
+
+    def testManager(self):
+        response = self.client.get('/condition/articles/count/')
+        self.assertEqual(response.content, '2')
+        self.assertEqual(response['Last-Modified'], LAST_MODIFIED_STR)
+        self.client.defaults['HTTP_IF_NONE_MATCH'] = response['ETag']
+        response = self.client.get('/condition/articles/count/')
+        self.assertEqual(response.status_code, 304)
+
+    def testCallableQueryset(self):
+        response = self.client.get('/condition/articles/%d/' % self.first.pk)
+        self.assertEqual(response.content, 'First')
+        self.assertEqual(response['Last-Modified'], LAST_MODIFIED_STR)
+        self.client.defaults['HTTP_IF_NONE_MATCH'] = response['ETag']
+        response = self.client.get('/condition/articles/%d/' % self.first.pk)
+        self.assertEqual(response.status_code, 304)
+        # Without any object the view is called, here to return a 404.
+        response = self.client.get('/condition/articles/%d/' % (self.second.pk + 1))
+        self.assertEqual(response.status_code, 404)
+
+
 class ETagProcessing(unittest.TestCase):
     def testParsing(self):
         etags = parse_etags(r'"", "etag", "e\"t\"ag", "e\\tag", W/"weak"')
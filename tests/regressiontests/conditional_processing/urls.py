@@ -7,4 +7,7 @@ urlpatterns = patterns('',
     ('^condition/last_modified2/$', views.last_modified_view2),
     ('^condition/etag/$', views.etag_view1),
     ('^condition/etag2/$', views.etag_view2),
+    ('^condition/articles/$', views.article_list),
+    ('^condition/articles/count/$', views.article_count),
+    ('^condition/articles/(?P<pk>\d+)/$', views.article_detail),
 )
@@ -1,8 +1,9 @@
 # -*- coding:utf-8 -*-
-from django.views.decorators.http import condition, etag, last_modified
+from django.views.decorators.http import condition, etag, last_modified, queryset_condition
 from django.http import HttpResponse
+from django.shortcuts import get_object_or_404
 
-from models import FULL_RESPONSE, LAST_MODIFIED, ETAG
+from models import FULL_RESPONSE, LAST_MODIFIED, ETAG, Article
 
 def index(request):
     return HttpResponse(FULL_RESPONSE)
@@ -24,3 +25,15 @@ def etag_view2(request):
     return HttpResponse(FULL_RESPONSE)
 etag_view2 = etag(lambda r: ETAG)(etag_view2)
 
+
+def article_list(request):
+    return HttpResponse(', '.join([a.title for a in Article.objects.order_by('title')]))
+article_list = queryset_condition(Article)(article_list)
+
+def article_count(request):
+    return HttpResponse('%d' % Article.objects.count())
+article_count = queryset_condition(Article.objects)(article_count)
+
+def article_detail(request, pk):
+    return HttpResponse(get_object_or_404(Article, pk=pk).title)
+article_detail = queryset_condition(lambda r, pk: Article.objects.filter(pk=pk))(article_detail)
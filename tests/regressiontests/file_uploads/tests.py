@@ -7,9 +7,13 @@ import os
 import shutil
 from StringIO import StringIO
 
+from django.conf import settings
 from django.core.files import temp as tempfile
+from django.core.files.storage import Storage
 from django.core.files.uploadedfile import SimpleUploadedFile
-from django.http.multipartparser import MultiPartParser
+from django.core.files.uploadhandler import (MemoryFileUploadHandler,
+    StorageFileUploadHandler, StopFutureHandlers)
+from django.http.multipartparser import LazyStream, MultiPartParser
 from django.test import TestCase, client
 from django.utils import simplejson
 from django.utils import unittest
@@ -309,6 +313,73 @@ class FileUploadTests(TestCase):
         # shouldn't differ.
         self.assertEqual(os.path.basename(obj.testfile.path), 'MiXeD_cAsE.txt')
 
+    def test_storage_upload_handler(self):
+        """
+        StorageFileUploadHandler streams uploads into FILE_UPLOAD_TEMP_DIR,
+        from where they are moved into place when saved.
+        """
+        file = tempfile.NamedTemporaryFile(suffix=".file")
+        file.write('a' * (2 ** 18))
+        file.seek(0)
+        response = self.client.post('/file_uploads/storage_handler/',
+                                    {'file_field': file})
+        self.assertEqual(response.status_code, 200)
+        received = simplejson.loads(response.content)
+        self.assertEqual(received['temp_dir'],
+                         settings.FILE_UPLOAD_TEMP_DIR or tempfile.gettempdir())
+        self.assertFalse(received['temp_exists'])
+        self.assertEqual(received['content'], 'a' * (2 ** 18))
+
+    def test_storage_upload_handler_temp_dir(self):
+        """
+        StorageFileUploadHandler streams uploads into a directory of the
+        storage if its temp_dir is set.
+        """
+        file = tempfile.NamedTemporaryFile(suffix=".file")
+        file.write('a' * (2 ** 18))
+        file.seek(0)
+        response = self.client.post('/file_uploads/storage_handler/temp_dir/',
+                                    {'file_field': file})
+        self.assertEqual(response.status_code, 200)
+        received = simplejson.loads(response.content)
+        self.assertEqual(received['temp_dir'],
+                         os.path.join(temp_storage.location, '.uploads'))
+        self.assertFalse(received['temp_exists'])
+        self.assertEqual(received['content'], 'a' * (2 ** 18))
+
+    def test_storage_upload_handler_interrupted(self):
+        """
+        StorageFileUploadHandler removes the partial file of an upload that's
+        stopped.
+        """
+        class SmallQuotaUploadHandler(uploadhandler.QuotaUploadHandler):
+            QUOTA = 10
+
+        handler = StorageFileUploadHandler(storage=temp_storage)
+        payload = client.encode_multipart('BoUnDaRy', {
+            'file_field': SimpleUploadedFile('test.txt', 'a' * 100),
+        })
+        parser = MultiPartParser({
+            'CONTENT_TYPE': 'multipart/form-data; boundary=BoUnDaRy',
+            'CONTENT_LENGTH': len(payload),
+        }, StringIO(payload), [SmallQuotaUploadHandler(), handler])
+        post, files = parser.parse()
+        self.assertEqual(len(files), 0)
+        self.assertFalse(os.path.exists(handler.file.temporary_file_path()))
+
+    def test_storage_upload_handler_without_paths(self):
+        """
+        StorageFileUploadHandler leaves the uploads to the next handlers if its
+        storage has no local paths.
+        """
+        handler = StorageFileUploadHandler(storage=Storage())
+        try:
+            handler.new_file('file', 'test.txt', 'text/plain', 4)
+        except StopFutureHandlers:
+            self.fail("StorageFileUploadHandler shouldn't handle the file.")
+        self.assertEqual(handler.receive_data_chunk('data', 0), 'data')
+        self.assertEqual(handler.file_complete(4), None)
+
 class DirectoryCreationTests(unittest.TestCase):
     """
     Tests for error handling during directory creation
@@ -360,3 +431,53 @@ class MultiParserTests(unittest.TestCase):
             'CONTENT_TYPE':     'multipart/form-data; boundary=_foo',
             'CONTENT_LENGTH':   '1'
         }, StringIO('x'), [], 'utf-8')
+
+    def test_chunk_boundaries(self):
+        """
+        Parts are split correctly wherever the boundaries fall in the chunks
+        read from the input.
+        """
+        boundary = '_foo'
+        payload = '\r\n'.join([
+            '--' + boundary,
+            'Content-Disposition: form-data; name="empty"',
+            '',
+            '',
+            '--' + boundary,
+            'Content-Disposition: form-data; name="text"',
+            '',
+            'line 1\r\n--_fo\r\nline 3',
+            '--' + boundary,
+            'Content-Disposition: form-data; name="file"; filename="test.txt"',
+            'Content-Type: text/plain',
+            '',
+            'x' * 1000 + '\r\n',
+            '--' + boundary + '--',
+            '',
+        ])
+        for chunk_size in (1, 2, 5, 64, 2 ** 16):
+            handler = MemoryFileUploadHandler()
+            handler.chunk_size = chunk_size
+            post, files = MultiPartParser({
+                'CONTENT_TYPE':     'multipart/form-data; boundary=%s' % boundary,
+                'CONTENT_LENGTH':   len(payload),
+            }, StringIO(payload), [handler], 'utf-8').parse()
+            self.assertEqual(post['empty'], u'')
+            self.assertEqual(post['text'], u'line 1\r\n--_fo\r\nline 3')
+            self.assertEqual(files['file'].read(), 'x' * 1000 + '\r\n')
+
+class LazyStreamTests(unittest.TestCase):
+
+    def test_fill_and_skip(self):
+        stream = LazyStream(iter(['abc', 'def', 'ghi']))
+        data, start = stream.fill(2)
+        self.assertEqual(data[start:], 'abc')
+        stream.skip(2)
+        self.assertEqual(stream.tell(), 2)
+        data, start = stream.fill(4)
+        self.assertEqual(data[start:], 'cdef')
+        self.assertEqual(stream.read(3), 'cde')
+        stream.unget('de')
+        self.assertEqual(stream.tell(), 3)
+        self.assertEqual(stream.read(), 'defghi')
+        self.assertEqual(stream.fill(1), ('', 0))
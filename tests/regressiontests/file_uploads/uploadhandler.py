@@ -2,7 +2,8 @@
 Upload handlers to test the upload API.
 """
 
-from django.core.files.uploadhandler import FileUploadHandler, StopUpload
+from django.core.files.uploadhandler import (FileUploadHandler,
+    StorageFileUploadHandler, StopUpload)
 
 class QuotaUploadHandler(FileUploadHandler):
     """
@@ -32,3 +33,7 @@ class ErroringUploadHandler(FileUploadHandler):
     """A handler that raises an exception."""
     def receive_data_chunk(self, raw_data, start):
         raise CustomUploadError("Oops!")
+
+class StorageDirUploadHandler(StorageFileUploadHandler):
+    """A storage handler keeping its temporary files in the storage."""
+    temp_dir = '.uploads'
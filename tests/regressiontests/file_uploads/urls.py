@@ -12,4 +12,6 @@ urlpatterns = patterns('',
     (r'^getlist_count/$',   views.file_upload_getlist_count),
     (r'^upload_errors/$',   views.file_upload_errors),
     (r'^filename_case/$',   views.file_upload_filename_case_view),
+    (r'^storage_handler/$', views.file_upload_storage_handler),
+    (r'^storage_handler/temp_dir/$', views.file_upload_storage_dir_handler),
 )
@@ -1,10 +1,12 @@
 import hashlib
 import os
 from django.core.files.uploadedfile import UploadedFile
+from django.core.files.uploadhandler import StorageFileUploadHandler
 from django.http import HttpResponse, HttpResponseServerError
 from django.utils import simplejson
-from models import FileModel, UPLOAD_TO
-from uploadhandler import QuotaUploadHandler, ErroringUploadHandler
+from models import FileModel, temp_storage, UPLOAD_TO
+from uploadhandler import (QuotaUploadHandler, ErroringUploadHandler,
+    StorageDirUploadHandler)
 from tests import UNICODE_FILENAME
 
 def file_upload_view(request):
@@ -129,3 +131,22 @@ def file_upload_filename_case_view(request):
     obj = FileModel()
     obj.testfile.save(file.name, file)
     return HttpResponse('%d' % obj.pk)
+
+def file_upload_storage_handler(request, handler_class=StorageFileUploadHandler):
+    """
+    Save a file uploaded with the StorageFileUploadHandler, and report where
+    it was streamed to.
+    """
+    request.upload_handlers = [handler_class(request, temp_storage)]
+    file = request.FILES['file_field']
+    temp_path = file.temporary_file_path()
+    obj = FileModel()
+    obj.testfile.save(file.name, file)
+    return HttpResponse(simplejson.dumps({
+        'temp_dir': os.path.dirname(temp_path),
+        'temp_exists': os.path.exists(temp_path),
+        'content': obj.testfile.read(),
+    }))
+
+def file_upload_storage_dir_handler(request):
+    return file_upload_storage_handler(request, StorageDirUploadHandler)
@@ -1,6 +1,9 @@
+import tempfile
+
 from django.utils import unittest
 from django.conf import settings
 from django.core.handlers.wsgi import WSGIHandler
+from django.http import FileResponse
 from django.test import RequestFactory
 
 
@@ -25,6 +28,18 @@ class HandlerTests(unittest.TestCase):
         # Reset settings
         settings.MIDDLEWARE_CLASSES = old_middleware_classes
 
+    def test_file_wrapper(self):
+        "Files are handed to the server's wsgi.file_wrapper, when there's one"
+        environ = RequestFactory().get('/').environ
+        environ['wsgi.file_wrapper'] = lambda filelike, block_size: ('wrapped', filelike)
+        f = tempfile.TemporaryFile()
+        handler = WSGIHandler()
+        handler.get_response = lambda request: FileResponse(f)
+        try:
+            self.assertEqual(handler(environ, lambda *a, **k: None), ('wrapped', f))
+        finally:
+            f.close()
+
     def test_bad_path_info(self):
         """Tests for bug #15672 ('request' referenced before assignment)"""
         environ = RequestFactory().get('/').environ
@@ -1,8 +1,10 @@
 import copy
 import pickle
+import tempfile
 
 from django.http import (QueryDict, HttpResponse, SimpleCookie, BadHeaderError,
-        parse_cookie)
+        parse_cookie, FileResponse, SendfileResponse)
+from django.test import RequestFactory
 from django.utils import unittest
 
 class QueryDictTests(unittest.TestCase):
@@ -243,6 +245,85 @@ class HttpResponseTests(unittest.TestCase):
         self.assertRaises(BadHeaderError, r.__setitem__, 'test\rstr', 'test')
         self.assertRaises(BadHeaderError, r.__setitem__, 'test\nstr', 'test')
 
+class FileResponseTests(unittest.TestCase):
+    def setUp(self):
+        self.file = tempfile.TemporaryFile()
+        self.file.write('0123456789' * 3)
+        self.file.seek(0)
+
+    def tearDown(self):
+        self.file.close()
+
+    def test_blocks(self):
+        response = FileResponse(self.file)
+        response.block_size = 8
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Length'], '30')
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertEqual([len(block) for block in response], [8, 8, 8, 6])
+        self.assertEqual(response.content, '0123456789' * 3)
+        response.close()
+        self.assertTrue(self.file.closed)
+
+    def test_set_content(self):
+        response = FileResponse(self.file)
+        response.content = 'replaced'
+        self.assertTrue(self.file.closed)
+        self.assertFalse(response.streaming)
+        self.assertEqual(list(response), ['replaced'])
+
+    def test_range(self):
+        response = FileResponse(self.file)
+        response.set_range(RequestFactory().get('/', HTTP_RANGE='bytes=5-14'))
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Range'], 'bytes 5-14/30')
+        self.assertEqual(response['Content-Length'], '10')
+        self.assertEqual(''.join(response), '5678901234')
+        # The range doesn't run to the end of the file, so it can't be handed
+        # to the server's file_wrapper.
+        self.assertEqual(response.wsgi_file(), None)
+
+    def test_open_and_suffix_ranges(self):
+        response = FileResponse(self.file)
+        response.set_range(RequestFactory().get('/', HTTP_RANGE='bytes=25-'))
+        self.assertEqual(response.content, '56789')
+        self.assertEqual(response.wsgi_file().read(), '56789')
+
+        response = FileResponse(self.file)
+        response.set_range(RequestFactory().get('/', HTTP_RANGE='bytes=-3'))
+        self.assertEqual(response['Content-Range'], 'bytes 27-29/30')
+        self.assertEqual(response.content, '789')
+
+    def test_unsatisfiable_range(self):
+        response = FileResponse(self.file)
+        response.set_range(RequestFactory().get('/', HTTP_RANGE='bytes=30-40'))
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], 'bytes */30')
+        self.assertEqual(response.content, '')
+
+    def test_ignored_ranges(self):
+        for header in ('bytes=0-1,5-6', 'bytes=9-3', 'lines=1-2'):
+            self.file.seek(0)
+            response = FileResponse(self.file)
+            response.set_range(RequestFactory().get('/', HTTP_RANGE=header))
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(response.content), 30)
+
+        response = FileResponse(self.file)
+        response['Last-Modified'] = 'Mon, 18 Jan 2038 05:14:07 GMT'
+        response.set_range(RequestFactory().get('/', HTTP_RANGE='bytes=0-1',
+            HTTP_IF_RANGE='Thu, 1 Jan 1970 00:00:00 GMT'))
+        self.assertEqual(response.status_code, 200)
+
+    def test_sendfile(self):
+        response = SendfileResponse('/srv/downloads/report.pdf')
+        self.assertEqual(response['X-Sendfile'], '/srv/downloads/report.pdf')
+        self.assertEqual(response['Content-Type'], 'application/pdf')
+        self.assertEqual(response.content, '')
+
+        response = SendfileResponse('/protected/report.pdf', header='X-Accel-Redirect')
+        self.assertEqual(response['X-Accel-Redirect'], '/protected/report.pdf')
+
 class CookieTests(unittest.TestCase):
     def test_encode(self):
         """
@@ -1,13 +1,18 @@
 # -*- coding: utf-8 -*-
 
+import gzip
+import hashlib
 import re
+import tempfile
+from StringIO import StringIO
 
 from django.conf import settings
 from django.core import mail
 from django.http import HttpRequest
-from django.http import HttpResponse
+from django.http import FileResponse, HttpResponse
 from django.middleware.clickjacking import XFrameOptionsMiddleware
 from django.middleware.common import CommonMiddleware
+from django.middleware.gzip import GZipMiddleware
 from django.middleware.http import ConditionalGetMiddleware
 from django.test import TestCase
 
@@ -18,12 +23,14 @@ class CommonMiddlewareTest(TestCase):
         self.prepend_www = settings.PREPEND_WWW
         self.ignorable_404_urls = settings.IGNORABLE_404_URLS
         self.send_broken_email_links = settings.SEND_BROKEN_LINK_EMAILS
+        self.use_etags = settings.USE_ETAGS
 
     def tearDown(self):
         settings.APPEND_SLASH = self.append_slash
         settings.PREPEND_WWW = self.prepend_www
         settings.IGNORABLE_404_URLS = self.ignorable_404_urls
         settings.SEND_BROKEN_LINK_EMAILS = self.send_broken_email_links
+        settings.USE_ETAGS = self.use_etags
 
     def _get_request(self, path):
         request = HttpRequest()
@@ -287,6 +294,27 @@ class CommonMiddlewareTest(TestCase):
         CommonMiddleware().process_response(request, response)
         self.assertEqual(len(mail.outbox), 0)
 
+    # ETag tests
+
+    def test_etag(self):
+        settings.USE_ETAGS = True
+        request = self._get_request('slash/')
+        response = HttpResponse(u'caf\xe9 ')
+        response.write('au lait')
+        response = CommonMiddleware().process_response(request, response)
+        self.assertEqual(response['ETag'], '"%s"' % hashlib.md5(response.content).hexdigest())
+        request.META['HTTP_IF_NONE_MATCH'] = response['ETag']
+        response = CommonMiddleware().process_response(request, HttpResponse(response.content))
+        self.assertEqual(response.status_code, 304)
+
+    def test_no_etag_streaming_response(self):
+        settings.USE_ETAGS = True
+        request = self._get_request('slash/')
+        response = HttpResponse(iter(['content']))
+        response = CommonMiddleware().process_response(request, response)
+        self.assertFalse(response.has_header('ETag'))
+        self.assertEqual(''.join(response), 'content')
+
 
 class ConditionalGetMiddlewareTest(TestCase):
     urls = 'regressiontests.middleware.cond_get_urls'
@@ -375,6 +403,75 @@ class ConditionalGetMiddlewareTest(TestCase):
         self.assertEqual(self.resp.status_code, 200)
 
 
+class GZipMiddlewareTest(TestCase):
+    """
+    Tests the GZip middleware.
+    """
+    text = 'Lorem ipsum dolor sit amet, consectetur adipisicing elit. ' * 10
+
+    def setUp(self):
+        self.req = HttpRequest()
+        self.req.META = {
+            'SERVER_NAME': 'testserver',
+            'SERVER_PORT': 80,
+            'HTTP_ACCEPT_ENCODING': 'gzip, deflate',
+        }
+
+    def decompress(self, data):
+        return gzip.GzipFile(fileobj=StringIO(data)).read()
+
+    def test_compress_response(self):
+        resp = HttpResponse(self.text)
+        resp = GZipMiddleware().process_response(self.req, resp)
+        self.assertEqual(resp['Content-Encoding'], 'gzip')
+        self.assertEqual(resp['Content-Length'], str(len(resp.content)))
+        self.assertEqual(self.decompress(resp.content), self.text)
+
+    def test_compress_iterator_response(self):
+        consumed = []
+        def content():
+            for i in range(3):
+                consumed.append(i)
+                yield self.text
+        resp = HttpResponse(content())
+        resp = GZipMiddleware().process_response(self.req, resp)
+        # Nothing is read until the response is sent.
+        self.assertEqual(consumed, [])
+        self.assertEqual(resp['Content-Encoding'], 'gzip')
+        self.assertFalse(resp.has_header('Content-Length'))
+        chunks = list(resp)
+        self.assertEqual(consumed, [0, 1, 2])
+        self.assertTrue(len(chunks) > 1)
+        self.assertEqual(self.decompress(''.join(chunks)), self.text * 3)
+
+    def test_compress_file_response(self):
+        f = tempfile.TemporaryFile()
+        f.write(self.text)
+        f.seek(0)
+        resp = FileResponse(f)
+        resp = GZipMiddleware().process_response(self.req, resp)
+        self.assertEqual(resp['Content-Encoding'], 'gzip')
+        self.assertFalse(resp.has_header('Content-Length'))
+        self.assertFalse(resp.has_header('Accept-Ranges'))
+        self.assertEqual(resp.wsgi_file(), None)
+        self.assertEqual(self.decompress(''.join(resp)), self.text)
+        resp.close()
+        self.assertTrue(f.closed)
+
+    def test_no_compress_short_response(self):
+        resp = HttpResponse('short')
+        resp = GZipMiddleware().process_response(self.req, resp)
+        self.assertFalse(resp.has_header('Content-Encoding'))
+        self.assertEqual(resp.content, 'short')
+
+    def test_no_compress_without_accept_encoding(self):
+        del self.req.META['HTTP_ACCEPT_ENCODING']
+        resp = HttpResponse(iter([self.text]))
+        resp = GZipMiddleware().process_response(self.req, resp)
+        self.assertFalse(resp.has_header('Content-Encoding'))
+        self.assertEqual(''.join(resp), self.text)
+
+
 class XFrameOptionsMiddlewareTest(TestCase):
     """
     Tests for the X-Frame-Options clickjacking prevention middleware.
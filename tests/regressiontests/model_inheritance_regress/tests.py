@@ -5,6 +5,8 @@ Regression tests for Model inheritance behaviour.
 import datetime
 from operator import attrgetter
 
+from django.db import models
+from django.db.models.fields import FieldDoesNotExist
 from django.test import TestCase
 
 from models import (Place, Restaurant, ItalianRestaurant, ParkingLot,
@@ -406,3 +408,37 @@ class ModelInheritanceTest(TestCase):
         )
         self.assertIs(BusStation._meta.pk.model, BusStation)
         self.assertIs(TrainStation._meta.pk.model, TrainStation)
+
+    def test_get_field(self):
+        # Fields of the parents are found by name, and by attribute name.
+        opts = Wholesaler._meta
+        self.assertEqual(opts.get_field('restaurant').model, Supplier)
+        self.assertEqual(opts.get_field('retailer').model, Wholesaler)
+        self.assertEqual(opts.get_field_by_attname('restaurant_id').name, 'restaurant')
+        self.assertEqual(opts.get_field_by_attname('retailer_id').name, 'retailer')
+        self.assertEqual(opts.get_field_by_attname('id').name, 'id')
+        self.assertRaises(FieldDoesNotExist, opts.get_field, 'restaurant_id')
+        self.assertRaises(FieldDoesNotExist, opts.get_field_by_attname, 'retailer')
+
+        # Many-to-many fields can be excluded.
+        opts = M2MChild._meta
+        self.assertEqual(opts.get_field('articles').name, 'articles')
+        self.assertRaises(FieldDoesNotExist, opts.get_field, 'articles',
+                          many_to_many=False)
+        self.assertRaises(FieldDoesNotExist, opts.get_field_by_attname, 'articles')
+
+    def test_get_field_after_add_field(self):
+        # Adding a field to a model resets the lookup indexes.
+        opts = Person._meta
+        self.assertRaises(FieldDoesNotExist, opts.get_field, 'nickname')
+        field = models.CharField(max_length=20)
+        field.contribute_to_class(Person, 'nickname')
+        try:
+            self.assertIs(opts.get_field('nickname'), field)
+            self.assertIs(opts.get_field_by_attname('nickname'), field)
+        finally:
+            opts.local_fields.remove(field)
+            del opts._field_cache, opts._field_name_cache
+            del opts._field_name_index, opts._field_attname_index
+            if hasattr(opts, '_name_map'):
+                del opts._name_map
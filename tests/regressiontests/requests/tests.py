@@ -194,6 +194,28 @@ class RequestsTests(unittest.TestCase):
         self.assertEqual(stream.read(2), '')
         self.assertEqual(stream.read(), '')
 
+    def test_limited_stream_readline_buffering(self):
+        # Lines are read from the underlying stream buf_size bytes at a time,
+        # including lines longer than that.
+        class RecordingStream(StringIO):
+            def read(self, size=-1):
+                reads.append(size)
+                return StringIO.read(self, size)
+        reads = []
+        data = '12345678901234567890\nabc\n' + 'x' * 100
+        stream = LimitedStream(RecordingStream(data), len(data), buf_size=8)
+        self.assertEqual(stream.readline(), '12345678901234567890\n')
+        self.assertEqual(stream.readline(), 'abc\n')
+        self.assertEqual(stream.readline(10), 'x' * 10)
+        self.assertEqual(stream.read(), 'x' * 90)
+        self.assertEqual(max(reads[:-1]), 8)
+
+        # A negative size means no limit, as it does for files.
+        stream = LimitedStream(StringIO('abc\ndef\nghi'), 11, buf_size=2)
+        self.assertEqual(stream.readline(), 'abc\n')
+        self.assertEqual(stream.readline(-1), 'def\n')
+        self.assertEqual(stream.readline(-1), 'ghi')
+
     def test_stream(self):
         request = WSGIRequest({'REQUEST_METHOD': 'POST', 'wsgi.input': StringIO('name=value')})
         self.assertEqual(request.read(), 'name=value')
@@ -264,6 +286,12 @@ class RequestsTests(unittest.TestCase):
         request = WSGIRequest({'REQUEST_METHOD': 'POST', 'wsgi.input': StringIO('name=value')})
         self.assertEqual(list(request), ['name=value'])
 
+    def test_read_by_chunks(self):
+        request = WSGIRequest({'REQUEST_METHOD': 'POST', 'wsgi.input': StringIO('name=value')})
+        self.assertEqual(list(request.chunks(4)), ['name', '=val', 'ue'])
+        # The body was streamed, so it can't be parsed afterwards.
+        self.assertRaises(Exception, lambda: request.raw_post_data)
+
     def test_POST_after_raw_post_data_read(self):
         """
         POST should be populated even if raw_post_data is read first
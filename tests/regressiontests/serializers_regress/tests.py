@@ -18,8 +18,10 @@ except ImportError:
 from django.conf import settings
 from django.core import serializers, management
 from django.core.serializers import SerializerDoesNotExist
+from django.core.serializers.json import iter_list
 from django.db import transaction, DEFAULT_DB_ALIAS, connection
 from django.test import TestCase
+from django.utils import simplejson
 from django.utils.functional import curry
 
 from models import *
@@ -377,6 +379,40 @@ class SerializerTests(TestCase):
         with self.assertRaises(SerializerDoesNotExist):
             serializers.get_deserializer("nonsense")
 
+    def test_json_iter_list(self):
+        """
+        The JSON deserializer reads streams a chunk at a time, whatever the
+        chunk boundaries fall on.
+        """
+        data = (' [ {"a": [1, 2.5, "]"]}, "x,y" , 123456,\n{"b": {"c": null}}, [] ,'
+                ' {"d": "\\"}\\\\", "e": [{}, "{["]}] ')
+        expected = simplejson.loads(data)
+        for chunk_size in range(1, len(data) + 1):
+            self.assertEqual(list(iter_list(StringIO(data), chunk_size)), expected)
+        self.assertEqual(list(iter_list(StringIO('[]'))), [])
+        for invalid in ('', '{}', '[1 2]', '[1, 2', '[{"a": 1]', '[{"a": 1}}]'):
+            with self.assertRaises(ValueError):
+                list(iter_list(StringIO(invalid), 2))
+
+    def test_json_iter_list_large_item(self):
+        """
+        An item spanning many chunks is only decoded again once it has been
+        read entirely.
+        """
+        data = '[{"a": [%s]}]' % ', '.join(['"x"'] * 1000)
+        decoder_class = simplejson.JSONDecoder
+        calls = []
+        class CountingDecoder(decoder_class):
+            def raw_decode(self, *args, **kwargs):
+                calls.append(args)
+                return decoder_class.raw_decode(self, *args, **kwargs)
+        simplejson.JSONDecoder = CountingDecoder
+        try:
+            self.assertEqual(list(iter_list(StringIO(data), 16)), simplejson.loads(data))
+        finally:
+            simplejson.JSONDecoder = decoder_class
+        self.assertEqual(len(calls), 2)
+
 def serializerTest(format, self):
 
     # Create all the objects defined in the test data
@@ -74,6 +74,25 @@ class TestSigner(TestCase):
             self.assertNotEqual(o, signing.dumps(o))
             self.assertEqual(o, signing.loads(signing.dumps(o)))
 
+    def test_dumps_loads_serializer(self):
+        "dumps and loads can use a serializer other than JSON"
+        class ReprSerializer(object):
+            def dumps(self, obj):
+                return repr(obj)
+            def loads(self, data):
+                return eval(data)
+        value = ('a', 'tuple', 1)
+        encoded = signing.dumps(value, serializer=ReprSerializer, compress=True)
+        self.assertEqual(value, signing.loads(encoded, serializer=ReprSerializer))
+        self.assertEqual(['a', 'tuple', 1], signing.loads(signing.dumps(value)))
+
+    def test_dumps_loads_positional(self):
+        "compress and max_age can still be passed positionally"
+        value = 'x' * 100
+        encoded = signing.dumps(value, None, 'salt', True)
+        self.assertTrue(encoded.startswith('.'))
+        self.assertEqual(value, signing.loads(encoded, None, 'salt', 10))
+
     def test_decode_detects_tampering(self):
         "loads should raise exception for tampered objects"
         transforms = (
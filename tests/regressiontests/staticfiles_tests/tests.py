@@ -1,7 +1,9 @@
 # -*- encoding: utf-8 -*-
 import codecs
+import hashlib
 import os
 import posixpath
+import re
 import shutil
 import sys
 import tempfile
@@ -12,7 +14,9 @@ from django.contrib.staticfiles import finders, storage
 from django.core.exceptions import ImproperlyConfigured
 from django.core.files.storage import default_storage
 from django.core.management import call_command
+from django.template import Context, Template
 from django.test import TestCase
+from django.utils import simplejson
 from django.utils.encoding import smart_unicode
 from django.utils.functional import empty
 from django.utils._os import rmtree_errorhandler
@@ -268,6 +272,212 @@ class TestBuildStaticNonLocalStorage(BuildStaticTestCase, TestNoFilesCreated):
         settings.STATICFILES_STORAGE = self.old_staticfiles_storage
 
 
+class TestBuildStaticIncremental(BuildStaticTestCase, TestDefaults):
+    """
+    Test ``--incremental`` option for ``collectstatic`` management command.
+    """
+    def setUp(self):
+        self.old_sources_manifest = settings.STATICFILES_SOURCES_MANIFEST
+        fd, settings.STATICFILES_SOURCES_MANIFEST = tempfile.mkstemp()
+        os.close(fd)
+        super(TestBuildStaticIncremental, self).setUp()
+
+    def tearDown(self):
+        super(TestBuildStaticIncremental, self).tearDown()
+        os.unlink(settings.STATICFILES_SOURCES_MANIFEST)
+        settings.STATICFILES_SOURCES_MANIFEST = self.old_sources_manifest
+
+    def run_collectstatic(self):
+        super(TestBuildStaticIncremental, self).run_collectstatic(incremental=True)
+
+    def _set_file(self, filepath, content):
+        f = open(os.path.join(settings.STATIC_ROOT, filepath), 'w')
+        try:
+            f.write(content)
+        finally:
+            f.close()
+
+    def _get_sources_manifest(self):
+        return simplejson.load(open(settings.STATICFILES_SOURCES_MANIFEST))
+
+    def test_sources_manifest(self):
+        manifest = self._get_sources_manifest()
+        self.assertEqual(manifest['files']['test.txt'],
+            hashlib.md5(open(os.path.join(TEST_ROOT, 'project', 'documents', 'test.txt')).read()).hexdigest())
+        # The manifest isn't published along with the collected files.
+        self.assertFileNotFound('staticfiles.sources.json')
+
+    def test_sources_manifest_required(self):
+        sources_manifest = settings.STATICFILES_SOURCES_MANIFEST
+        settings.STATICFILES_SOURCES_MANIFEST = None
+        try:
+            self.assertRaises(SystemExit, self.run_collectstatic)
+        finally:
+            settings.STATICFILES_SOURCES_MANIFEST = sources_manifest
+
+    def test_deleted_files_copied(self):
+        os.unlink(os.path.join(settings.STATIC_ROOT, 'test.txt'))
+        self.run_collectstatic()
+        self.assertFileContains('test.txt', 'Can we find')
+
+    def test_unchanged_files_skipped(self):
+        """
+        Files whose source hasn't changed since the previous run aren't
+        copied again, whatever the state of the destination.
+        """
+        self._set_file('test.txt', 'Changed at the destination')
+        self.run_collectstatic()
+        self.assertFileContains('test.txt', 'Changed at the destination')
+
+    def test_changed_files_copied(self):
+        self._set_file('test.txt', 'Changed at the destination')
+        manifest = self._get_sources_manifest()
+        manifest['files']['test.txt'] = 'stale'
+        f = open(settings.STATICFILES_SOURCES_MANIFEST, 'w')
+        try:
+            simplejson.dump(manifest, f)
+        finally:
+            f.close()
+        self.run_collectstatic()
+        self.assertFileContains('test.txt', 'Can we find')
+
+
+class TestBuildStaticParallel(BuildStaticTestCase, TestDefaults):
+    """
+    Test ``--parallel`` option for ``collectstatic`` management command.
+    """
+    def run_collectstatic(self):
+        super(TestBuildStaticParallel, self).run_collectstatic(parallel=4)
+
+
+class TestBuildStaticManifestStorage(BuildStaticTestCase):
+    """
+    Tests the hashed copies and the manifest saved by
+    ``ManifestStaticFilesStorage`` when collecting static files.
+    """
+    def setUp(self):
+        self.old_staticfiles_storage = settings.STATICFILES_STORAGE
+        settings.STATICFILES_STORAGE = 'django.contrib.staticfiles.storage.ManifestStaticFilesStorage'
+        super(TestBuildStaticManifestStorage, self).setUp()
+        settings.DEBUG = False
+        storage.staticfiles_storage._wrapped = empty
+
+    def tearDown(self):
+        storage.staticfiles_storage._wrapped = empty
+        super(TestBuildStaticManifestStorage, self).tearDown()
+        settings.STATICFILES_STORAGE = self.old_staticfiles_storage
+
+    def hashed_name(self, name):
+        return storage.staticfiles_storage.stored_name(name)
+
+    def test_hashed_copies(self):
+        name = self.hashed_name('cached/img/window.png')
+        self.assertTrue(re.match(r'^cached/img/window\.[0-9a-f]{12}\.png$', name))
+        self.assertFileContains(name, 'not really a png')
+        self.assertFileContains('cached/img/window.png', 'not really a png')
+
+    def test_css_references(self):
+        window = posixpath.basename(self.hashed_name('cached/img/window.png'))
+        other = posixpath.basename(self.hashed_name('cached/other.css'))
+        content = self._get_file(self.hashed_name('cached/styles.css'))
+        self.assertTrue('@import url("%s");' % other in content)
+        self.assertTrue('url("img/%s")' % window in content)
+        self.assertTrue('url("/static/cached/img/%s")' % window in content)
+        self.assertTrue('url("http://www.example.com/img/window.png")' in content)
+        self.assertTrue('url("data:image/png;base64,iVBORw0KGgo=")' in content)
+        self.assertTrue('url("#default#VML")' in content)
+        self.assertTrue('url("img/missing.png")' in content)
+
+    def test_import_references(self):
+        window = posixpath.basename(self.hashed_name('cached/img/window.png'))
+        imported = posixpath.basename(self.hashed_name('cached/import.css'))
+        content = self._get_file(self.hashed_name('cached/other.css'))
+        self.assertTrue('@import url("%s");' % imported in content)
+        self.assertTrue('url("img/%s")' % window in content)
+
+    def test_hash_of_rewritten_content(self):
+        """
+        The hash of a file with references is the hash of its rewritten
+        content, which changes with the files it refers to.
+        """
+        name = self.hashed_name('cached/other.css')
+        content = self._get_file(name).encode('utf-8')
+        self.assertEqual(name, 'cached/other.%s.css' % hashlib.md5(content).hexdigest()[:12])
+
+    def test_url(self):
+        url = storage.staticfiles_storage.url
+        self.assertEqual(url('cached/styles.css'),
+                         '/static/%s' % self.hashed_name('cached/styles.css'))
+        self.assertEqual(url('cached/unknown.css'), '/static/cached/unknown.css')
+        settings.DEBUG = True
+        self.assertEqual(url('cached/styles.css'), '/static/cached/styles.css')
+
+    def test_template_tag(self):
+        template = Template('{% load static %}{% static "cached/styles.css" %}')
+        self.assertEqual(template.render(Context()),
+                         '/static/%s' % self.hashed_name('cached/styles.css'))
+
+    def test_manifest_read_once(self):
+        url = storage.staticfiles_storage.url('cached/styles.css')
+        os.unlink(os.path.join(settings.STATIC_ROOT, 'staticfiles.json'))
+        self.assertEqual(storage.staticfiles_storage.url('cached/styles.css'), url)
+
+    def test_broken_manifest(self):
+        """
+        An unreadable manifest falls back to the original names.
+        """
+        for content in ('{"version": "1.0", "paths"',
+                        '{"version": "0.1", "paths": {}}', '[]'):
+            f = open(os.path.join(settings.STATIC_ROOT, 'staticfiles.json'), 'w')
+            try:
+                f.write(content)
+            finally:
+                f.close()
+            storage.staticfiles_storage._wrapped = empty
+            self.assertEqual(storage.staticfiles_storage.url('cached/styles.css'),
+                             '/static/cached/styles.css')
+
+    def test_collect_again(self):
+        """
+        The hashed copies saved by a previous run are kept as they are, and
+        aren't reported as post-processed again.
+        """
+        name = self.hashed_name('cached/styles.css')
+        path = os.path.join(settings.STATIC_ROOT, name)
+        os.utime(path, (0, 0))
+        out = StringIO()
+        call_command('collectstatic', interactive=False, verbosity='1',
+                     ignore_patterns=['*.ignoreme'], stdout=out)
+        self.assertTrue("Post-processed" not in out.getvalue())
+        storage.staticfiles_storage._wrapped = empty
+        self.assertEqual(self.hashed_name('cached/styles.css'), name)
+        self.assertEqual(os.path.getmtime(path), 0)
+
+    def test_collect_with_broken_manifest(self):
+        """
+        An unreadable manifest left by a previous run is replaced, and hashed
+        copies that were deleted since are saved again.
+        """
+        name = self.hashed_name('cached/styles.css')
+        os.unlink(os.path.join(settings.STATIC_ROOT, name))
+        f = open(os.path.join(settings.STATIC_ROOT, 'staticfiles.json'), 'w')
+        try:
+            f.write('{"version": "0.1", "paths"')
+        finally:
+            f.close()
+        self.run_collectstatic()
+        storage.staticfiles_storage._wrapped = empty
+        self.assertEqual(self.hashed_name('cached/styles.css'), name)
+        self.assertFileContains(name, 'url("img/window.')
+
+    def test_no_post_process(self):
+        shutil.rmtree(settings.STATIC_ROOT)
+        os.mkdir(settings.STATIC_ROOT)
+        self.run_collectstatic(post_process=False)
+        self.assertFileContains('cached/styles.css', 'img/window.png')
+        self.assertFileNotFound('staticfiles.json')
+
+
 if sys.platform != 'win32':
     class TestBuildStaticLinks(BuildStaticTestCase, TestDefaults):
         """
@@ -1557,6 +1557,28 @@ class Templates(unittest.TestCase):
             # Regression test for #11270.
             'cache17': ('{% load cache %}{% cache 10 long_cache_key poem %}Some Content{% endcache %}', {'poem': 'Oh freddled gruntbuggly/Thy micturations are to me/As plurdled gabbleblotchits/On a lurgid bee/That mordiously hath bitled out/Its earted jurtles/Into a rancid festering/Or else I shall rend thee in the gobberwarts with my blurglecruncheon/See if I dont.'}, 'Some Content'),
 
+            # The cache can be selected by alias.
+            'cache18': ('{% load cache %}{% cache 2 test using="default" %}cache18{% endcache %}', {}, 'cache03'),
+            'cache19': ('{% load cache %}{% cache 2 test foo using=alias %}cache19{% endcache %}', {'foo': 1, 'alias': 'default'}, 'cache05'),
+
+            # Unknown or unresolvable cache aliases are errors.
+            'cache20': ('{% load cache %}{% cache 2 test using="unknown" %}cache20{% endcache %}', {}, template.TemplateSyntaxError),
+            'cache21': ('{% load cache %}{% cache 2 test using=alias %}cache21{% endcache %}', {}, template.TemplateSyntaxError),
+
+            # cache_many renders and caches the fragment once per item.
+            'cache-many01': ('{% load cache %}{% cache_many 2 many for i in items i %}{{ i }}-{% endcache_many %}', {'items': [1, 2, 3]}, '1-2-3-'),
+            'cache-many02': ('{% load cache %}{% cache_many 2 many for i in items i %}x{{ i }}-{% endcache_many %}', {'items': [3, 4, 1, 4]}, '3-x4-1-x4-'),
+            'cache-many03': ('{% load cache %}{% cache_many 2 many for i in items i using="default" %}{{ i }}{% endcache_many %}', {'items': []}, ''),
+            'cache-many04': ('{% load cache %}{% cache_many 2 many for i in items i %}{% endcache_many %}{{ i }}', {'items': [5]}, ('', 'INVALID')),
+            'cache-many05': ('{% load cache %}{% cache_many 2 many for i items i %}{% endcache_many %}', {}, template.TemplateSyntaxError),
+            'cache-many06': ('{% load cache %}{% cache_many 2 many for i in %}{% endcache_many %}', {}, template.TemplateSyntaxError),
+            'cache-many07': ('{% load cache %}{% cache_many foo many for i in items i %}{% endcache_many %}', {'foo': 'fail', 'items': [1]}, template.TemplateSyntaxError),
+
+            # forloop is set as in {% for %}, and can be used in the vary-on arguments.
+            'cache-many08': ('{% load cache %}{% cache_many 2 loop for i in items i %}{{ forloop.counter }}:{{ i }}{% if forloop.last %}.{% endif %} {% endcache_many %}', {'items': [7, 8]}, '1:7 2:8. '),
+            'cache-many09': ('{% load cache %}{% for x in outer %}{% cache_many 2 nested for i in items forloop.parentloop.counter forloop.counter %}{{ forloop.parentloop.counter }}{{ forloop.counter }}{{ i }} {% endcache_many %}{% endfor %}', {'outer': [1, 2], 'items': ['a', 'b']}, '11a 12b 21a 22b '),
+            'cache-many10': ('{% load cache %}{% cache_many 2 many for i in items i using="unknown" %}{% endcache_many %}', {'items': [1]}, template.TemplateSyntaxError),
+
 
             ### AUTOESCAPE TAG ##############################################
             'autoescape-tag01': ("{% autoescape off %}hello{% endautoescape %}", {}, "hello"),
@@ -1608,6 +1630,8 @@ class Templates(unittest.TestCase):
             'static-prefixtag02': ('{% load static %}{% get_static_prefix as static_prefix %}{{ static_prefix }}', {}, settings.STATIC_URL),
             'static-prefixtag03': ('{% load static %}{% get_media_prefix %}', {}, settings.MEDIA_URL),
             'static-prefixtag04': ('{% load static %}{% get_media_prefix as media_prefix %}{{ media_prefix }}', {}, settings.MEDIA_URL),
+            'static-statictag01': ('{% load static %}{% static "admin/base.css" %}', {}, settings.STATIC_URL + 'admin/base.css'),
+            'static-statictag02': ('{% load static %}{% static base_css %}', {'base_css': 'admin/base.css'}, settings.STATIC_URL + 'admin/base.css'),
         }
 
 class TemplateTagLoading(unittest.TestCase):
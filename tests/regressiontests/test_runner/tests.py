@@ -1,12 +1,17 @@
 """
 Tests for django test runner
 """
+import multiprocessing
+import os
 import StringIO
 from optparse import make_option
+import tempfile
 import warnings
 
+from django.conf import settings
 from django.core.exceptions import ImproperlyConfigured
 from django.core.management import call_command
+from django.db import connection
 from django.test import simple
 from django.test.simple import get_tests
 from django.test.utils import get_warnings_state, restore_warnings_state
@@ -49,6 +54,129 @@ class DjangoTestRunnerTests(unittest.TestCase):
         self.assertEqual(1, result.testsRun)
         self.assertEqual(1, len(result.failures))
 
+class ParallelTestSuiteTests(unittest.TestCase):
+    def skip_in_worker(self):
+        # The worker processes of a parallel test run can't start their own.
+        if multiprocessing.current_process().daemon:
+            self.skipTest("Run in a worker process")
+
+    def get_suite(self):
+        class SampleTests(unittest.TestCase):
+            def test_pass(self):
+                pass
+            def test_fail(self):
+                self.fail("Sample failure")
+            def test_error(self):
+                raise ValueError("Sample error")
+            @unittest.skip("Sample skip")
+            def test_skip(self):
+                pass
+        class OtherSampleTests(unittest.TestCase):
+            def test_pass(self):
+                pass
+        class BrokenSampleTests(unittest.TestCase):
+            @classmethod
+            def setUpClass(cls):
+                raise ValueError("Broken setUpClass")
+            def test_pass(self):
+                pass
+        loader = unittest.defaultTestLoader
+        return unittest.TestSuite([loader.loadTestsFromTestCase(SampleTests),
+                                   loader.loadTestsFromTestCase(OtherSampleTests),
+                                   loader.loadTestsFromTestCase(BrokenSampleTests)])
+
+    def test_partition_suite_by_case(self):
+        groups = simple.partition_suite_by_case(self.get_suite())
+        self.assertEqual([len(group) for group in groups], [4, 1, 1])
+        self.assertEqual([type(group[0]).__name__ for group in groups],
+                         ['SampleTests', 'OtherSampleTests', 'BrokenSampleTests'])
+
+    def test_run(self):
+        self.skip_in_worker()
+        suite = simple.ParallelTestSuite(self.get_suite(), 2)
+        runner = unittest.TextTestRunner(verbosity=0, stream=StringIO.StringIO(),
+                                         resultclass=simple.ParallelTextTestResult)
+        result = runner.run(suite)
+        self.assertEqual(result.testsRun, 5)
+        self.assertEqual(len(result.failures), 1)
+        self.assertTrue("Sample failure" in result.failures[0][1])
+        self.assertEqual(len(result.errors), 2)
+        errors = sorted(result.errors, key=lambda error: str(error[0]))
+        self.assertTrue("Broken setUpClass" in errors[0][1])
+        self.assertTrue(str(errors[0][0]).startswith('setUpClass'))
+        self.assertTrue("Sample error" in errors[1][1])
+        self.assertEqual(len(result.skipped), 1)
+
+    def test_worker_cache_settings(self):
+        params = simple.get_worker_cache_settings({
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }, 2)
+        self.assertEqual(params['KEY_PREFIX'], 'worker_2')
+        self.assertEqual(params['LOCATION'], '_worker_2')
+        params = simple.get_worker_cache_settings({
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': '/var/tmp/cache',
+            'KEY_PREFIX': 'site',
+        }, 1)
+        self.assertEqual(params['KEY_PREFIX'], 'site_worker_1')
+        self.assertEqual(params['LOCATION'], os.path.join('/var/tmp/cache', 'worker_1'))
+        params = simple.get_worker_cache_settings({
+            'BACKEND': 'django.core.cache.backends.memcached.MemcachedCache',
+            'LOCATION': '127.0.0.1:11211',
+        }, 1)
+        self.assertEqual(params['KEY_PREFIX'], 'worker_1')
+        self.assertEqual(params['LOCATION'], '127.0.0.1:11211')
+
+    def test_worker_caches(self):
+        self.skip_in_worker()
+        class CacheTests(unittest.TestCase):
+            def test_key_prefix(self):
+                for params in settings.CACHES.values():
+                    self.assertTrue('worker_' in params['KEY_PREFIX'])
+        suite = simple.ParallelTestSuite(
+            unittest.defaultTestLoader.loadTestsFromTestCase(CacheTests), 2)
+        runner = unittest.TextTestRunner(verbosity=0, stream=StringIO.StringIO(),
+                                         resultclass=simple.ParallelTextTestResult)
+        result = runner.run(suite)
+        self.assertEqual(result.testsRun, 1)
+        self.assertTrue(result.wasSuccessful())
+        # The settings of this process are left alone.
+        for params in settings.CACHES.values():
+            self.assertFalse('worker_' in (params.get('KEY_PREFIX') or ''))
+
+class KeepDBTests(unittest.TestCase):
+    def setUp(self):
+        # A separate connection, so that the test database isn't touched.
+        self.connection = connection.__class__(dict(connection.settings_dict), 'keepdb')
+        self.creation = self.connection.creation
+        fd, self.db_name = tempfile.mkstemp(suffix='.db')
+        os.close(fd)
+        os.remove(self.db_name)
+
+    def tearDown(self):
+        self.connection.close()
+        if os.path.exists(self.db_name):
+            os.remove(self.db_name)
+
+    def test_schema_signature(self):
+        signature = self.creation.test_db_schema_signature()
+        self.assertEqual(len(signature), 40)
+        self.assertEqual(signature, self.creation.test_db_schema_signature())
+
+    @unittest.skipUnless(connection.vendor == 'sqlite', "Needs a database file")
+    def test_kept_signature(self):
+        self.assertEqual(self.creation._get_kept_test_db_signature(self.db_name), None)
+        self.assertFalse(os.path.exists(self.db_name))
+
+        old_name = self.connection.settings_dict['NAME']
+        self.connection.settings_dict['NAME'] = self.db_name
+        self.creation._record_test_db_signature('abc123')
+        self.connection.close()
+        self.connection.settings_dict['NAME'] = old_name
+
+        self.assertEqual(self.creation._get_kept_test_db_signature(self.db_name), 'abc123')
+        self.assertEqual(self.connection.settings_dict['NAME'], old_name)
+
 class DependencyOrderingTests(unittest.TestCase):
 
     def test_simple_dependencies(self):
@@ -0,0 +1,48 @@
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import types
+
+from django.utils import autoreload
+from django.utils import unittest
+
+
+class AutoreloadTests(unittest.TestCase):
+
+    def test_gen_filenames(self):
+        filenames = list(autoreload.gen_filenames())
+        self.assertTrue(__file__.rstrip('co') in filenames)
+        django_mo = os.path.join(os.path.dirname(autoreload.__file__), '..',
+                                 'conf', 'locale', 'fr', 'LC_MESSAGES', 'django.mo')
+        self.assertTrue(os.path.normpath(django_mo) in map(os.path.normpath, filenames))
+
+    @unittest.skipUnless(autoreload.USE_INOTIFY, "inotify isn't available")
+    def test_inotify_code_changed(self):
+        tmpdir = tempfile.mkdtemp()
+        filename = os.path.join(tmpdir, 'watched.py')
+        open(filename, 'w').close()
+        module = types.ModuleType('autoreload_watched')
+        module.__file__ = filename
+        sys.modules[module.__name__] = module
+        result = []
+        watcher = threading.Thread(
+            target=lambda: result.append(autoreload.inotify_code_changed()))
+        watcher.daemon = True
+        try:
+            watcher.start()
+            time.sleep(0.5)
+            # Other files in the same directory are ignored.
+            open(os.path.join(tmpdir, 'other.txt'), 'w').close()
+            time.sleep(0.5)
+            self.assertEqual(result, [])
+            f = open(filename, 'w')
+            f.write('changed = True\n')
+            f.close()
+            watcher.join(5)
+            self.assertEqual(result, [True])
+        finally:
+            del sys.modules[module.__name__]
+            shutil.rmtree(tmpdir)
@@ -57,6 +57,17 @@ class StaticTests(TestCase):
             )
         self.assertTrue(isinstance(response, HttpResponseNotModified))
 
+    def test_etag(self):
+        file_name = 'file.txt'
+        url = '/views/%s/%s' % (self.prefix, file_name)
+        etag = self.client.get(url)['ETag']
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertTrue(isinstance(response, HttpResponseNotModified))
+        # If-None-Match takes precedence over If-Modified-Since.
+        response = self.client.get(url, HTTP_IF_NONE_MATCH='"other"',
+            HTTP_IF_MODIFIED_SINCE='Mon, 18 Jan 2038 05:14:07 GMT')
+        self.assertEqual(response.status_code, 200)
+
     def test_invalid_if_modified_since(self):
         """Handle bogus If-Modified-Since values gracefully
 
@@ -88,6 +99,17 @@ class StaticTests(TestCase):
                           int(response['Content-Length']))
 
 
+    def test_range(self):
+        "The static view serves byte ranges"
+        file_name = 'file.txt'
+        response = self.client.get('/views/%s/%s' % (self.prefix, file_name),
+                                   HTTP_RANGE='bytes=2-5')
+        file = open(path.join(media_dir, file_name))
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(file.read()[2:6], response.content)
+        self.assertEqual(response['Content-Length'], '4')
+
+
 class StaticHelperTest(StaticTests):
     """
     Test case to make sure the static URL pattern helper works as expected
@@ -164,7 +164,7 @@ def teardown(state):
     for key, value in state.items():
         setattr(settings, key, value)
 
-def django_tests(verbosity, interactive, failfast, test_labels):
+def django_tests(verbosity, interactive, failfast, test_labels, parallel=0, keepdb=False):
     from django.conf import settings
     state = setup(verbosity, test_labels)
 
@@ -193,7 +193,8 @@ def django_tests(verbosity, interactive, failfast, test_labels):
         settings.TEST_RUNNER = 'django.test.simple.DjangoTestSuiteRunner'
     TestRunner = get_runner(settings)
 
-    test_runner = TestRunner(verbosity=verbosity, interactive=interactive, failfast=failfast)
+    test_runner = TestRunner(verbosity=verbosity, interactive=interactive, failfast=failfast,
+                             parallel=parallel, keepdb=keepdb)
     failures = test_runner.run_tests(test_labels, extra_tests=extra_tests)
 
     teardown(state)
@@ -313,6 +314,10 @@ if __name__ == "__main__":
         help="Bisect the test suite to discover a test that causes a test failure when combined with the named test.")
     parser.add_option('--pair', action='store', dest='pair', default=None,
         help="Run the test suite in pairs with the named test to find problem pairs.")
+    parser.add_option('--parallel', action='store', dest='parallel', type='int', default=0,
+        help="Run the tests in this many worker processes.")
+    parser.add_option('--keepdb', action='store_true', dest='keepdb', default=False,
+        help="Preserve the test databases between runs.")
     options, args = parser.parse_args()
     if options.settings:
         os.environ['DJANGO_SETTINGS_MODULE'] = options.settings
@@ -327,6 +332,7 @@ if __name__ == "__main__":
     elif options.pair:
         paired_tests(options.pair, options, args)
     else:
-        failures = django_tests(int(options.verbosity), options.interactive, options.failfast, args)
+        failures = django_tests(int(options.verbosity), options.interactive, options.failfast, args,
+                                options.parallel, options.keepdb)
         if failures:
             sys.exit(bool(failures))